@@ -0,0 +1,189 @@
+"""
+End-to-end scale benchmark of :mod:`bump_release` application
+
+Generates synthetic monorepos of 10, 1,000 and 10,000 projects (see :mod:`monorepo`), bumps all their projects with
+:func:`bump_release.batch.run_batch` and reports the throughput in projects per second and the peak RSS of the
+process and of its workers.
+
+Each monorepo size is measured in a fresh interpreter, so that the peak RSS of a size is not the one of a previous
+size.
+
+Usage::
+
+    python benchmarks/bench_scale.py --projects 10 --projects 1000 --jobs 4 --size 16384
+
+:creationdate: 19/10/2026 07:17
+:moduleauthor: François GUÉRIN <fguerin@ville-tourcoing.fr>
+:modulename: bench_scale
+
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import click
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import monorepo  # noqa: E402
+
+from bump_release import batch  # noqa: E402
+
+__author__ = "fguerin"
+
+# region Constants
+DEFAULT_PROJECTS = (10, 1000, 10000)
+RELEASE: str = "1.0.0"
+#: `ru_maxrss` unit, in bytes
+MAXRSS_UNIT: int = 1 if sys.platform == "darwin" else 1024
+# endregion Constants
+
+
+def peak_rss() -> Dict[str, Optional[int]]:
+    """
+    Peak resident set sizes of the process and of its largest terminated child, in bytes
+
+    :return: Peak RSS, as `{"self": ..., "children": ...}`
+    """
+    if resource is None:  # pragma: no cover
+        return {"self": None, "children": None}
+    return {
+        "self": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * MAXRSS_UNIT,
+        "children": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * MAXRSS_UNIT,
+    }
+
+
+def run_scale(
+    projects: int,
+    root: Path,
+    jobs: int = 1,
+    size: int = 4096,
+    position: float = 0.5,
+    seed: Optional[int] = None,
+    spread: float = 0.0,
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+    """
+    Generates a monorepo and bumps all its projects
+
+    :param projects: Number of projects
+    :param root: Root directory of the monorepo
+    :param jobs: Number of worker processes
+    :param size: Size of each target file, in characters
+    :param position: Relative position of the version numbers in the target files
+    :param seed: Seed of the random generator of the sizes and positions
+    :param spread: Relative spread of the drawn sizes
+    :param dry_run: If `True`, the projects are only checked
+    :return: Measures
+    """
+    started = time.perf_counter()
+    monorepo.generate(root, projects, size=size, position=position, seed=seed, spread=spread)
+    generated = time.perf_counter() - started
+
+    started = time.perf_counter()
+    release_files = batch.discover_release_files(root)
+    results = batch.run_batch(release_files, RELEASE, dry_run=dry_run, jobs=jobs)
+    duration = time.perf_counter() - started
+
+    rss = peak_rss()
+    return {
+        "projects": projects,
+        "jobs": jobs,
+        "size": size,
+        "position": position,
+        "dry_run": dry_run,
+        "generate_duration": generated,
+        "duration": duration,
+        "throughput": projects / duration if duration else None,
+        "errors": sum(1 for result in results if result["status"] == "error"),
+        "peak_rss": rss["self"],
+        "peak_rss_workers": rss["children"],
+    }
+
+
+def _mib(value: Optional[int]) -> str:
+    return "-" if value is None else f"{value / 1024 / 1024:.1f}"
+
+
+def format_measure(measure: Dict[str, Any]) -> str:
+    """
+    Formats a measure as a report line
+
+    :param measure: Measure, from :func:`run_scale`
+    :return: Report line
+    """
+    return (
+        f"{measure['projects']:>8} {measure['jobs']:>4} {measure['generate_duration']:>10.2f} "
+        f"{measure['duration']:>10.2f} {measure['throughput']:>12.1f} "
+        f"{_mib(measure['peak_rss']):>10} {_mib(measure['peak_rss_workers']):>12} {measure['errors']:>6}"
+    )
+
+
+REPORT_HEADER = (
+    f"{'projects':>8} {'jobs':>4} {'generate s':>10} {'bump s':>10} {'projects/s':>12} "
+    f"{'RSS MiB':>10} {'workers MiB':>12} {'errors':>6}"
+)
+
+
+@click.command()
+@click.option(
+    "-p",
+    "--projects",
+    type=int,
+    multiple=True,
+    help=f"Number of projects, repeatable, default: {', '.join(str(count) for count in DEFAULT_PROJECTS)}",
+)
+@click.option("-j", "--jobs", type=int, default=os.cpu_count() or 1, show_default=True, help="Worker processes")
+@click.option("-s", "--size", type=int, default=4096, show_default=True, help="Size of the target files")
+@click.option(
+    "--position",
+    type=click.FloatRange(0, 1),
+    default=0.5,
+    show_default=True,
+    help="Relative position of the version numbers in the target files",
+)
+@click.option("--seed", type=int, default=None, help="Seed, to draw the sizes and positions per file")
+@click.option("--spread", type=float, default=0.5, show_default=True, help="Relative spread of the drawn sizes")
+@click.option("-n", "--dry-run", is_flag=True, help="Only check the projects")
+@click.option("-o", "--output", type=click.Path(dir_okay=False, path_type=Path), help="JSON report file")
+@click.option("--single", is_flag=True, hidden=True, help="Measures a single size in this interpreter")
+def main(projects, jobs, size, position, seed, spread, dry_run, output, single):
+    """
+    Times full bumps of synthetic monorepos
+    """
+    spread = spread if seed is not None else 0.0
+    if single:
+        with tempfile.TemporaryDirectory(prefix="bump_release-bench-") as root:
+            measure = run_scale(projects[0], Path(root), jobs, size, position, seed, spread, dry_run)
+        click.echo(json.dumps(measure))
+        return
+
+    measures = []
+    click.echo(REPORT_HEADER)
+    for count in projects or DEFAULT_PROJECTS:
+        args = [sys.executable, __file__, "--single", "--projects", str(count), "--jobs", str(jobs)]
+        args += ["--size", str(size), "--position", str(position), "--spread", str(spread)]
+        if seed is not None:
+            args += ["--seed", str(seed)]
+        if dry_run:
+            args.append("--dry-run")
+        completed = subprocess.run(args, check=True, stdout=subprocess.PIPE, universal_newlines=True)
+        measure = json.loads(completed.stdout.splitlines()[-1])
+        measures.append(measure)
+        click.echo(format_measure(measure))
+    if output:
+        output.write_text(json.dumps(measures, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""
+Synthetic monorepo generator for the :mod:`bump_release` benchmarks
+
+Generates a tree of projects, each with a release.ini file and the target files of the `tests/fixtures` directory:
+setup.py, setup.cfg, sphinx conf, sonar properties, package.json, vars.yml and a main python module.
+
+The target files are padded up to a given size, and the version numbers are placed at a given relative position of
+the files, from `0` (the beginning of the file) to `1` (its end). With a seed, sizes and positions are drawn per file
+around the given values, so that a workload is reproducible.
+
+Usage::
+
+    python benchmarks/monorepo.py /tmp/monorepo --projects 1000 --size 16384 --position 0.5
+
+:creationdate: 19/10/2026 07:17
+:moduleauthor: François GUÉRIN <fguerin@ville-tourcoing.fr>
+:modulename: monorepo
+
+"""
+import json
+import logging
+import random
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import click
+
+__author__ = "fguerin"
+
+# region Constants
+FIXTURES_DIR: Path = Path(__file__).resolve().parent.parent / "tests" / "fixtures"
+CURRENT_RELEASE: str = "0.0.1"
+#: Number of projects per group directory, so that no directory of the tree is too large
+GROUP_SIZE: int = 1000
+#: Target files: section -> (fixture, path in the project)
+TARGETS: Dict[str, Tuple[str, str]] = OrderedDict(
+    [
+        ("main_project", ("main.txt", "src/__init__.py")),
+        ("setup", ("setup.py", "setup.py")),
+        ("setup_cfg", ("setup.cfg", "setup.cfg")),
+        ("docs", ("sphinx.conf", "docs/conf.py")),
+        ("sonar", ("sonar-project.properties", "sonar-project.properties")),
+        ("node", ("assets/package.json", "package.json")),
+        ("ansible", ("vars.yml", "vars.yml")),
+    ]
+)
+FILLER_LINE: str = "# {index:06d} Lorem ipsum dolor sit amet, consectetur adipiscing elit, version 1.2.{index}\n"
+FILLER_KEY: str = "x-filler-{index:06d}"
+FILLER_VALUE: str = "Lorem ipsum dolor sit amet, version 1.2.{index}"
+# endregion Constants
+
+
+@lru_cache(maxsize=None)
+def _read_fixture(path: Path) -> str:
+    return path.read_text()
+
+
+def _filler_lines(count: int, start: int = 0) -> str:
+    return "".join(FILLER_LINE.format(index=index) for index in range(start, start + count))
+
+
+def pad_text(text: str, size: int, position: float) -> str:
+    """
+    Pads a line-based file with comment lines
+
+    :param text: Fixture content
+    :param size: Target size of the file, in characters
+    :param position: Relative position of the fixture content in the file
+    :return: Padded content
+    """
+    if not text.endswith("\n"):
+        text += "\n"
+    line_length = len(FILLER_LINE.format(index=0))
+    count = max(size - len(text), 0) // line_length
+    before = int(round(count * position))
+    return _filler_lines(before) + text + _filler_lines(count - before, start=before)
+
+
+def pad_json(text: str, size: int, position: float) -> str:
+    """
+    Pads a JSON document with filler keys, around its own keys
+
+    :param text: Fixture content, a JSON object
+    :param size: Target size of the file, in characters
+    :param position: Relative position of the fixture keys in the document
+    :return: Padded content
+    """
+    data = json.loads(text, object_pairs_hook=OrderedDict)
+    key_length = len(json.dumps({FILLER_KEY.format(index=0): FILLER_VALUE.format(index=0)}, indent=2)) - 2
+    count = max(size - len(text), 0) // key_length
+    before = int(round(count * position))
+    padded: Dict[str, str] = OrderedDict()
+    for index in range(before):
+        padded[FILLER_KEY.format(index=index)] = FILLER_VALUE.format(index=index)
+    padded.update(data)
+    for index in range(before, count):
+        padded[FILLER_KEY.format(index=index)] = FILLER_VALUE.format(index=index)
+    return json.dumps(padded, indent=2) + "\n"
+
+
+def release_ini(sections: Sequence[str]) -> str:
+    """
+    Content of the release.ini file of a project
+
+    :param sections: Sections of the target files
+    :return: release.ini content
+    """
+    chunks = [f"[DEFAULT]\ncurrent_release = {CURRENT_RELEASE}\n"]
+    for section in sections:
+        chunks.append(f"[{section}]\npath = {TARGETS[section][1]}\n")
+    return "\n".join(chunks)
+
+
+def _draw(rng: Optional[random.Random], value: float, spread: float) -> float:
+    if rng is None or not spread:
+        return value
+    return value * rng.uniform(1 - spread, 1 + spread)
+
+
+def generate_project(
+    path: Path,
+    size: int = 4096,
+    position: float = 0.5,
+    sections: Sequence[str] = tuple(TARGETS),
+    rng: Optional[random.Random] = None,
+    spread: float = 0.0,
+    fixtures: Path = FIXTURES_DIR,
+) -> Path:
+    """
+    Generates a project
+
+    :param path: Project directory
+    :param size: Size of each target file, in characters
+    :param position: Relative position of the version numbers in the target files, between 0 and 1
+    :param sections: Sections of the target files to generate
+    :param rng: Random generator, used to draw the sizes and positions of the files
+    :param spread: Relative spread of the drawn sizes, positions are drawn between 0 and 1
+    :param fixtures: Fixtures directory
+    :return: release.ini file path
+    """
+    for section in sections:
+        fixture, target = TARGETS[section]
+        text = _read_fixture(fixtures / fixture)
+        file_size = int(_draw(rng, size, spread))
+        file_position = rng.random() if rng is not None and spread else position
+        pad = pad_json if target.endswith(".json") else pad_text
+        target_path = path / target
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+        target_path.write_text(pad(text, file_size, file_position))
+    release_file = path / "release.ini"
+    release_file.write_text(release_ini(sections))
+    return release_file
+
+
+def generate(
+    root: Path,
+    projects: int,
+    size: int = 4096,
+    position: float = 0.5,
+    sections: Sequence[str] = tuple(TARGETS),
+    seed: Optional[int] = None,
+    spread: float = 0.0,
+    fixtures: Path = FIXTURES_DIR,
+) -> List[Path]:
+    """
+    Generates a monorepo of `projects` projects
+
+    :param root: Root directory of the monorepo
+    :param projects: Number of projects
+    :param size: Size of each target file, in characters
+    :param position: Relative position of the version numbers in the target files, between 0 and 1
+    :param sections: Sections of the target files to generate
+    :param seed: Seed of the random generator, sizes and positions are drawn per file if set with a `spread`
+    :param spread: Relative spread of the drawn sizes
+    :param fixtures: Fixtures directory
+    :return: release.ini files paths
+    """
+    if not 0 <= position <= 1:
+        raise ValueError(f"Position {position} is not between 0 and 1")
+    unknown = set(sections) - set(TARGETS)
+    if unknown:
+        raise ValueError(f"Unknown sections: {', '.join(sorted(unknown))}")
+    rng = random.Random(seed) if seed is not None else None
+    release_files = []
+    for index in range(projects):
+        path = Path(root) / f"group-{index // GROUP_SIZE:03d}" / f"project-{index:05d}"
+        release_files.append(
+            generate_project(
+                path,
+                size=size,
+                position=position,
+                sections=sections,
+                rng=rng,
+                spread=spread,
+                fixtures=fixtures,
+            )
+        )
+    logging.info(f"generate() {projects} projects generated in {root}")
+    return release_files
+
+
+@click.command()
+@click.argument("root", type=click.Path(file_okay=False, path_type=Path))
+@click.option("-p", "--projects", type=int, default=10, show_default=True, help="Number of projects")
+@click.option("-s", "--size", type=int, default=4096, show_default=True, help="Size of the target files")
+@click.option(
+    "--position",
+    type=click.FloatRange(0, 1),
+    default=0.5,
+    show_default=True,
+    help="Relative position of the version numbers in the target files",
+)
+@click.option(
+    "--section",
+    "sections",
+    type=click.Choice(list(TARGETS)),
+    multiple=True,
+    help="Section of the target files to generate, all by default",
+)
+@click.option("--seed", type=int, default=None, help="Seed, to draw the sizes and positions per file")
+@click.option("--spread", type=float, default=0.5, show_default=True, help="Relative spread of the drawn sizes")
+def main(root, projects, size, position, sections, seed, spread):
+    """
+    Generates a synthetic monorepo in ROOT
+    """
+    release_files = generate(
+        root,
+        projects,
+        size=size,
+        position=position,
+        sections=sections or tuple(TARGETS),
+        seed=seed,
+        spread=spread if seed is not None else 0.0,
+    )
+    click.echo(f"{len(release_files)} projects generated in {root}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,20 +8,24 @@ For now, the following sections are supported:
 + sonar-project.properties
 + ansible vars file
 + node package.json file
++ node package-lock.json / npm-shrinkwrap.json file
 + setup.cfg
 + setup.py
++ pyproject.toml
 
 """
 import configparser
+import json
 import logging
 import sys
 from configparser import ConfigParser
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import ContextManager, Dict, List, Optional, Tuple
 
 import click
 
-from bump_release import helpers
+from bump_release import batch, detect, helpers, journal, profiling, propagate, watch
 from bump_release.helpers import split_version
 
 # region Globals
@@ -33,13 +37,47 @@ RELEASE_CONFIG: Optional[ConfigParser] = None
 # endregion Globals
 
 
-@click.command()
+class DefaultCommandGroup(click.Group):
+    """
+    Click group which invokes the `bump` command when the first argument is not a sub-command name,
+    so `bump_release <release>` keeps working
+    """
+
+    default_command = "bump"
+
+    def parse_args(self, ctx, args):
+        if not args or (args[0] not in self.commands and args[0] not in self.get_help_option_names(ctx)):
+            args = [self.default_command] + list(args)
+        return super().parse_args(ctx, args)
+
+    def invoke(self, ctx):
+        # Sub-commands return their exit status
+        status = super().invoke(ctx)
+        if isinstance(status, int) and status:
+            ctx.exit(status)
+        return status
+
+
+@click.group(cls=DefaultCommandGroup)
+def bump_release():
+    """
+    Update release numbers in various places, according to a release.ini file places at the project root.
+
+    \b
+    Without sub-command, the `bump` command is invoked:
+
+    \b
+    $ bump_release <major>.<minor>.<release>
+    """
+
+
+@bump_release.command(name="bump")
 @click.option(
     "-r",
     "--release-file",
     "release_file",
     help="Release file path, default `./release.ini`",
-    type=click.Path(exists=True),
+    type=click.Path(dir_okay=False),
     default="release.ini",
 )
 @click.option(
@@ -58,13 +96,87 @@ RELEASE_CONFIG: Optional[ConfigParser] = None
     help="If set, more traces are printed for users",
     default=False,
 )
+@click.option(
+    "-R",
+    "--recursive",
+    "recursive",
+    help="Bumps all the projects with a release.ini file under this directory",
+    type=click.Path(exists=True, file_okay=False),
+    default=None,
+)
+@click.option(
+    "-j",
+    "--jobs",
+    "jobs",
+    help="Number of projects bumped in parallel, for recursive runs",
+    type=click.IntRange(min=1),
+    default=1,
+)
+@click.option(
+    "--shard",
+    "shard",
+    help="Processes only the <INDEX>/<COUNT> share of the projects, for recursive runs",
+    default=None,
+)
+@click.option(
+    "-o",
+    "--results",
+    "results",
+    help="Result file path, for recursive runs",
+    type=click.Path(dir_okay=False),
+    default=None,
+)
+@click.option(
+    "--profile",
+    "profile",
+    help="Profiles the updates with cProfile and tracemalloc, and writes the profiles in this directory",
+    type=click.Path(file_okay=False),
+    default=None,
+)
+@click.option(
+    "--journal",
+    "journal_path",
+    help=f"Journal of the bumped projects, for recursive runs, `<root>/{journal.JOURNAL_FILE_NAME}` with --resume",
+    type=click.Path(dir_okay=False),
+    default=None,
+)
+@click.option(
+    "--resume",
+    "resume",
+    is_flag=True,
+    help="Skips the projects of the journal already bumped to the release, for recursive runs",
+    default=False,
+)
+@click.option(
+    "--max-open-files",
+    "max_open_files",
+    help="Maximum number of files opened at once by all the jobs, for recursive runs, default: half the process limit",
+    type=click.IntRange(min=1),
+    default=None,
+)
+@click.option(
+    "--device-jobs",
+    "device_jobs",
+    help="Maximum number of projects bumped at once on a device (disk, network mount...), for recursive runs",
+    type=click.IntRange(min=1),
+    default=None,
+)
 @click.version_option(version=__version__)
-@click.argument("release")
-def bump_release(
-    release: str,
+@click.argument("release", nargs=-1, required=True)
+def bump(
+    release: Tuple[str, ...],
     release_file: Optional[str] = None,
     dry_run: bool = False,
     debug: bool = False,
+    recursive: Optional[str] = None,
+    jobs: int = 1,
+    shard: Optional[str] = None,
+    results: Optional[str] = None,
+    profile: Optional[str] = None,
+    journal_path: Optional[str] = None,
+    resume: bool = False,
+    max_open_files: Optional[int] = None,
+    device_jobs: Optional[int] = None,
 ) -> int:
     """
     Update release numbers in various places, according to a release.ini file places at the project root.
@@ -78,15 +190,57 @@ def bump_release(
     + sonar-project.properties
     + ansible vars file
     + node package.json file
+    + node package-lock.json / npm-shrinkwrap.json file
     + setup.cfg
     + setup.py
+    + pyproject.toml
+    + XML files (pom.xml, .csproj...)
+
+    \b
+    RELEASE is the new release number, as <major>.<minor>.<release>. The version streams of the release.ini file
+    (`[stream:<name>]` sections) are bumped in the same run with <name>=<major>.<minor>.<release> arguments.
     \f
-    :param release: Release number
+    :param release: Release numbers, as `<release>` for the default stream, and `<stream>=<release>` for the others
     :param release_file: Release file path, default `./release.ini`
     :param dry_run: If `True`, no operation performed
     :param debug: If `True`, more traces are printed for users
+    :param recursive: Root directory of a recursive run
+    :param jobs: Number of projects bumped in parallel
+    :param shard: Share of the projects to process, as `<index>/<count>`
+    :param results: Result file path
+    :param profile: Profile files directory
+    :param journal_path: Journal file path
+    :param resume: If `True`, the projects already bumped according to the journal are skipped
+    :param max_open_files: Maximum number of files opened at once
+    :param device_jobs: Maximum number of projects bumped at once on a device
     :return: 0 if success, 1|2 if error
     """
+    try:
+        releases = parse_releases(release)
+    except ValueError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+
+    profile_dir = Path(profile).resolve() if profile is not None else None
+    if recursive is not None:
+        if list(releases) != [None]:
+            print("ERROR: Recursive runs only bump the default stream", file=sys.stderr)
+            return 1
+        return bump_recursive(
+            root=Path(recursive),
+            release=releases[None],
+            dry_run=dry_run,
+            debug=debug,
+            jobs=jobs,
+            shard=shard,
+            results=results,
+            profile_dir=profile_dir,
+            journal_path=Path(journal_path) if journal_path is not None else None,
+            resume=resume,
+            max_open_files=max_open_files,
+            device_jobs=device_jobs,
+        )
+
     # Loads the release.ini file
     global RELEASE_CONFIG, RELEASE_FILE
 
@@ -99,15 +253,482 @@ def bump_release(
         print(f"Unable to find release.ini file in the current directory {Path.cwd()}", file=sys.stderr)
         return 1
 
-    RELEASE_CONFIG = helpers.load_release_file(release_file=RELEASE_FILE)
     try:
-        return process_update(release_file=RELEASE_FILE, release=release, dry_run=dry_run, debug=debug)
+        RELEASE_CONFIG = helpers.load_release_file(release_file=RELEASE_FILE)
+        with helpers.track_changes() as changes:
+            if profile_dir is not None:
+                status = profiling.profile_call(
+                    profiling.profile_name(RELEASE_FILE),
+                    profile_dir,
+                    process_streams,
+                    release_file=RELEASE_FILE,
+                    releases=releases,
+                    dry_run=dry_run,
+                    debug=debug,
+                )
+            else:
+                status = process_streams(release_file=RELEASE_FILE, releases=releases, dry_run=dry_run, debug=debug)
     except Exception as e:
         print(f"ERROR: {e}", file=sys.stderr)
         return 2
+    # One line per change, as `[<section>] <path>:<line> <key>: <old> -> <new> (<status>)`
+    for change in changes:
+        click.echo(f"[{change.section}] {change} ({change.status})")
+    return status
 
 
-def process_update(release_file: Path, release: str, dry_run: bool, debug: bool = False) -> int:
+def bump_recursive(
+    root: Path,
+    release: str,
+    dry_run: bool = False,
+    debug: bool = False,
+    jobs: int = 1,
+    shard: Optional[str] = None,
+    results: Optional[str] = None,
+    profile_dir: Optional[Path] = None,
+    journal_path: Optional[Path] = None,
+    resume: bool = False,
+    max_open_files: Optional[int] = None,
+    device_jobs: Optional[int] = None,
+) -> int:
+    """
+    Bumps all the projects with a release.ini file under `root`
+
+    With a journal, each bumped project is appended to the journal as soon as it is finished. An interrupted run
+    restarted with `resume` only bumps the projects which are not already at the target state.
+
+    :param root: Root directory
+    :param release: Release number
+    :param dry_run: If `True`, no operation performed
+    :param debug: If `True`, more traces are printed for users
+    :param jobs: Number of projects bumped in parallel
+    :param shard: Share of the projects to process, as `<index>/<count>`
+    :param results: Result file path
+    :param profile_dir: Profile files directory
+    :param journal_path: Journal file path, default `<root>/.bump_release-journal.jsonl` if `resume`
+    :param resume: If `True`, the projects already bumped according to the journal are skipped
+    :param max_open_files: Maximum number of files opened at once
+    :param device_jobs: Maximum number of projects bumped at once on a device
+    :return: 0 if success, 1|2 if error
+    """
+    try:
+        split_version(release)
+        _shard = batch.parse_shard(shard) if shard else None
+    except ValueError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+
+    release_files = batch.discover_release_files(root)
+    if _shard is not None:
+        release_files = batch.shard_release_files(release_files, root, *_shard)
+    logging.info(f"bump_recursive({root}) {len(release_files)} project(s) to bump")
+
+    if resume and journal_path is None:
+        journal_path = root / journal.JOURNAL_FILE_NAME
+    if journal_path is None:
+        journal_context: ContextManager[Optional[journal.Journal]] = nullcontext()
+    elif dry_run:
+        # A dry run only reads the journal, to skip the same projects as the real run
+        journal_context = nullcontext(journal.Journal(journal_path).load())
+    else:
+        journal_context = journal.Journal(journal_path)
+    with journal_context as journal_file:
+        report = batch.build_report(
+            batch.run_batch(
+                release_files,
+                release=release,
+                dry_run=dry_run,
+                debug=debug,
+                jobs=jobs,
+                profile_dir=profile_dir,
+                journal_file=journal_file,
+                resume=resume,
+                max_open_files=max_open_files,
+                device_jobs=device_jobs,
+            ),
+            root=root,
+            release=release,
+            shard=_shard,
+        )
+    if results is not None:
+        batch.write_report(report, Path(results))
+    summary = report["summary"]
+    skipped = summary.get(journal.STATUS_SKIPPED, 0)
+    print(
+        f"{summary['ok']}/{summary['total']} project(s) bumped to {release}"
+        + (f", {skipped} already bumped" if skipped else ""),
+        file=sys.stderr,
+    )
+    if "io" in summary:
+        io = summary["io"]
+        print(
+            f"I/O: queue depth max {io['queue_depth']['max']}, "
+            f"queue wait mean {io['queue_wait']['mean']:.3f} s / max {io['queue_wait']['max']:.3f} s, "
+            f"open files wait max {io['open_files_wait']['max']:.3f} s, {len(io['devices'])} device(s)",
+            file=sys.stderr,
+        )
+    return 2 if summary["error"] else 0
+
+
+@bump_release.command(name="batch")
+@click.option(
+    "-j",
+    "--jobs",
+    "jobs",
+    help="Number of jobs run in parallel",
+    type=click.IntRange(min=1),
+    default=1,
+)
+@click.option(
+    "-d",
+    "--debug",
+    "debug",
+    is_flag=True,
+    help="If set, more traces are printed for users",
+    default=False,
+)
+@click.option(
+    "--journal",
+    "journal_path",
+    help=f"Journal of the bumped projects, default `./{journal.JOURNAL_FILE_NAME}` with --resume",
+    type=click.Path(dir_okay=False),
+    default=None,
+)
+@click.option(
+    "--resume",
+    "resume",
+    is_flag=True,
+    help="Skips the jobs of the journal already bumped to their version",
+    default=False,
+)
+@click.option(
+    "--max-open-files",
+    "max_open_files",
+    help="Maximum number of files opened at once by all the jobs, default: half the process limit",
+    type=click.IntRange(min=1),
+    default=None,
+)
+@click.argument("jobs_file", type=click.File("r"), default="-")
+def batch_jobs(
+    jobs_file,
+    jobs: int = 1,
+    debug: bool = False,
+    journal_path: Optional[str] = None,
+    resume: bool = False,
+    max_open_files: Optional[int] = None,
+) -> int:
+    """
+    Runs the JSONL jobs of JOBS_FILE, or of the standard input with `-`, and writes one JSONL result per job
+
+    \b
+    Each job is a JSON object, one per line:
+    {"release_file": "<path>/release.ini", "version": "<release>", "dry_run": false}
+    \f
+    :param jobs_file: JSONL jobs stream
+    :param jobs: Number of jobs run in parallel
+    :param debug: If `True`, more traces are printed for users
+    :param journal_path: Journal file path
+    :param resume: If `True`, the jobs already done according to the journal are skipped
+    :param max_open_files: Maximum number of files opened at once
+    :return: 0 if success, 2 if a job failed
+    """
+    if resume and journal_path is None:
+        journal_path = journal.JOURNAL_FILE_NAME
+    with journal.Journal(Path(journal_path)) if journal_path is not None else nullcontext() as journal_file:
+        summary = batch.run_jobs(
+            jobs_file,
+            output=sys.stdout,
+            jobs=jobs,
+            debug=debug,
+            journal_file=journal_file,
+            resume=resume,
+            max_open_files=max_open_files,
+        )
+    skipped = summary.get(journal.STATUS_SKIPPED, 0)
+    print(
+        f"{summary['ok']}/{summary['total']} job(s) succeeded" + (f", {skipped} already done" if skipped else ""),
+        file=sys.stderr,
+    )
+    return 2 if summary["error"] else 0
+
+
+@bump_release.command(name="watch")
+@click.option(
+    "-n",
+    "--dry-run",
+    "dry_run",
+    is_flag=True,
+    help="If set, no operation are performed on files",
+    default=False,
+)
+@click.option(
+    "-d",
+    "--debug",
+    "debug",
+    is_flag=True,
+    help="If set, more traces are printed for users",
+    default=False,
+)
+@click.option(
+    "--polling",
+    "polling",
+    is_flag=True,
+    help="Polls the release files, even if inotify is available",
+    default=False,
+)
+@click.option(
+    "--interval",
+    "interval",
+    help="Polling interval, in seconds",
+    type=click.FloatRange(min=0.01),
+    default=watch.POLL_INTERVAL,
+    show_default=True,
+)
+@click.argument("root", type=click.Path(exists=True, file_okay=False), default=".")
+def watch_projects(
+    root: str,
+    dry_run: bool = False,
+    debug: bool = False,
+    polling: bool = False,
+    interval: float = watch.POLL_INTERVAL,
+) -> int:
+    """
+    Watches the release.ini files under ROOT, and updates the files of a project when its `current_release` changes
+    \f
+    :param root: Root directory
+    :param dry_run: If `True`, no operation performed
+    :param debug: If `True`, more traces are printed for users
+    :param polling: If `True`, the release files are polled
+    :param interval: Polling interval, in seconds
+    :return: 0 when interrupted
+    """
+    # The sections missing from a project are not reported on each sync
+    logging.basicConfig(level=logging.DEBUG if debug else logging.ERROR)
+    root_path = Path(root).resolve()
+    with watch.Watch(root_path, dry_run=dry_run, polling=polling, interval=interval) as watcher:
+        print(f"Watching {len(watcher.projects)} project(s) under {root_path}, press Ctrl+C to stop", file=sys.stderr)
+        try:
+            while True:
+                for result in watcher.poll():
+                    name = batch.relative_name(Path(result["release_file"]), root_path)
+                    if result["status"] == "error":
+                        print(f"ERROR: {name}: {result['error']}", file=sys.stderr)
+                        continue
+                    click.echo(f"{name}: synced to {result['release']} in {result['duration'] * 1000:.1f} ms")
+                    for change in result["changes"]:
+                        click.echo(f"  [{change.section}] {change} ({change.status})")
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+@bump_release.command(name="init")
+@click.option(
+    "--detect",
+    "detect_files",
+    is_flag=True,
+    help="Detects the version-bearing files tracked by git, and writes a release.ini file per project",
+    default=False,
+)
+@click.option(
+    "--root",
+    "root",
+    help="Root directory, default to the current directory",
+    type=click.Path(exists=True, file_okay=False),
+    default=".",
+)
+@click.option(
+    "--release",
+    "release",
+    help="Current release, without `--detect`",
+    default="0.0.1",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    "jobs",
+    help="Number of files tested in parallel",
+    type=click.IntRange(min=1),
+    default=None,
+)
+@click.option(
+    "-f",
+    "--force",
+    "force",
+    is_flag=True,
+    help="If set, existing release.ini files are overwritten",
+    default=False,
+)
+@click.option(
+    "-n",
+    "--dry-run",
+    "dry_run",
+    is_flag=True,
+    help="If set, release.ini files are printed instead of written",
+    default=False,
+)
+def init(
+    detect_files: bool = False,
+    root: str = ".",
+    release: str = "0.0.1",
+    jobs: Optional[int] = None,
+    force: bool = False,
+    dry_run: bool = False,
+) -> int:
+    """
+    Creates release.ini files
+    \f
+    :param detect_files: If `True`, the version-bearing files are detected from the git index
+    :param root: Root directory
+    :param release: Current release, without `detect_files`
+    :param jobs: Number of files tested in parallel
+    :param force: If `True`, existing release.ini files are overwritten
+    :param dry_run: If `True`, release.ini files are printed instead of written
+    :return: 0 if success, 1|2 if error
+    """
+    _root = Path(root)
+    if detect_files:
+        try:
+            projects = detect.detect(_root, jobs=jobs)
+        except helpers.UpdateException as e:
+            print(f"ERROR: {e}", file=sys.stderr)
+            return 2
+        configs = {project: detect.build_release_config(project, projects[project]) for project in sorted(projects)}
+    else:
+        try:
+            split_version(release)
+        except ValueError:
+            print(
+                f'ERROR: Version number "{release}" does not respect the <MAJOR>.<MINOR>.<RELEASE> format',
+                file=sys.stderr,
+            )
+            return 2
+        config = configparser.ConfigParser()
+        config["DEFAULT"]["current_release"] = release
+        configs = {Path("."): config}
+
+    status = 0
+    for project, config in configs.items():
+        path = _root / project / batch.RELEASE_FILE_NAME
+        if dry_run:
+            click.echo(f"# {path}")
+            config.write(sys.stdout)
+            continue
+        if path.exists() and not force:
+            print(f"WARNING: {path} already exists, use `--force` to overwrite it", file=sys.stderr)
+            status = 1
+            continue
+        with path.open(mode="w") as release_file:
+            config.write(release_file)
+        print(f"{path} written", file=sys.stderr)
+    return status
+
+
+@bump_release.command(name="merge-results")
+@click.option(
+    "-o",
+    "--output",
+    "output",
+    help="Merged result file path, default to the standard output",
+    type=click.Path(dir_okay=False),
+    default=None,
+)
+@click.argument("result_files", nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+def merge_results(result_files: Tuple[str, ...], output: Optional[str] = None) -> int:
+    """
+    Merges the result files of a sharded recursive run into a single report
+    \f
+    :param result_files: Result files of the shards
+    :param output: Merged result file path
+    :return: 0 if success, 1|2 if error
+    """
+    try:
+        report = batch.merge_reports(Path(result_file) for result_file in result_files)
+    except (ValueError, KeyError, helpers.UpdateException) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 2
+    if output is not None:
+        batch.write_report(report, Path(output))
+    else:
+        click.echo(json.dumps(report, indent=2))
+    if report.get("missing_shards"):
+        print(f"WARNING: missing shards {report['missing_shards']}", file=sys.stderr)
+        return 1
+    return 0 if not report["summary"]["error"] else 2
+
+
+def stream_section(name: str, stream: Optional[str] = None) -> str:
+    """
+    Name of a section of the release.ini file for a version stream
+
+    :param name: Section name, *eg.* `node`
+    :param stream: Version stream, `None` for the default stream
+    :return: `<name>:<stream>`, or `<name>` for the default stream
+    """
+    return f"{name}:{stream}" if stream else name
+
+
+def parse_releases(releases: Tuple[str, ...]) -> Dict[Optional[str], str]:
+    """
+    Parses the release numbers of the command line, as `<release>` for the default stream, and as `<stream>=<release>`
+    for the named streams
+
+    :param releases: Release numbers
+    :return: Release numbers by stream, `None` being the default stream
+    """
+    parsed: Dict[Optional[str], str] = {}
+    for release in releases:
+        stream, _sep, number = release.rpartition("=")
+        _stream = stream or None
+        if _stream in parsed:
+            raise ValueError(f"Several release numbers for the `{stream or 'default'}` stream")
+        split_version(number)
+        parsed[_stream] = number
+    return parsed
+
+
+def process_streams(release_file: Path, releases: Dict[Optional[str], str], dry_run: bool, debug: bool = False) -> int:
+    """
+    Updates the files of several version streams in one run
+
+    Each file is read and written only once, even if it is updated by several streams (*eg.* the release.ini file).
+
+    :param release_file: Release file path
+    :param releases: Release numbers by stream, `None` being the default stream
+    :param dry_run: If `True`, no operation performed
+    :param debug: If `True`, more traces are printed for users
+    :return: 0 if success
+    """
+    assert RELEASE_CONFIG is not None
+    for stream in releases:
+        if stream is not None and not RELEASE_CONFIG.has_section(stream_section("stream", stream)):
+            raise helpers.NothingToDoException(f"No `stream:{stream}` section in release.ini file")
+
+    status = 0
+    with helpers.buffered_writes():
+        for stream, release in releases.items():
+            if process_update(release_file, release=release, dry_run=dry_run, debug=debug, stream=stream):
+                status = 2
+    return status
+
+
+def process_update(
+    release_file: Path,
+    release: str,
+    dry_run: bool,
+    debug: bool = False,
+    stream: Optional[str] = None,
+) -> int:
+    """
+    Updates the files of a version stream
+
+    :param release_file: Release file path
+    :param release: Release number
+    :param dry_run: If `True`, no operation performed
+    :param debug: If `True`, more traces are printed for users
+    :param stream: Version stream, `None` for the default stream
+    :return: 0 if success
+    """
     version = split_version(release)
 
     # Initialize the logging
@@ -116,260 +737,480 @@ def process_update(release_file: Path, release: str, dry_run: bool, debug: bool
     else:
         logging.basicConfig(level=logging.INFO)
 
+    changes: List[helpers.Change] = []
+
     # region Updates the main project (DJANGO_SETTINGS_MODULE file for django projects, __init__.py file...)
     try:
-        new_row = update_main_file(version=version, dry_run=dry_run)
-        if new_row is not None:
-            logging.debug(f"process_update() `main_project`: new_row = {new_row.strip()}")
+        changes += update_main_file(version=version, dry_run=dry_run, section=stream_section("main_project", stream))
     except helpers.NothingToDoException as e:
-        logging.warning(f"process_update() No release section for `main_project`: {e}")
+        logging.warning(f"process_update() No release section for `{stream_section('main_project', stream)}`: {e}")
     # endregion
 
     # region Updates sonar-scanner properties
     try:
-        new_row = update_sonar_properties(version=version, dry_run=dry_run)
-        if new_row is not None:
-            logging.debug(f"process_update() `sonar`: new_row = {new_row.strip()}")
+        changes += update_sonar_properties(version=version, dry_run=dry_run, section=stream_section("sonar", stream))
     except helpers.NothingToDoException as e:
-        logging.warning(f"process_update() No release section for `sonar`: {e}")
+        logging.warning(f"process_update() No release section for `{stream_section('sonar', stream)}`: {e}")
     # endregion
 
     # region Updates setup.py file
     try:
-        new_row = update_setup_file(version=version, dry_run=dry_run)
-        if new_row is not None:
-            logging.debug(f"process_update() `setup`: new_row = {new_row.strip()}")
+        changes += update_setup_file(version=version, dry_run=dry_run, section=stream_section("setup", stream))
     except helpers.NothingToDoException as e:
-        logging.warning(f"process_update() No release section for `setup`: {e}")
+        logging.warning(f"process_update() No release section for `{stream_section('setup', stream)}`: {e}")
     # endregion
 
     # region Update setup.cfg file
     try:
-        new_row = update_setup_cfg_file(version=version, dry_run=dry_run)
-        if new_row is not None:
-            logging.debug(f"process_update() `setup`: new_row = {new_row.strip()}")
+        changes += update_setup_cfg_file(version=version, dry_run=dry_run, section=stream_section("setup_cfg", stream))
     except helpers.NothingToDoException as e:
-        logging.warning(f"process_update() No release section for `setup`: {e}")
+        logging.warning(f"process_update() No release section for `{stream_section('setup_cfg', stream)}`: {e}")
     # endregion Update setup.cfg file
 
+    # region Update pyproject.toml file
+    try:
+        changes += update_pyproject_file(version=version, dry_run=dry_run, section=stream_section("pyproject", stream))
+    except helpers.NothingToDoException as e:
+        logging.warning(f"process_update() No release section for `{stream_section('pyproject', stream)}`: {e}")
+    # endregion Update pyproject.toml file
+
+    # region Update XML file
+    try:
+        changes += update_xml_file(version=version, dry_run=dry_run, section=stream_section("xml", stream))
+    except helpers.NothingToDoException as e:
+        logging.warning(f"process_update() No release section for `{stream_section('xml', stream)}`: {e}")
+    # endregion Update XML file
+
     # region Updates sphinx file
     try:
-        new_row = update_docs_conf(version=version, dry_run=dry_run)
-        if new_row is not None:
-            logging.debug(f"process_update() `docs`: new_row = {new_row.strip()}")
+        changes += update_docs_conf(version=version, dry_run=dry_run, section=stream_section("docs", stream))
     except helpers.NothingToDoException as e:
-        logging.warning(f"process_update() No release section for `docs`: {e}")
+        logging.warning(f"process_update() No release section for `{stream_section('docs', stream)}`: {e}")
     # endregion
 
     # region Updates node packages file
     try:
-        new_row = update_node_package(version=version, dry_run=dry_run)
-        if new_row is not None:
-            logging.debug(
-                f"process_update() `node`: new_row = {new_row}",
-            )
+        changes += update_node_package(version=version, dry_run=dry_run, section=stream_section("node", stream))
+    except helpers.NothingToDoException as e:
+        logging.warning(f"process_update() No release section for `{stream_section('node', stream)}`: {e}")
+    # endregion
+
+    # region Updates node lockfile
+    try:
+        changes += update_node_lockfile(version=version, dry_run=dry_run, section=stream_section("node_lock", stream))
     except helpers.NothingToDoException as e:
-        logging.warning(f"process_update() No release section for `node`: {e}")
+        logging.warning(f"process_update() No release section for `{stream_section('node_lock', stream)}`: {e}")
     # endregion
 
     # region Updates YAML file
     try:
-        new_row = update_ansible_vars(version=version, dry_run=dry_run)
-        if new_row is not None:
-            logging.debug(f"process_update() `ansible`: new_row = {new_row.strip()}")
+        changes += update_ansible_vars(version=version, dry_run=dry_run, section=stream_section("ansible", stream))
     except helpers.NothingToDoException as e:
-        logging.warning(f"process_update() No release section for `ansible`: {e}")
+        logging.warning(f"process_update() No release section for `{stream_section('ansible', stream)}`: {e}")
     # endregion
 
     # region Updates the release.ini file with the new release number
-    new_row = update_release_ini(path=release_file, version=version, dry_run=dry_run)
-    if new_row is not None:
-        logging.warning(f"process_update() `release.ini`: new_row = {new_row.strip()}")
+    changes += update_release_ini(path=release_file, version=version, dry_run=dry_run, stream=stream)
     # endregion
 
+    # region Propagates the new release number to the dependents
+    try:
+        changes += update_dependents(version=version, dry_run=dry_run, section=stream_section("propagate", stream))
+    except helpers.NothingToDoException as e:
+        logging.debug(f"process_update() No release section for `{stream_section('propagate', stream)}`: {e}")
+    # endregion
+
+    for change in changes:
+        logging.info(f"process_update() `{change.section}`: {change} ({change.status})")
+    helpers.record_changes(changes)
     return 0
 
 
-def update_main_file(version: Tuple[str, str, str], dry_run: bool = True) -> Optional[str]:
+def update_main_file(
+    version: Tuple[str, str, str],
+    dry_run: bool = True,
+    section: str = "main_project",
+) -> List[helpers.Change]:
     """
     Updates the main django settings file, or a python script with a __init__.py file.
 
     :param version: Release number tuple (major, minor, release)
     :param dry_run: If `True`, no operation performed
-    :return: changed string
+    :param section: Section of the release.ini file
+    :return: Changes
     """
     assert RELEASE_CONFIG is not None
-    if not RELEASE_CONFIG.has_section("main_project"):
-        raise helpers.NothingToDoException("No `main_project` section in release.ini file")
+    if not RELEASE_CONFIG.has_section(section):
+        raise helpers.NothingToDoException(f"No `{section}` section in release.ini file")
 
     try:
-        _path = RELEASE_CONFIG["main_project"].get("path")
+        _path = RELEASE_CONFIG[section].get("path")
         if _path is None:
             raise helpers.NothingToDoException("No action to perform for main project: No path provided.")
         path = Path(_path)
-        pattern = RELEASE_CONFIG["main_project"].get("pattern", "").strip('"') or helpers.MAIN_PROJECT_PATTERN
-        template = RELEASE_CONFIG["main_project"].get("template", "").strip('"') or helpers.MAIN_PROJECT_TEMPLATE
+        pattern = RELEASE_CONFIG[section].get("pattern", "").strip('"') or helpers.MAIN_PROJECT_PATTERN
+        template = RELEASE_CONFIG[section].get("template", "").strip('"') or helpers.MAIN_PROJECT_TEMPLATE
     except configparser.Error as e:
         raise helpers.NothingToDoException("Unable to update main project file", e)
-    return helpers.update_file(path=path, pattern=pattern, template=template, version=version, dry_run=dry_run)
+    change = helpers.update_file(
+        path=path,
+        pattern=pattern,
+        template=template,
+        version=version,
+        dry_run=dry_run,
+        config_section=section,
+    )
+    return [change]
 
 
-def update_setup_file(version: Tuple[str, str, str], dry_run: bool = False) -> Optional[str]:
+def update_setup_file(
+    version: Tuple[str, str, str],
+    dry_run: bool = False,
+    section: str = "setup",
+) -> List[helpers.Change]:
     """
     Updates the setup.py file.
 
     :param version: Release number tuple (major, minor, release)
     :param dry_run: If `True`, no operation performed
-    :return: changed string
+    :param section: Section of the release.ini file
+    :return: Changes
     """
     assert RELEASE_CONFIG is not None
-    if not RELEASE_CONFIG.has_section("setup"):
-        raise helpers.NothingToDoException("No `setup` section in release.ini file")
+    if not RELEASE_CONFIG.has_section(section):
+        raise helpers.NothingToDoException(f"No `{section}` section in release.ini file")
 
     try:
-        _path = RELEASE_CONFIG["setup"].get("path")
+        _path = RELEASE_CONFIG[section].get("path")
         path = Path(_path)
-        pattern = RELEASE_CONFIG["setup"].get("pattern", "").strip('"') or helpers.SETUP_PATTERN
-        template = RELEASE_CONFIG["setup"].get("template", "").strip('"') or helpers.SETUP_TEMPLATE
+        pattern = RELEASE_CONFIG[section].get("pattern", "").strip('"') or helpers.SETUP_PATTERN
+        template = RELEASE_CONFIG[section].get("template", "").strip('"') or helpers.SETUP_TEMPLATE
 
     except configparser.Error as e:
         raise helpers.NothingToDoException("No action to perform for setup file", e)
-    return helpers.update_file(path=path, pattern=pattern, template=template, version=version, dry_run=dry_run)
+    change = helpers.update_file(
+        path=path,
+        pattern=pattern,
+        template=template,
+        version=version,
+        dry_run=dry_run,
+        config_section=section,
+    )
+    return [change]
 
 
-def update_setup_cfg_file(version: Tuple[str, str, str], dry_run: bool = False) -> Optional[str]:
+def update_setup_cfg_file(
+    version: Tuple[str, str, str],
+    dry_run: bool = False,
+    section: str = "setup_cfg",
+) -> List[helpers.Change]:
     """
     Update the setup.cfg file.
 
     :param version: Release number tuple (major, minor, release)
     :param dry_run: If `True`, no operation performed
-    :return: changed string
+    :param section: Section of the release.ini file
+    :return: Changes
     """
     assert RELEASE_CONFIG is not None
-    if not RELEASE_CONFIG.has_section("setup_cfg"):
-        raise helpers.NothingToDoException("No `setup_cfg` section in release.ini file")
+    if not RELEASE_CONFIG.has_section(section):
+        raise helpers.NothingToDoException(f"No `{section}` section in release.ini file")
 
     try:
-        _path = RELEASE_CONFIG["setup_cfg"].get("path")
+        _path = RELEASE_CONFIG[section].get("path")
         path = Path(_path)
-        pattern = RELEASE_CONFIG["setup_cfg"].get("pattern", "").strip('"') or helpers.SETUP_CFG_PATTERN
-        template = RELEASE_CONFIG["setup_cfg"].get("template", "").strip('"') or helpers.SETUP_CFG_TEMPLATE
+        pattern = RELEASE_CONFIG[section].get("pattern", "").strip('"') or helpers.SETUP_CFG_PATTERN
+        template = RELEASE_CONFIG[section].get("template", "").strip('"') or helpers.SETUP_CFG_TEMPLATE
 
     except configparser.Error as e:
         raise helpers.NothingToDoException("No action to perform for setup.cfg file", e)
-    return helpers.update_file(path=path, pattern=pattern, template=template, version=version, dry_run=dry_run)
+    change = helpers.update_file(
+        path=path,
+        pattern=pattern,
+        template=template,
+        version=version,
+        dry_run=dry_run,
+        config_section=section,
+    )
+    return [change]
 
 
-def update_sonar_properties(version: Tuple[str, str, str], dry_run: bool = False) -> Optional[str]:
+def update_pyproject_file(
+    version: Tuple[str, str, str],
+    dry_run: bool = False,
+    section: str = "pyproject",
+) -> List[helpers.Change]:
+    """
+    Update the pyproject.toml file.
+
+    :param version: Release number tuple (major, minor, release)
+    :param dry_run: If `True`, no operation performed
+    :param section: Section of the release.ini file
+    :return: Changes
+    """
+    assert RELEASE_CONFIG is not None
+    if not RELEASE_CONFIG.has_section(section):
+        raise helpers.NothingToDoException(f"No `{section}` section in release.ini file")
+
+    try:
+        path = Path(RELEASE_CONFIG[section].get("path", "pyproject.toml"))
+        table = RELEASE_CONFIG[section].get("table", "").strip('"') or None
+        key = RELEASE_CONFIG[section].get("key", "").strip('"') or helpers.PYPROJECT_KEY
+    except configparser.Error as e:
+        raise helpers.NothingToDoException("No action to perform for pyproject.toml file", e)
+    return _in_section(
+        section, [helpers.update_pyproject_file(path=path, version=version, table=table, key=key, dry_run=dry_run)]
+    )
+
+
+def update_xml_file(
+    version: Tuple[str, str, str],
+    dry_run: bool = False,
+    section: str = "xml",
+) -> List[helpers.Change]:
+    """
+    Updates an XML file (pom.xml, .csproj, AndroidManifest.xml...) with the new release number
+
+    :param version: Release number tuple (major, minor, release)
+    :param dry_run: If `True`, no operation performed
+    :param section: Section of the release.ini file
+    :return: Changes
+    """
+    assert RELEASE_CONFIG is not None
+    if not RELEASE_CONFIG.has_section(section):
+        raise helpers.NothingToDoException(f"No `{section}` section in release.ini file")
+
+    try:
+        _path = RELEASE_CONFIG[section].get("path")
+        if _path is None:
+            raise helpers.NothingToDoException("No action to perform for XML file: No path provided.")
+        element = RELEASE_CONFIG[section].get("element", "").strip('"') or helpers.XML_ELEMENT
+        template = RELEASE_CONFIG[section].get("template", "").strip('"') or helpers.XML_TEMPLATE
+    except configparser.Error as e:
+        raise helpers.NothingToDoException("No action to perform for XML file", e)
+    return _in_section(
+        section,
+        [
+            helpers.update_xml_file(
+                path=Path(_path), version=version, element=element, template=template, dry_run=dry_run
+            )
+        ],
+    )
+
+
+def update_sonar_properties(
+    version: Tuple[str, str, str],
+    dry_run: bool = False,
+    section: str = "sonar",
+) -> List[helpers.Change]:
     """
     Updates the sonar-project.properties file with the new release number
 
     :param version: Release number tuple (major, minor, release)
     :param dry_run: If `True`, no operation performed
-    :return: changed string
+    :param section: Section of the release.ini file
+    :return: Changes
     """
     assert RELEASE_CONFIG is not None
-    if not RELEASE_CONFIG.has_section("sonar"):
-        raise helpers.NothingToDoException("No `sonar` section in release.ini file")
+    if not RELEASE_CONFIG.has_section(section):
+        raise helpers.NothingToDoException(f"No `{section}` section in release.ini file")
 
     try:
-        _path = RELEASE_CONFIG["sonar"].get("path")
+        _path = RELEASE_CONFIG[section].get("path")
         path = Path(_path)
-        pattern = RELEASE_CONFIG["sonar"].get("pattern", "").strip('"') or helpers.SONAR_PATTERN
-        template = RELEASE_CONFIG["sonar"].get("template", "").strip('"') or helpers.SONAR_TEMPLATE
+        pattern = RELEASE_CONFIG[section].get("pattern", "").strip('"') or helpers.SONAR_PATTERN
+        template = RELEASE_CONFIG[section].get("template", "").strip('"') or helpers.SONAR_TEMPLATE
     except configparser.Error as e:
         raise helpers.NothingToDoException("No action to perform for sonar file", e)
-    return helpers.update_file(path=path, pattern=pattern, template=template, version=version, dry_run=dry_run)
+    change = helpers.update_file(
+        path=path,
+        pattern=pattern,
+        template=template,
+        version=version,
+        dry_run=dry_run,
+        config_section=section,
+    )
+    return [change]
 
 
-def update_docs_conf(version: Tuple[str, str, str], dry_run: bool = False) -> Optional[str]:
+def update_docs_conf(
+    version: Tuple[str, str, str],
+    dry_run: bool = False,
+    section: str = "docs",
+) -> List[helpers.Change]:
     """
     Updates the Sphinx conf.py file with the new release number
 
     :param version: Release number tuple (major, minor, release)
     :param dry_run: If `True`, no operation performed
-    :return: changed string
+    :param section: Section of the release.ini file
+    :return: Changes
     """
     assert RELEASE_CONFIG is not None
-    if not RELEASE_CONFIG.has_section("docs"):
-        raise helpers.NothingToDoException("No `docs` section in release.ini file")
+    if not RELEASE_CONFIG.has_section(section):
+        raise helpers.NothingToDoException(f"No `{section}` section in release.ini file")
 
     try:
-        _path = RELEASE_CONFIG["docs"].get("path")
+        _path = RELEASE_CONFIG[section].get("path")
         path = Path(_path)
 
-        pattern_release = RELEASE_CONFIG["docs"].get("pattern_release", "").strip('"') or helpers.DOCS_RELEASE_PATTERN
-        template_release = RELEASE_CONFIG["docs"].get("template_release", "").strip('"') or helpers.DOCS_RELEASE_FORMAT
-        pattern_version = RELEASE_CONFIG["docs"].get("pattern_version", "").strip('"') or helpers.DOCS_VERSION_PATTERN
-        template_version = RELEASE_CONFIG["docs"].get("template_version", "").strip('"') or helpers.DOCS_VERSION_FORMAT
+        pattern_release = RELEASE_CONFIG[section].get("pattern_release", "").strip('"') or helpers.DOCS_RELEASE_PATTERN
+        template_release = RELEASE_CONFIG[section].get("template_release", "").strip('"') or helpers.DOCS_RELEASE_FORMAT
+        pattern_version = RELEASE_CONFIG[section].get("pattern_version", "").strip('"') or helpers.DOCS_VERSION_PATTERN
+        template_version = RELEASE_CONFIG[section].get("template_version", "").strip('"') or helpers.DOCS_VERSION_FORMAT
 
     except configparser.Error as e:
         raise helpers.NothingToDoException("No action to perform for docs file", e)
 
-    update_release = helpers.update_file(
+    release_change = helpers.update_file(
         path=path,
         pattern=pattern_release,
         template=template_release,
         version=version,
         dry_run=dry_run,
+        config_section=section,
     )
-    update_version = helpers.update_file(
+    version_change = helpers.update_file(
         path=path,
         pattern=pattern_version,
         template=template_version,
         version=version,
         dry_run=dry_run,
+        config_section=section,
     )
-    return str(update_release) + str(update_version)
+    return [release_change, version_change]
 
 
-def update_node_package(version: Tuple[str, str, str], dry_run: bool = False) -> Optional[str]:
+def update_node_package(
+    version: Tuple[str, str, str],
+    dry_run: bool = False,
+    section: str = "node",
+) -> List[helpers.Change]:
     """
     Updates the nodejs package file with the new release number
 
     :param version: Release number tuple (major, minor, release)
     :param dry_run: If `True`, no operation performed
-    :return: changed string
+    :param section: Section of the release.ini file
+    :return: Changes
     """
     assert RELEASE_CONFIG is not None
     try:
-        path = Path(RELEASE_CONFIG.get("node", "path"))
-        key = RELEASE_CONFIG.get("node", "key", fallback=helpers.NODE_KEY)  # noqa
+        path = Path(RELEASE_CONFIG.get(section, "path"))
+        key = RELEASE_CONFIG.get(section, "key", fallback=helpers.NODE_KEY)  # noqa
     except configparser.Error as e:
         raise helpers.NothingToDoException("No action to perform for node packages file", e)
-    return helpers.update_node_packages(path=path, version=version, key=key, dry_run=dry_run)
+    return _in_section(section, [helpers.update_node_packages(path=path, version=version, key=key, dry_run=dry_run)])
+
+
+def update_node_lockfile(
+    version: Tuple[str, str, str],
+    dry_run: bool = False,
+    section: str = "node_lock",
+) -> List[helpers.Change]:
+    """
+    Updates the nodejs lockfile (package-lock.json or npm-shrinkwrap.json) with the new release number
+
+    :param version: Release number tuple (major, minor, release)
+    :param dry_run: If `True`, no operation performed
+    :param section: Section of the release.ini file
+    :return: Changes
+    """
+    assert RELEASE_CONFIG is not None
+    try:
+        path = Path(RELEASE_CONFIG.get(section, "path"))
+        key = RELEASE_CONFIG.get(section, "key", fallback=helpers.NODE_KEY)  # noqa
+    except configparser.Error as e:
+        raise helpers.NothingToDoException("No action to perform for node lockfile", e)
+    return _in_section(section, helpers.update_node_lockfile(path=path, version=version, key=key, dry_run=dry_run))
+
+
+def update_dependents(
+    version: Tuple[str, str, str],
+    dry_run: bool = False,
+    section: str = "propagate",
+) -> List[helpers.Change]:
+    """
+    Rewrites the pins of the package in the requirements, setup.cfg and package.json files of its dependents
+
+    :param version: Release number tuple (major, minor, release)
+    :param dry_run: If `True`, no operation performed
+    :param section: Section of the release.ini file
+    :return: Changes
+    """
+    assert RELEASE_CONFIG is not None
+    if not RELEASE_CONFIG.has_section(section):
+        raise helpers.NothingToDoException("No action to perform for dependents")
+    python_name = RELEASE_CONFIG.get(section, "name", fallback=None)
+    node_name = RELEASE_CONFIG.get(section, "node_name", fallback=None)
+    if not python_name and not node_name:
+        raise helpers.NothingToDoException("No package name to propagate, `name` or `node_name` is required")
+    index_path = RELEASE_CONFIG.get(section, "index", fallback=None)
+    changes = propagate.propagate(
+        root=Path(RELEASE_CONFIG.get(section, "root", fallback=".")),
+        version=".".join(version),
+        python_name=python_name,
+        node_name=node_name,
+        index_path=Path(index_path) if index_path else None,
+        jobs=RELEASE_CONFIG.getint(section, "jobs", fallback=None),
+        dry_run=dry_run,
+    )
+    return _in_section(section, changes)
 
 
-def update_ansible_vars(version: Tuple[str, str, str], dry_run: bool = False) -> Optional[str]:
+def update_ansible_vars(
+    version: Tuple[str, str, str],
+    dry_run: bool = False,
+    section: str = "ansible",
+) -> List[helpers.Change]:
     """
     Updates the ansible project variables file with the new release number
 
     :param version: Release number tuple (major, minor, release)
     :param dry_run: If `True`, no operation performed
-    :return: changed string
+    :param section: Section of the release.ini file
+    :return: Changes
     """
     assert RELEASE_CONFIG is not None
     try:
-        path = Path(RELEASE_CONFIG.get("ansible", "path"))
-        key = RELEASE_CONFIG.get("ansible", "key", fallback=helpers.ANSIBLE_KEY)  # noqa
+        path = Path(RELEASE_CONFIG.get(section, "path"))
+        key = RELEASE_CONFIG.get(section, "key", fallback=helpers.ANSIBLE_KEY)  # noqa
     except configparser.Error as e:
         raise helpers.NothingToDoException("No action to perform for ansible file", e)
-    return helpers.updates_yaml_file(path=path, version=version, key=key, dry_run=dry_run)
+    return _in_section(section, [helpers.updates_yaml_file(path=path, version=version, key=key, dry_run=dry_run)])
 
 
-def update_release_ini(path: Path, version: Tuple[str, str, str], dry_run: bool = False) -> Optional[str]:
+def update_release_ini(
+    path: Path,
+    version: Tuple[str, str, str],
+    dry_run: bool = False,
+    stream: Optional[str] = None,
+) -> List[helpers.Change]:
     """
     Updates the release.ini file with the new release number
 
     :param path: Release file path
     :param version: release number, as (<major>, <minor>, <release>)
     :param dry_run: If `True`, the operation WILL NOT be performed
-    :return: Updated lines
+    :param stream: Version stream, `None` for the default stream
+    :return: Changes
     """
-    return helpers.update_file(
+    # The `current_release` of the default stream is in the [DEFAULT] section, wherever the stream sections are
+    ini_section = stream_section("stream", stream) if stream else "DEFAULT"
+    change = helpers.update_file(
         path=path,
         pattern=helpers.RELEASE_INI_PATTERN,
         template=helpers.RELEASE_INI_TEMPLATE,
         version=version,
         dry_run=dry_run,
+        ini_section=ini_section,
+        config_section=ini_section,
     )
+    return [change]
+
+
+def _in_section(section: str, changes: List[helpers.Change]) -> List[helpers.Change]:
+    # The helpers do not know the release.ini sections
+    for change in changes:
+        change.section = section
+    return changes
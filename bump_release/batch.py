@@ -0,0 +1,580 @@
+"""
+Batch runs for :mod:`bump_release` application
+
+Bumps every project of a tree, aka. every directory which contains a release.ini file.
+The discovered projects can be sharded across several CI nodes: each node processes its share
+and writes a result file, and the result files are merged afterwards.
+
+:creationdate: 19/10/2026 06:58
+:moduleauthor: François GUÉRIN <fguerin@ville-tourcoing.fr>
+:modulename: bump_release.batch
+
+"""
+import configparser
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, as_completed, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, TextIO, Tuple
+
+import bump_release
+from bump_release import helpers, journal, profiling, scheduler
+
+__author__ = "fguerin"
+
+# region Constants
+RELEASE_FILE_NAME: str = "release.ini"
+IGNORED_DIRECTORIES: Tuple[str, ...] = (
+    "__pycache__",
+    "build",
+    "dist",
+    "node_modules",
+    "venv",
+)
+# endregion Constants
+
+
+def prune_directories(dirnames: List[str]) -> None:
+    """
+    Removes the hidden directories and the usual build or dependencies directories from the `dirnames` list of
+    :func:`os.walk`, so they are not visited
+
+    :param dirnames: Sub-directories names, modified in place
+    """
+    dirnames[:] = [
+        dirname for dirname in dirnames if not dirname.startswith(".") and dirname not in IGNORED_DIRECTORIES
+    ]
+
+
+def discover_release_files(root: Path, name: str = RELEASE_FILE_NAME) -> List[Path]:
+    """
+    Finds the release files of all the projects under `root`
+
+    Hidden directories and usual build or dependencies directories are not visited.
+
+    :param root: Root directory
+    :param name: Name of the release files
+    :return: Absolute paths of the release files, sorted
+    """
+    root = Path(root).resolve()
+    release_files = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        prune_directories(dirnames)
+        if name in filenames:
+            release_files.append(Path(dirpath) / name)
+    return sorted(release_files)
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """
+    Parses a shard definition
+
+    :param value: Shard, as `<index>/<count>`, `index` being 1-based
+    :return: index, count
+    """
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise ValueError(f'Shard "{value}" does not respect the <INDEX>/<COUNT> format.')
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f'Shard "{value}": index MUST be between 1 and {count}.')
+    return index, count
+
+
+def stable_hash(value: str) -> int:
+    """
+    Hashes a string, the same way on every node and python run (unlike :func:`hash`)
+
+    :param value: string to hash
+    :return: Hash value
+    """
+    return int(hashlib.sha1(value.encode("utf-8")).hexdigest()[:16], 16)
+
+
+def project_paths(release_file: Path) -> List[Path]:
+    """
+    Lists the files of a project: its release file and the files it updates
+
+    :param release_file: Path to the release file
+    :return: Existing files
+    """
+    paths = [release_file]
+    config = configparser.ConfigParser()
+    try:
+        config.read(release_file)
+    except configparser.Error:
+        return paths
+    for section in config.sections():
+        _path = config[section].get("path")
+        if not _path:
+            continue
+        path = release_file.parent / _path.strip('"')
+        if path.is_file():
+            paths.append(path)
+    return paths
+
+
+def project_weight(release_file: Path) -> int:
+    """
+    Estimates the cost of bumping a project, as the size of its release file and of the files it updates
+
+    :param release_file: Path to the release file
+    :return: Weight, in bytes
+    """
+    return sum(path.stat().st_size for path in project_paths(release_file))
+
+
+def project_task(index: int, release_file: Path) -> scheduler.Task:
+    """
+    Scheduling task of a project, with its weight and the devices of its files
+
+    :param index: Index of the project in the batch
+    :param release_file: Path to the release file
+    :return: Task
+    """
+    weight = 0
+    devices = set()
+    for path in project_paths(Path(release_file)):
+        try:
+            stat = path.stat()
+        except OSError:
+            # The bump of the project reports the error
+            continue
+        weight += stat.st_size
+        devices.add(stat.st_dev)
+    return scheduler.Task(index, weight, frozenset(devices))
+
+
+def relative_name(release_file: Path, root: Path) -> str:
+    """
+    Name of a project, as the path of its release file relative to `root`
+
+    :param release_file: Path to the release file
+    :param root: Root directory
+    :return: Relative posix path
+    """
+    return Path(release_file).resolve().relative_to(Path(root).resolve()).as_posix()
+
+
+def shard_release_files(release_files: Iterable[Path], root: Path, index: int, count: int) -> List[Path]:
+    """
+    Selects the share of the `index` shard among `count` shards
+
+    Projects are dispatched, heaviest first, to the least loaded shard. Projects of the same weight are
+    ordered by a stable hash of their relative path, so every node computes the same partition.
+
+    :param release_files: Release files of all the projects
+    :param root: Root directory, used to compute the relative paths
+    :param index: Index of the shard (1-based)
+    :param count: Number of shards
+    :return: Release files of the shard, sorted
+    """
+    projects = []
+    for release_file in release_files:
+        name = relative_name(release_file, root)
+        projects.append((-project_weight(release_file), stable_hash(name), name, release_file))
+    projects.sort()
+
+    loads = [0] * count
+    selected = []
+    for weight, _hash, _name, release_file in projects:
+        shard = min(range(count), key=lambda _index: (loads[_index], _index))
+        loads[shard] += max(-weight, 1)
+        if shard == index - 1:
+            selected.append(release_file)
+    return sorted(selected)
+
+
+def bump_project(
+    release_file: Path,
+    release: str,
+    dry_run: bool = False,
+    debug: bool = False,
+    profile_dir: Optional[Path] = None,
+    hashes: bool = False,
+) -> Dict[str, Any]:
+    """
+    Bumps a single project
+
+    The paths of the release file are relative to the project directory, so the current directory is changed
+    during the update.
+
+    :param release_file: Path to the release file
+    :param release: Release number
+    :param dry_run: If `True`, no operation performed
+    :param debug: If `True`, more traces are printed for users
+    :param profile_dir: If set, the update is profiled and the profile files are written in this directory
+    :param hashes: If `True`, the hashes of the updated files are added to the result, for the journal
+    :return: Result of the project update
+    """
+    release_file = Path(release_file).resolve()
+    result: Dict[str, Any] = {
+        "release_file": str(release_file),
+        "status": "ok",
+        "error": None,
+        "changed_files": [],
+        "changes": [],
+    }
+    started = time.perf_counter()
+    cwd = os.getcwd()
+    try:
+        os.chdir(release_file.parent)
+        bump_release.RELEASE_FILE = release_file
+        bump_release.RELEASE_CONFIG = helpers.load_release_file(release_file=release_file)
+        kwargs = dict(release_file=release_file, release=release, dry_run=dry_run, debug=debug)
+        with helpers.track_writes() as written_files, helpers.track_changes() as changes, helpers.track_io() as waits:
+            try:
+                if profile_dir is not None:
+                    name = profiling.profile_name(release_file)
+                    try:
+                        status = profiling.profile_call(name, profile_dir, bump_release.process_update, **kwargs)
+                    finally:
+                        result["profile"] = str(profiling.profile_path(name, profile_dir))
+                else:
+                    status = bump_release.process_update(**kwargs)
+            finally:
+                result["changed_files"] = [str(path.resolve()) for path in written_files]
+                result["changes"] = [change.as_dict() for change in changes]
+                result["io"] = {"open_files_wait": waits["open_files_wait"]}
+        if status:
+            result["status"] = "error"
+        elif hashes and not dry_run:
+            paths = {Path(path) for path in written_files} | {Path(change.path) for change in changes}
+            result["hashes"] = journal.hash_files(paths)
+    except Exception as e:
+        logging.error(f"bump_project({release_file}) Unable to bump project: {e}")
+        result.update(status="error", error=str(e))
+    finally:
+        os.chdir(cwd)
+    result["duration"] = time.perf_counter() - started
+    return result
+
+
+def _init_worker(open_files_slots: Any) -> None:
+    # The open files slots are shared by all the workers
+    helpers.OPEN_FILES_SLOTS = open_files_slots
+
+
+def run_batch(
+    release_files: List[Path],
+    release: str,
+    dry_run: bool = False,
+    debug: bool = False,
+    jobs: int = 1,
+    profile_dir: Optional[Path] = None,
+    journal_file: Optional[journal.Journal] = None,
+    resume: bool = False,
+    max_open_files: Optional[int] = None,
+    device_jobs: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Bumps all the `release_files` projects
+
+    The projects are dispatched by an :class:`bump_release.scheduler.IoScheduler`, the smallest first, and their
+    updaters share a limit of open files.
+
+    :param release_files: Release files of the projects
+    :param release: Release number
+    :param dry_run: If `True`, no operation performed
+    :param debug: If `True`, more traces are printed for users
+    :param jobs: Number of worker processes
+    :param profile_dir: If set, the updates are profiled and the profiles aggregated in this directory
+    :param journal_file: Opened journal, the bumped projects are appended to it as soon as they are finished
+    :param resume: If `True`, the projects of the journal already at the target state are skipped
+    :param max_open_files: Maximum number of files opened at once by the updaters of all the workers,
+        see :func:`bump_release.scheduler.default_max_open_files`
+    :param device_jobs: Maximum number of projects updated at once on a device, `jobs` if not set
+    :return: Results of the project updates, in the `release_files` order
+    """
+    if profile_dir is not None:
+        # Projects are updated from their own directory
+        profile_dir = Path(profile_dir).resolve()
+    results: List[Optional[Dict[str, Any]]] = [None] * len(release_files)
+    tasks = []
+    for index, release_file in enumerate(release_files):
+        if resume and journal_file is not None and journal_file.is_done(release_file, release):
+            results[index] = journal_file.skipped_result(release_file)
+        else:
+            tasks.append(project_task(index, release_file))
+    if len(tasks) < len(release_files):
+        logging.info(f"run_batch() {len(release_files) - len(tasks)} project(s) already bumped to {release}")
+
+    hashes = journal_file is not None and not dry_run
+    io_scheduler = scheduler.IoScheduler(jobs=min(jobs, max(len(tasks), 1)), device_jobs=device_jobs)
+    slots = helpers.open_files_slots(max_open_files or scheduler.default_max_open_files())
+
+    def _done(task: scheduler.Task, future: Future, stats: Dict[str, Any]) -> None:
+        result = future.result()
+        result.setdefault("io", {}).update(stats, devices=sorted(task.devices))
+        results[task.index] = result
+        if hashes and result["status"] == "ok":
+            journal_file.record(result, release)  # type: ignore
+
+    def _args(task: scheduler.Task) -> Tuple:
+        return release_files[task.index], release, dry_run, debug, profile_dir, hashes
+
+    if jobs <= 1 or len(tasks) <= 1:
+        with helpers.limit_open_files(slots=threading.BoundedSemaphore(slots)):
+            io_scheduler.run(tasks, lambda task: scheduler.run_inline(bump_project, *_args(task)), _done)
+    else:
+        context = multiprocessing.get_context()
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(context.BoundedSemaphore(slots),),
+        ) as executor:
+            io_scheduler.run(tasks, lambda task: executor.submit(bump_project, *_args(task)), _done)
+    if profile_dir is not None:
+        # The profiles left in the directory by the previous runs are not aggregated
+        profiling.aggregate_profiles(profile_dir, [result["profile"] for result in results if "profile" in result])
+    return results  # type: ignore
+
+
+def _run_job(job: Dict[str, Any], submitted: float, debug: bool = False, hashes: bool = False) -> Dict[str, Any]:
+    """
+    Runs a job read from a JSONL stream
+
+    :param job: Job, as `{"release_file": ..., "version": ..., "dry_run": ...}`
+    :param submitted: Submission time of the job (:func:`time.time`)
+    :param debug: If `True`, more traces are printed for users
+    :param hashes: If `True`, the hashes of the updated files are added to the result, for the journal
+    :return: Result of the job
+    """
+    wait = time.time() - submitted
+    result = bump_project(
+        Path(job["release_file"]),
+        release=job["version"],
+        dry_run=bool(job.get("dry_run", False)),
+        debug=debug,
+        hashes=hashes,
+    )
+    result["version"] = job["version"]
+    result["timings"] = {"wait": wait, "duration": result.pop("duration")}
+    return result
+
+
+def _job_error(job: Any, error: str) -> Dict[str, Any]:
+    release_file = job.get("release_file") if isinstance(job, dict) else None
+    return {"release_file": release_file, "status": "error", "error": error, "changed_files": []}
+
+
+def run_jobs(
+    lines: Iterable[str],
+    output: TextIO,
+    jobs: int = 1,
+    debug: bool = False,
+    journal_file: Optional[journal.Journal] = None,
+    resume: bool = False,
+    max_open_files: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Runs the jobs of a JSONL stream, and writes one JSONL result per job as soon as it is finished
+
+    Each job is a JSON object with `release_file`, `version` and an optional `dry_run` keys. An optional `id` key
+    is copied to the result. At most `2 * jobs` jobs are read in advance, so the memory use does not depend on the
+    number of jobs. The jobs are run in the order of the stream, but their updaters share a limit of open files.
+
+    :param lines: JSONL stream of jobs
+    :param output: JSONL stream of results
+    :param jobs: Number of worker processes
+    :param debug: If `True`, more traces are printed for users
+    :param journal_file: Opened journal, the bumped projects are appended to it as soon as they are finished
+    :param resume: If `True`, the jobs of the journal already at the target state are skipped
+    :param max_open_files: Maximum number of files opened at once by the updaters of all the workers,
+        see :func:`bump_release.scheduler.default_max_open_files`
+    :return: Summary of the run
+    """
+    summary = {"total": 0, "ok": 0, "error": 0, "duration": 0.0, "open_files_wait": 0.0}
+    hashes = journal_file is not None
+    slots = helpers.open_files_slots(max_open_files or scheduler.default_max_open_files())
+
+    def _write(job: Any, result: Dict[str, Any]) -> None:
+        if hashes and result["status"] == "ok" and not job.get("dry_run"):
+            journal_file.record(result, job["version"])  # type: ignore
+        if isinstance(job, dict) and "id" in job:
+            result = dict(id=job["id"], **result)
+        output.write(json.dumps(result) + "\n")
+        output.flush()
+        summary["total"] += 1
+        summary[result["status"]] = summary.get(result["status"], 0) + 1
+        summary["duration"] += result.get("timings", {}).get("duration", 0.0)
+        summary["open_files_wait"] += result.get("io", {}).get("open_files_wait", 0.0)
+
+    def _parse(number: int, line: str) -> Optional[Dict[str, Any]]:
+        job = None
+        try:
+            job = json.loads(line)
+            if not isinstance(job, dict) or "release_file" not in job or "version" not in job:
+                raise ValueError("a job MUST be an object with `release_file` and `version` keys")
+            helpers.split_version(job["version"])
+        except (ValueError, AttributeError) as e:
+            _write(job, _job_error(job, f"Invalid job at line {number}: {e}"))
+            return None
+        if resume and journal_file is not None and journal_file.is_done(Path(job["release_file"]), job["version"]):
+            result = journal_file.skipped_result(Path(job["release_file"]))
+            result.update(version=job["version"], timings={"wait": 0.0, "duration": result.pop("duration")})
+            _write(job, result)
+            return None
+        return job
+
+    jobs_lines = ((number, line) for number, line in enumerate(lines, start=1) if line.strip())
+    if jobs <= 1:
+        with helpers.limit_open_files(slots=threading.BoundedSemaphore(slots)):
+            for number, line in jobs_lines:
+                job = _parse(number, line)
+                if job is not None:
+                    _write(job, _run_job(job, time.time(), debug, hashes))
+        return summary
+
+    pending: Dict[Future, Dict[str, Any]] = {}
+    context = multiprocessing.get_context()
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(context.BoundedSemaphore(slots),),
+    ) as executor:
+        for number, line in jobs_lines:
+            job = _parse(number, line)
+            if job is None:
+                continue
+            pending[executor.submit(_run_job, job, time.time(), debug, hashes)] = job
+            if len(pending) >= 2 * jobs:
+                done, _not_done = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    _write_future(pending.pop(future), future, _write)
+        for future in as_completed(list(pending)):
+            _write_future(pending.pop(future), future, _write)
+    return summary
+
+
+def _write_future(job: Dict[str, Any], future: Future, write: Callable) -> None:
+    try:
+        result = future.result()
+    except Exception as e:
+        result = _job_error(job, f"Worker error: {e}")
+    write(job, result)
+
+
+def summarize(results: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Computes the summary of a batch run
+
+    The I/O statistics of the scheduled projects are summarized in an `io` entry: the depth of the queue and the
+    time spent in the queue when the projects have been dispatched, the waits of their updaters for an open files
+    slot, and the number of projects and the queue waits by device.
+
+    :param results: Results of the project updates
+    :return: Summary
+    """
+    summary = {"total": 0, "ok": 0, "error": 0, "duration": 0.0}
+    ios = []
+    for result in results:
+        summary["total"] += 1
+        summary[result["status"]] = summary.get(result["status"], 0) + 1
+        summary["duration"] += result.get("duration", 0.0)
+        if "queue_wait" in result.get("io", {}):
+            ios.append(result["io"])
+    if ios:
+        summary["io"] = summarize_io(ios)
+    return summary
+
+
+def summarize_io(ios: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Computes the I/O statistics of a batch run
+
+    :param ios: I/O statistics of the scheduled projects
+    :return: I/O summary
+    """
+    devices: Dict[str, Dict[str, Any]] = {}
+    for io in ios:
+        for device in io.get("devices", []):
+            stats = devices.setdefault(str(device), {"projects": 0, "queue_wait": 0.0})
+            stats["projects"] += 1
+            stats["queue_wait"] += io["queue_wait"]
+    summary: Dict[str, Any] = {"devices": devices}
+    for key in ("queue_depth", "queue_wait", "open_files_wait"):
+        values = [io.get(key, 0) for io in ios]
+        summary[key] = {"max": max(values), "mean": sum(values) / len(values)}
+    return summary
+
+
+def build_report(
+    results: List[Dict[str, Any]],
+    root: Path,
+    release: str,
+    shard: Optional[Tuple[int, int]] = None,
+) -> Dict[str, Any]:
+    """
+    Builds the report of a batch run, with paths relative to `root` so reports of several nodes can be merged
+
+    :param results: Results of the project updates
+    :param root: Root directory
+    :param release: Release number
+    :param shard: (index, count) of the shard, if any
+    :return: Report
+    """
+    projects = []
+    for result in results:
+        project = dict(result)
+        project["release_file"] = relative_name(Path(result["release_file"]), root)
+        projects.append(project)
+    return {
+        "release": release,
+        "shards": [{"index": shard[0], "count": shard[1]}] if shard else [],
+        "results": projects,
+        "summary": summarize(projects),
+    }
+
+
+def write_report(report: Dict[str, Any], path: Path) -> None:
+    """
+    Writes a report to a JSON file
+
+    :param report: Report
+    :param path: Path of the result file
+    """
+    with Path(path).open(mode="w") as output_file:
+        json.dump(report, output_file, indent=2)
+
+
+def merge_reports(paths: Iterable[Path]) -> Dict[str, Any]:
+    """
+    Merges the result files of several shards into a single report
+
+    :param paths: Paths of the result files
+    :return: Merged report, with the missing shards if any
+    """
+    releases = set()
+    shards: List[Dict[str, int]] = []
+    results: Dict[str, Dict[str, Any]] = {}
+    for path in paths:
+        with Path(path).open(mode="r") as input_file:
+            report = json.load(input_file)
+        releases.add(report["release"])
+        shards.extend(report.get("shards", []))
+        for result in report["results"]:
+            results[result["release_file"]] = result
+
+    if len(releases) > 1:
+        raise helpers.UpdateException(f"Unable to merge results of different releases: {sorted(releases)}")
+
+    merged_results = [results[name] for name in sorted(results)]
+    merged = {
+        "release": releases.pop() if releases else None,
+        "shards": sorted(shards, key=lambda _shard: (_shard["count"], _shard["index"])),
+        "results": merged_results,
+        "summary": summarize(merged_results),
+    }
+    counts = {shard["count"] for shard in shards}
+    if len(counts) == 1:
+        count = counts.pop()
+        merged["missing_shards"] = sorted(set(range(1, count + 1)) - {shard["index"] for shard in shards})
+    return merged
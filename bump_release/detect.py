@@ -0,0 +1,245 @@
+"""
+Detection of version-bearing files for :mod:`bump_release` application
+
+Lists the files tracked by git, tests them against the default patterns and keys of :mod:`bump_release.helpers`,
+and builds a release.ini file for each project root, with the current version filled in.
+
+:creationdate: 19/10/2026 07:01
+:moduleauthor: François GUÉRIN <fguerin@ville-tourcoing.fr>
+:modulename: bump_release.detect
+
+"""
+import configparser
+import logging
+import re
+import subprocess
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+
+from ruamel.yaml import YAML
+from ruamel.yaml.error import YAMLError
+
+from bump_release import helpers, json_scanner, toml_scanner
+
+__author__ = "fguerin"
+
+# region Constants
+#: Extensions of the files which may carry a version number
+CANDIDATE_SUFFIXES = (".py", ".cfg", ".toml", ".properties", ".json", ".yml", ".yaml")
+
+#: Files which mark the root of a project
+ROOT_MARKERS = ("release.ini", "setup.py", "setup.cfg", "pyproject.toml", "package.json")
+
+#: Sections order in the generated release.ini, which is also the priority order to get the current version
+SECTIONS_ORDER = ("setup", "setup_cfg", "pyproject", "main_project", "node", "node_lock", "docs", "ansible", "sonar")
+
+VERSION_RE = re.compile(r"(\d+\.\d+(?:\.[\w]+)?)")
+# endregion Constants
+
+
+class Detection(NamedTuple):
+    """
+    A version number found in a file
+    """
+
+    #: release.ini section
+    section: str
+    #: Path of the file, relative to the repository root
+    path: PurePosixPath
+    #: Current version number
+    version: str
+
+
+def git_tracked_files(root: Path) -> List[PurePosixPath]:
+    """
+    Lists the files of the git index, which skips the ignored build outputs
+
+    :param root: Repository root, or any directory of the repository
+    :return: Paths relative to `root`
+    """
+    try:
+        output = subprocess.run(
+            ["git", "-C", str(root), "ls-files", "-z", "--cached"],
+            check=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError) as e:
+        raise helpers.UpdateException(f"Unable to list the files tracked by git in {root}: {e}")
+    return [PurePosixPath(name) for name in output.decode("utf-8").split("\0") if name]
+
+
+def _search_rows(path: Path, pattern: str) -> Optional[str]:
+    version_re = re.compile(pattern)
+    with path.open(mode="r", errors="replace") as ifile:
+        for row in ifile:
+            searched = version_re.search(row.rstrip("\r\n"))
+            if searched:
+                version = searched.group(1) if searched.groups() else None
+                if version is None:
+                    found = VERSION_RE.search(searched.group(0))
+                    version = found.group(1) if found else None
+                return version
+    return None
+
+
+def _detect_yaml(path: Path) -> Optional[str]:
+    with path.open(mode="r", errors="replace") as ifile:
+        content = ifile.read()
+    if "version" not in content:
+        return None
+    try:
+        node = YAML(typ="safe").load(content)
+    except YAMLError:
+        return None
+    for key in helpers.ANSIBLE_KEY.split("."):
+        if not isinstance(node, dict):
+            return None
+        node = node.get(key)
+    return str(node) if node is not None else None
+
+
+def _detect_json(path: Path) -> Optional[str]:
+    try:
+        span = json_scanner.find_span(path, (helpers.NODE_KEY,))
+    except json_scanner.JsonScanError:
+        return None
+    return str(span.value) if span is not None else None
+
+
+def _detect_pyproject(path: Path) -> Optional[str]:
+    key_paths = [toml_scanner.split_key(table) + (helpers.PYPROJECT_KEY,) for table in helpers.PYPROJECT_TABLES]
+    spans = toml_scanner.find_spans(path, key_paths)
+    for key_path in key_paths:
+        if key_path in spans:
+            return toml_scanner.string_value(spans[key_path])
+    return None
+
+
+def detect_file(root: Path, relative_path: PurePosixPath) -> List[Detection]:
+    """
+    Tests a file against the default patterns and keys
+
+    :param root: Repository root
+    :param relative_path: Path of the file, relative to `root`
+    :return: Detected versions
+    """
+    path = root / relative_path
+    name = relative_path.name
+    checks = []
+    if name == "setup.py":
+        checks.append(("setup", lambda: _search_rows(path, helpers.SETUP_PATTERN)))
+    elif name == "setup.cfg":
+        checks.append(("setup_cfg", lambda: _search_rows(path, helpers.SETUP_CFG_PATTERN)))
+    elif name == "pyproject.toml":
+        checks.append(("pyproject", lambda: _detect_pyproject(path)))
+    elif name == "sonar-project.properties":
+        checks.append(("sonar", lambda: _search_rows(path, helpers.SONAR_PATTERN)))
+    elif name == helpers.NODE_PACKAGE_FILE:
+        checks.append(("node", lambda: _detect_json(path)))
+    elif name in helpers.NODE_LOCK_FILES:
+        checks.append(("node_lock", lambda: _detect_json(path)))
+    elif name == "conf.py":
+        checks.append(("docs", lambda: _search_rows(path, helpers.DOCS_VERSION_PATTERN)))
+        checks.append(("docs", lambda: _search_rows(path, helpers.DOCS_RELEASE_PATTERN)))
+    elif relative_path.suffix == ".py":
+        checks.append(("main_project", lambda: _search_rows(path, helpers.MAIN_PROJECT_PATTERN)))
+    elif relative_path.suffix in (".yml", ".yaml"):
+        checks.append(("ansible", lambda: _detect_yaml(path)))
+
+    detections: Dict[str, Detection] = {}
+    for section, check in checks:
+        try:
+            version = check()
+        except (OSError, UnicodeDecodeError) as e:
+            logging.debug(f"detect_file({path}) Unable to read file: {e}")
+            return []
+        if version is None:
+            # All the checks of a section MUST match
+            detections.pop(section, None)
+            break
+        # The last check of a section gives the most precise version (*eg.* docs release vs. version)
+        detections[section] = Detection(section, relative_path, version)
+    return list(detections.values())
+
+
+def project_root(path: PurePosixPath, roots: Set[PurePosixPath]) -> PurePosixPath:
+    """
+    Finds the root of the project of a file, aka. its nearest directory with a :data:`ROOT_MARKERS` file
+
+    :param path: Path of the file, relative to the repository root
+    :param roots: Directories with a marker file
+    :return: Project root, relative to the repository root
+    """
+    for parent in path.parents:
+        if parent in roots:
+            return parent
+    return PurePosixPath(".")
+
+
+def project_roots(files: Iterable[PurePosixPath]) -> Set[PurePosixPath]:
+    """
+    Lists the directories with a :data:`ROOT_MARKERS` file
+
+    :param files: Tracked files
+    :return: Project roots
+    """
+    return {path.parent for path in files if path.name in ROOT_MARKERS}
+
+
+def detect(root: Path, jobs: Optional[int] = None) -> Dict[PurePosixPath, List[Detection]]:
+    """
+    Detects the version-bearing files of the git repository at `root`
+
+    :param root: Repository root
+    :param jobs: Number of files tested in parallel, default to the executor default
+    :return: Detections, by project root
+    """
+    root = Path(root)
+    files = git_tracked_files(root)
+    roots = project_roots(files)
+    candidates = [path for path in files if path.suffix in CANDIDATE_SUFFIXES]
+    logging.info(f"detect({root}) {len(candidates)}/{len(files)} tracked file(s) to test")
+
+    projects: Dict[PurePosixPath, List[Detection]] = defaultdict(list)
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        for detections in executor.map(lambda path: detect_file(root, path), candidates):
+            for detection in detections:
+                projects[project_root(detection.path, roots)].append(detection)
+    return dict(projects)
+
+
+def build_release_config(project: PurePosixPath, detections: List[Detection]) -> configparser.ConfigParser:
+    """
+    Builds the release.ini file of a project
+
+    For each section, the shallowest file is kept.
+
+    :param project: Project root, relative to the repository root
+    :param detections: Detections of the project
+    :return: Release config
+    """
+    by_section: Dict[str, Detection] = {}
+    for detection in sorted(detections, key=lambda _detection: (len(_detection.path.parts), _detection.path)):
+        if detection.section in by_section:
+            logging.info(f"build_release_config({project}) `{detection.section}`: {detection.path} skipped")
+            continue
+        by_section[detection.section] = detection
+
+    sections = [section for section in SECTIONS_ORDER if section in by_section]
+    # sonar only carries <major>.<minor>
+    versions = [by_section[section].version for section in sections if section != "sonar"]
+    current_release = versions[0] if versions else None
+    if len(set(versions)) > 1:
+        logging.warning(f"build_release_config({project}) Several versions found: {sorted(set(versions))}")
+    elif current_release is None:
+        logging.warning(f"build_release_config({project}) No current release found")
+
+    config = configparser.ConfigParser()
+    if current_release is not None:
+        config["DEFAULT"]["current_release"] = current_release
+    for section in sections:
+        config[section] = {"path": by_section[section].path.relative_to(project).as_posix()}
+    return config
@@ -7,25 +7,64 @@ helpers for :mod:`bump_release` application
 
 """
 import configparser
+import hashlib
+import io
 import json
 import logging
 import os
 import re
-from copy import deepcopy
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from functools import wraps
 from pathlib import Path
-from typing import Optional, Tuple, Union
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Pattern,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
 from ruamel.yaml import YAML
 from ruamel.yaml.compat import StringIO
 
+from bump_release import json_scanner, locking, patterns, toml_scanner, xml_scanner
+
 __author__ = "fguerin"
 
 RELEASE_CONFIG = None
 BASE_DIR = os.getcwd()
+#: Files written since :func:`track_writes` has been entered, `None` if writes are not tracked
+WRITTEN_FILES: Optional[List[Path]] = None
+#: Buffer of the files updated since :func:`buffered_writes` has been entered, `None` if writes are not buffered
+FILE_BUFFER: Optional["FileBuffer"] = None
+#: Changes recorded since :func:`track_changes` has been entered, `None` if changes are not tracked
+CHANGES: Optional[List["Change"]] = None
+#: Slots of the updaters allowed to run at once, see :func:`limit_open_files`, `None` if not limited
+OPEN_FILES_SLOTS: Optional[Any] = None
+#: Waits for the open files slots since :func:`track_io` has been entered, `None` if not tracked
+IO_STATS: Optional[Dict[str, float]] = None
+#: Depth of the updaters calls of each thread, so a nested updater does not take a second slot
+_IO_DEPTH = threading.local()
 # region Constants
+#: Maximum number of file descriptors held by an updater: the file, its memory map, its temporary copy and its lock
+FILES_PER_UPDATE: int = 4
+
 # Node (JSON value update)
 NODE_KEY: str = "version"
 NODE_PACKAGE_FILE: str = "package.json"
+NODE_LOCK_FILES: Tuple[str, ...] = ("package-lock.json", "npm-shrinkwrap.json")
 
 # main (re search and replace)
 MAIN_PROJECT_PATTERN: str = r"^__version__\s*=\s*VERSION\s*=\s*['\"][.\d\w]+['\"]$"
@@ -47,6 +86,14 @@ SETUP_CFG_PATTERN: str = r"^version = ([.\d\w]+)"
 SETUP_CFG_TEMPLATE: str = "version = {major}.{minor}.{release}"
 
 
+# pyproject.toml file, tables searched in this order
+PYPROJECT_TABLES: Tuple[str, ...] = ("project", "tool.poetry")
+PYPROJECT_KEY: str = "version"
+
+# XML file (pom.xml, .csproj...), element path from the root element
+XML_ELEMENT: str = "project/version"
+XML_TEMPLATE: str = "{major}.{minor}.{release}"
+
 # Sphinx (re search and replace)
 DOCS_VERSION_PATTERN: str = r"^version\s*=\s*[\"']([.\d\w]+)[\"']$"
 DOCS_RELEASE_PATTERN: str = r"^release\s*=\s*[\"']([.\d\w]+)[\"']$"
@@ -55,6 +102,25 @@ DOCS_RELEASE_FORMAT: str = 'release = "{major}.{minor}.{release}"'
 
 RELEASE_INI_PATTERN: str = r"^current_release\s*=\s*['\"]?([.\d\w]+)['\"]?$"
 RELEASE_INI_TEMPLATE: str = "current_release = {major}.{minor}.{release}"
+INI_SECTION_RE = re.compile(r"^\s*\[([^\]]+)\]")
+
+# Protection against the slow user patterns
+#: Time budget of a pattern on a file, in seconds
+PATTERN_TIME_BUDGET: float = 5.0
+#: Longer lines (*eg.* minified files) are not evaluated against the patterns
+PATTERN_MAX_LINE_LENGTH: int = 4096
+
+# Compare-and-swap writes
+#: Number of retries when a file has been modified by another process between its reading and its writing
+WRITE_RETRIES: int = 5
+#: First wait before a retry, in seconds, doubled after each retry
+WRITE_BACKOFF: float = 0.05
+
+# Change statuses
+STATUS_UPDATED: str = "updated"
+STATUS_UNCHANGED: str = "unchanged"
+STATUS_DRY_RUN: str = "dry-run"
+STATUS_NOT_FOUND: str = "not-found"
 
 
 # endregion Constants
@@ -69,9 +135,221 @@ def load_release_file(release_file: Union[Path, str]) -> configparser.ConfigPars
     """
     release_config = configparser.ConfigParser()
     release_config.read(release_file)
+    check_patterns(release_config)
     return release_config
 
 
+def check_patterns(release_config: configparser.ConfigParser) -> None:
+    """
+    Checks the `pattern*` options of a release config for catastrophic backtracking hazards
+
+    :param release_config: Release config
+    :raises UnsafePatternException: If a pattern is invalid or unsafe
+    """
+    for section in release_config.sections():
+        for option, value in release_config.items(section, raw=True):
+            if not option.startswith("pattern") or not value.strip('"'):
+                continue
+            pattern = value.strip('"')
+            try:
+                hazards = patterns.find_hazards(pattern)
+            except re.error as e:
+                raise UnsafePatternException(f"Section `{section}`: invalid {option} {pattern!r}: {e}")
+            if hazards:
+                raise UnsafePatternException(
+                    f"Section `{section}`: {option} {pattern!r} may backtrack catastrophically ({', '.join(hazards)})"
+                )
+
+
+@contextmanager
+def track_writes() -> Iterator[List[Path]]:
+    """
+    Tracks the files written by the updaters
+
+    :return: Written files, filled during the context
+    """
+    global WRITTEN_FILES
+    previous, WRITTEN_FILES = WRITTEN_FILES, []
+    try:
+        yield WRITTEN_FILES
+    finally:
+        WRITTEN_FILES = previous
+
+
+def _written(path: Path) -> None:
+    if WRITTEN_FILES is not None and path not in WRITTEN_FILES:
+        WRITTEN_FILES.append(path)
+
+
+class Change:
+    """
+    Change of a version value in a file, returned by the updaters
+    """
+
+    __slots__ = ("section", "path", "line", "offset", "key", "old", "new", "status")
+
+    def __init__(
+        self,
+        path: Path,
+        line: Optional[int],
+        key: Optional[str],
+        old: Optional[str],
+        new: Optional[str],
+        status: str = STATUS_UPDATED,
+        offset: Optional[int] = None,
+        section: Optional[str] = None,
+    ):
+        #: Section of the release.ini file, set by the caller of the updater
+        self.section = section
+        self.path = path
+        #: Line number of the changed value (1-based), `None` if the value does not exist yet
+        self.line = line
+        #: Byte offset of the changed value, if known
+        self.offset = offset
+        #: Changed key, `None` for the rows replaced with a pattern
+        self.key = key
+        self.old = old
+        self.new = new
+        #: One of the `STATUS_*` constants
+        self.status = status
+
+    def __str__(self) -> str:
+        location = f"{self.path}:{self.line}" if self.line is not None else f"{self.path}"
+        key = f" {self.key}" if self.key is not None else ""
+        return f"{location}{key}: {self.old!r} -> {self.new!r}"
+
+    def __repr__(self) -> str:
+        return f"<Change [{self.section}] {self} ({self.status})>"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Change):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        JSON-serializable form of the change
+
+        :return: Change fields
+        """
+        values = {slot: getattr(self, slot) for slot in self.__slots__}
+        values["path"] = str(self.path)
+        return values
+
+
+def _status(dry_run: bool, old, new) -> str:
+    if dry_run:
+        return STATUS_DRY_RUN
+    return STATUS_UNCHANGED if old == new else STATUS_UPDATED
+
+
+@contextmanager
+def track_changes() -> Iterator[List[Change]]:
+    """
+    Tracks the changes recorded by :func:`record_changes`
+
+    :return: Changes, filled during the context
+    """
+    global CHANGES
+    previous, CHANGES = CHANGES, []
+    try:
+        yield CHANGES
+    finally:
+        CHANGES = previous
+
+
+def record_changes(changes: Iterable[Change]) -> None:
+    """
+    Records some changes, if the changes are tracked
+
+    :param changes: Changes of an update
+    """
+    if CHANGES is not None:
+        CHANGES.extend(changes)
+
+
+@contextmanager
+def limit_open_files(max_open_files: Optional[int] = None, slots: Optional[Any] = None) -> Iterator[Any]:
+    """
+    Limits the number of files opened at once by the updaters, each one holding up to :data:`FILES_PER_UPDATE` files
+
+    :param max_open_files: Maximum number of open files
+    :param slots: Semaphore shared with other processes, created from `max_open_files` if not set
+    :return: Semaphore of the slots
+    """
+    global OPEN_FILES_SLOTS
+    if slots is None:
+        slots = threading.BoundedSemaphore(open_files_slots(max_open_files or FILES_PER_UPDATE))
+    previous, OPEN_FILES_SLOTS = OPEN_FILES_SLOTS, slots
+    try:
+        yield slots
+    finally:
+        OPEN_FILES_SLOTS = previous
+
+
+def open_files_slots(max_open_files: int) -> int:
+    """
+    Number of updaters which can run at once without exceeding `max_open_files` open files
+
+    :param max_open_files: Maximum number of open files
+    :return: Number of slots, at least 1
+    """
+    return max(max_open_files // FILES_PER_UPDATE, 1)
+
+
+@contextmanager
+def track_io() -> Iterator[Dict[str, float]]:
+    """
+    Tracks the waits of the updaters for an open files slot
+
+    :return: Statistics, as `{"open_files_wait": <seconds>, "updates": <count>}`, filled during the context
+    """
+    global IO_STATS
+    previous, IO_STATS = IO_STATS, {"open_files_wait": 0.0, "updates": 0}
+    try:
+        yield IO_STATS
+    finally:
+        IO_STATS = previous
+
+
+@contextmanager
+def io_slot() -> Iterator[None]:
+    """
+    Holds an open files slot, if the open files are limited
+    """
+    depth = getattr(_IO_DEPTH, "value", 0)
+    slots = OPEN_FILES_SLOTS if depth == 0 else None
+    if slots is not None:
+        started = time.perf_counter()
+        slots.acquire()
+        if IO_STATS is not None:
+            IO_STATS["open_files_wait"] += time.perf_counter() - started
+            IO_STATS["updates"] += 1
+    _IO_DEPTH.value = depth + 1
+    try:
+        yield
+    finally:
+        _IO_DEPTH.value = depth
+        if slots is not None:
+            slots.release()
+
+
+def io_bound(function: Callable) -> Callable:
+    """
+    Decorates an updater, so it runs in an open files slot
+
+    :param function: Updater
+    :return: Decorated updater
+    """
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        with io_slot():
+            return function(*args, **kwargs)
+
+    return wrapper
+
+
 def split_version(version: str) -> Tuple[str, str, str]:
     """
     Splits the release number into a 3-uple
@@ -88,93 +366,541 @@ def split_version(version: str) -> Tuple[str, str, str]:
         return major, minor, release
 
 
+class FileBuffer:
+    """
+    Keeps the contents of the files updated by :func:`update_file`, so a file updated several times during a run
+    is read and written only once
+    """
+
+    def __init__(self):
+        self.contents: Dict[Path, List[str]] = {}
+        #: Digests of the files when they have been read
+        self.digests: Dict[Path, str] = {}
+        #: Edits of the updated files, replayed if a file has been modified by another process
+        self.edits: Dict[Path, List[Callable[[List[str]], List[str]]]] = {}
+        self.dirty: Set[Path] = set()
+
+    def read_lines(self, path: Path) -> List[str]:
+        """
+        Reads the lines of a file, from the buffer if the file has already been read
+
+        :param path: Path of the file
+        :return: Lines of the file
+        """
+        key = path.resolve()
+        if key not in self.contents:
+            self.contents[key], self.digests[key] = read_checked(path)
+        return self.contents[key]
+
+    def update_lines(self, path: Path, edit: Callable[[List[str]], List[str]]) -> None:
+        """
+        Applies an edit to the buffered lines of a file
+
+        :param path: Path of the file
+        :param edit: Function which returns the new lines of the file from its current lines
+        """
+        key = path.resolve()
+        self.contents[key] = edit(self.read_lines(path))
+        self.edits.setdefault(key, []).append(edit)
+        self.dirty.add(key)
+
+    def flush(self, path: Optional[Path] = None) -> None:
+        """
+        Writes the updated files, and forgets them
+
+        :param path: Path of the file to write, all the files if `None`
+        """
+        keys = sorted(self.dirty) if path is None else [key for key in [path.resolve()] if key in self.dirty]
+        for key in keys:
+            edits = self.edits.get(key, [])
+
+            def replay(lines: List[str]) -> List[str]:
+                for edit in edits:
+                    lines = edit(lines)
+                return lines
+
+            with io_slot():
+                update_checked(key, replay, lines=self.contents[key], digest=self.digests[key])
+            self.dirty.discard(key)
+            logging.info(f"FileBuffer.flush({key}) File updated.")
+        for key in list(self.contents) if path is None else [path.resolve()]:
+            self.contents.pop(key, None)
+            self.digests.pop(key, None)
+            self.edits.pop(key, None)
+
+
+@contextmanager
+def buffered_writes() -> Iterator[FileBuffer]:
+    """
+    Buffers the updates of :func:`update_file` until the end of the context
+
+    :return: File buffer
+    """
+    global FILE_BUFFER
+    previous, FILE_BUFFER = FILE_BUFFER, FileBuffer()
+    try:
+        yield FILE_BUFFER
+    finally:
+        buffer, FILE_BUFFER = FILE_BUFFER, previous
+        buffer.flush()
+
+
+def flush_buffered(path: Path) -> None:
+    """
+    Writes the buffered updates of a file, if any, so an updater which reads the file by itself sees them
+
+    :param path: Path of the file
+    """
+    if FILE_BUFFER is not None:
+        FILE_BUFFER.flush(path)
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+def locked(path: Path, dry_run: bool = False) -> ContextManager:
+    """
+    Lock of a file during its update
+
+    :param path: Path of the file
+    :param dry_run: If `True`, the file is not locked
+    :return: Context manager of the lock
+    """
+    return nullcontext() if dry_run else locking.file_lock(path)
+
+
+def read_checked(path: Path) -> Tuple[List[str], str]:
+    """
+    Reads the lines of a file, with the digest of its content
+
+    :param path: Path of the file
+    :return: Lines of the file, as read in text mode, and digest
+    """
+    data = path.read_bytes()
+    with io.TextIOWrapper(io.BytesIO(data)) as ifile:
+        return ifile.readlines(), _digest(data)
+
+
+def write_if_unchanged(path: Path, lines: Iterable[str], digest: Optional[str]) -> None:
+    """
+    Writes a file if its content has not been modified since it has been read (compare-and-swap)
+
+    The file is locked during the check and the write, and is replaced atomically by a temporary copy.
+
+    :param path: Path of the file
+    :param lines: New lines of the file
+    :param digest: Digest of the file when it has been read, `None` to skip the check
+    :raises StaleFileException: If the file has been modified
+    """
+    target = path.resolve()
+    with locking.file_lock(target):
+        if digest is not None and _digest(target.read_bytes()) != digest:
+            raise StaleFileException(f"{path} has been modified since it has been read")
+        with tempfile.NamedTemporaryFile(
+            mode="w", dir=target.parent, prefix=f".{target.name}.", delete=False
+        ) as output_file:
+            output_file.writelines(lines)
+        shutil.copymode(target, output_file.name)
+        os.replace(output_file.name, target)
+    _written(path)
+
+
+def update_checked(
+    path: Path,
+    transform: Callable[[List[str]], List[str]],
+    lines: Optional[List[str]] = None,
+    digest: Optional[str] = None,
+) -> List[str]:
+    """
+    Read-modify-write of a file, retried with a backoff if the file is modified by another process meanwhile
+
+    :param path: Path of the file
+    :param transform: Function which returns the new lines of the file from its current lines
+    :param lines: New lines of the file, if already computed from the `digest` content
+    :param digest: Digest of the content which `lines` has been computed from
+    :return: Written lines
+    :raises ConcurrentUpdateException: If the file is still modified after :data:`WRITE_RETRIES` retries
+    """
+    for attempt in range(WRITE_RETRIES + 1):
+        if attempt:
+            time.sleep(WRITE_BACKOFF * 2 ** (attempt - 1))
+        if lines is None or attempt:
+            current, digest = read_checked(path)
+            lines = transform(current)
+        try:
+            write_if_unchanged(path, lines, digest)
+            return lines
+        except StaleFileException as e:
+            logging.warning(f"update_checked({path}) {e}, retry {attempt + 1}/{WRITE_RETRIES}")
+    raise ConcurrentUpdateException(f"{path} is modified by another process, update abandoned")
+
+
+def _search_row(
+    rows: Iterable[str],
+    version_re: Pattern,
+    ini_section: Optional[str] = None,
+    deadline: Optional[float] = None,
+    max_line_length: Optional[int] = None,
+) -> Tuple[Optional[int], Optional[str]]:
+    current_section = None
+    for counter, row in enumerate(rows):
+        if deadline is not None and time.monotonic() > deadline:
+            raise PatternTimeoutException(counter + 1)
+        if max_line_length is not None and len(row) > max_line_length:
+            logging.debug(f"_search_row() line {counter + 1} skipped: {len(row)} characters")
+            continue
+        if ini_section is not None:
+            header = INI_SECTION_RE.match(row)
+            if header is not None:
+                current_section = header.group(1).strip()
+                continue
+            if current_section != ini_section:
+                continue
+        if version_re.search(row):
+            return counter, row
+    return None, None
+
+
+@io_bound
 def update_file(
     path: Path,
     pattern: str,
     template: str,
     version: Tuple[str, str, str],
     dry_run: Optional[bool] = False,
-) -> Optional[str]:
+    ini_section: Optional[str] = None,
+    config_section: Optional[str] = None,
+    time_budget: Optional[float] = PATTERN_TIME_BUDGET,
+    max_line_length: Optional[int] = PATTERN_MAX_LINE_LENGTH,
+) -> Change:
     """
     Performs the **real** update of the `path` files, aka. replaces the row matched
     with `pattern` with `version_format` formatted according to `release`.
 
+    The pattern is not evaluated on the rows longer than `max_line_length`, and the search is stopped
+    if it lasts more than `time_budget` seconds.
+
     :param path: path of the file to update
     :param pattern: regexp to replace
     :param template: release format
     :param version: Release number tuple (major, minor, release)
     :param dry_run: If `True`, no operation performed
-    :return: New row
+    :param ini_section: If set, only the rows of this section of an ini file are searched
+    :param config_section: Section of the release.ini file, for the error messages
+    :param time_budget: Time budget of the search, in seconds, `None` for no limit
+    :param max_line_length: Maximum length of the searched rows, `None` for no limit
+    :return: Change of the row, with a `not-found` status in dry-run mode if no row matches
+    :raises PatternTimeoutException: If the search exceeds its time budget
     """
     version_re = re.compile(pattern)
     major, minor, release = version
 
-    old_row, new_row = None, None
-    counter = None
-    with path.open(mode="r") as ifile:
-        content_lines = ifile.readlines()
-    new_content = deepcopy(content_lines)
-
-    for counter, row in enumerate(content_lines):
-        searched = version_re.search(row)
-        if searched:
-            logging.debug(f"update_file({path}) a *MATCHING* row has been found:\n{counter} {row.strip()}")
-            old_row = deepcopy(row)
-            new_row = template.format(major=major, minor=minor, release=release)
-            if old_row.endswith("\r\n"):
-                new_row += "\r\n"
-            elif old_row.endswith("\r"):
-                new_row += "\r"
-            elif old_row.endswith("\n"):
-                new_row += "\n"
-            break
-
-    if old_row and new_row:
+    def search(rows: Iterable[str]) -> Tuple[Optional[int], Optional[str], Optional[str]]:
+        # The budget is per scan: the scan MAY be replayed later, on a buffer flush or after a concurrent edit
+        deadline = time.monotonic() + time_budget if time_budget is not None else None
+        try:
+            counter, old_row = _search_row(rows, version_re, ini_section, deadline, max_line_length)
+        except PatternTimeoutException as e:
+            raise PatternTimeoutException(
+                f"Section `{config_section or '?'}`: pattern {pattern!r} exceeded its {time_budget} s budget "
+                f"on {path}, line {e.args[0]}"
+            ) from None
+        if old_row is None:
+            return counter, old_row, None
+        logging.debug(f"update_file({path}) a *MATCHING* row has been found:\n{counter} {old_row.strip()}")
+        new_row = template.format(major=major, minor=minor, release=release)
+        if old_row.endswith("\r\n"):
+            new_row += "\r\n"
+        elif old_row.endswith("\r"):
+            new_row += "\r"
+        elif old_row.endswith("\n"):
+            new_row += "\n"
         logging.info(f"update_file({path}) old_row:\n{old_row.strip()}\nnew_row:\n{new_row.strip()}")
+        return counter, old_row, new_row
 
     if dry_run:
+        # In dry-run mode, the file is only read until the matching row
+        with path.open(mode="r") as ifile:
+            counter, old_row, new_row = search(ifile)
         logging.info(
             f"update_file({path}) No operation performed, dry_run = {dry_run}",
         )
-        return new_row
-
-    if new_row and counter is not None:
-        new_content[counter] = new_row
-        with path.open(mode="w") as output_file:
-            output_file.writelines(new_content)
+        if old_row is None or counter is None:
+            new_value = template.format(major=major, minor=minor, release=release)
+            return Change(path, None, None, None, new_value, status=STATUS_NOT_FOUND, section=config_section)
+        return _row_change(path, counter, old_row, new_row, dry_run, config_section)
+
+    changes: List[Change] = []
+
+    def replace_row(lines: List[str]) -> List[str]:
+        # Also replayed on the new content of a file modified by another process
+        counter, old_row, new_row = search(lines)
+        if new_row is None or counter is None:
+            raise UpdateException(f"An error has append on updating release for file {path}")
+        lines = list(lines)
+        lines[counter] = new_row
+        changes.append(_row_change(path, counter, old_row, new_row, dry_run, config_section))
+        return lines
+
+    if FILE_BUFFER is not None:
+        FILE_BUFFER.update_lines(path, replace_row)
+    else:
+        update_checked(path, replace_row)
         logging.info(f"update_file({path}) File updated.")
-        return new_row
+    return changes[-1]
+
 
-    raise UpdateException(f"An error has append on updating release for file {path}")
+def _row_change(path: Path, counter: int, old_row: str, new_row: str, dry_run: bool, section: Optional[str]) -> Change:
+    old, new = old_row.rstrip("\r\n"), new_row.rstrip("\r\n")
+    return Change(path, counter + 1, None, old, new, status=_status(dry_run, old, new), section=section)
 
 
+@io_bound
 def update_node_packages(
     path: Path,
     version: Tuple[str, str, str],
     key: str = NODE_KEY,
     dry_run: bool = False,
-) -> str:
+) -> Change:
     """
     Updates the package.json file
 
+    In dry-run mode, the package is only scanned for the `key` value. The line and offset of the change are the ones
+    of the value in the scanned file, or in the written file.
+
     :param path: Node root directory
     :param version: Release number
     :param dry_run: If `True`, no operation performed
     :param key: json dict key (default: "release")
-    :return: Nothing
+    :return: Change of the version
     """
+    full_version = ".".join(version)
+    flush_buffered(path)
     try:
-        with path.open(mode="r") as package_file:
-            package = json.loads(package_file.read())
-        new_package = deepcopy(package)
-        new_package[key] = ".".join(version)
-        updated = json.dumps(new_package, indent=4)
-        if not dry_run:
-            with path.open(mode="w") as package_file:
-                package_file.write(updated)
-        return updated
-    except IOError as ioe:
-        raise UpdateException(f"update_node_packages() Unable to perform {package_file} update: {ioe}")
+        if dry_run:
+            span = json_scanner.find_span(path, (key,))
+            if span is None:
+                return Change(path, None, key, None, full_version, status=STATUS_DRY_RUN)
+            return Change(path, span.line, key, span.value, full_version, status=STATUS_DRY_RUN, offset=span.start)
+        changes: List[Change] = []
+
+        def update_package(lines: List[str]) -> List[str]:
+            package = json.loads("".join(lines))
+            old_value = package.get(key)
+            status = _status(False, old_value, full_version)
+            package[key] = full_version
+            content = json.dumps(package, indent=4)
+            # Position of the new value in the written file
+            span = json_scanner.JsonScanner(content.encode("utf-8")).find([(key,)]).get((key,))
+            line, offset = (span.line, span.start) if span is not None else (None, None)
+            changes[:] = [Change(path, line, key, old_value, full_version, status=status, offset=offset)]
+            return [content]
+
+        update_checked(path, update_package)
+        return changes[0]
+    except (IOError, json_scanner.JsonScanError) as ioe:
+        raise UpdateException(f"update_node_packages() Unable to perform {path} update: {ioe}")
+
+
+def splice_file(path: Path, replacements: Sequence[Tuple[int, int, bytes]]) -> None:
+    """
+    Replaces some byte ranges of the `path` file, leaving all other bytes untouched.
+
+    If every replacement keeps the length of the replaced range, the file is patched in place,
+    else it is copied chunk by chunk to a temporary file which replaces the original one.
+    The file is locked during the update: the caller SHOULD also hold the lock while it locates the ranges.
+
+    :param path: Path of the file to patch
+    :param replacements: (start, end, new bytes) tuples, `end` being excluded
+    """
+    replacements = sorted(replacements)
+    flush_buffered(path)
+    with locking.file_lock(path):
+        if all(end - start == len(data) for start, end, data in replacements):
+            with path.open(mode="r+b") as output_file:
+                for start, _end, data in replacements:
+                    output_file.seek(start)
+                    output_file.write(data)
+            _written(path)
+            return
+
+        with path.open(mode="rb") as input_file, tempfile.NamedTemporaryFile(
+            mode="wb", dir=path.parent, prefix=f".{path.name}.", delete=False
+        ) as output_file:
+            position = 0
+            for start, end, data in replacements:
+                _copy_range(input_file, output_file, start - position)
+                output_file.write(data)
+                input_file.seek(end)
+                position = end
+            shutil.copyfileobj(input_file, output_file)
+        shutil.copymode(path, output_file.name)
+        os.replace(output_file.name, path)
+    _written(path)
+
+
+def _copy_range(input_file, output_file, length: int, chunk_size: int = 1024 * 1024) -> None:
+    while length > 0:
+        chunk = input_file.read(min(chunk_size, length))
+        if not chunk:
+            break
+        output_file.write(chunk)
+        length -= len(chunk)
+
+
+@io_bound
+def update_node_lockfile(
+    path: Path,
+    version: Tuple[str, str, str],
+    key: str = NODE_KEY,
+    dry_run: bool = False,
+) -> List[Change]:
+    """
+    Updates a package-lock.json or npm-shrinkwrap.json file
+
+    Only the root version, at the top level and under `packages[""]`, is updated. The lockfile is scanned
+    without being loaded, and only the version values are patched: all other bytes are kept as is.
+
+    :param path: Path of the lockfile
+    :param version: Release number
+    :param key: json dict key (default: "version")
+    :param dry_run: If `True`, no operation performed
+    :return: Changes of the root versions
+    """
+    full_version = ".".join(version)
+    key_paths: List[json_scanner.JsonPath] = [(key,), ("packages", "", key)]
+    flush_buffered(path)
+    try:
+        with locked(path, dry_run):
+            spans = json_scanner.find_spans(path, key_paths)
+            if not spans:
+                raise UpdateException(f"update_node_lockfile() No `{key}` found in {path}")
+            changes = [
+                Change(
+                    path,
+                    spans[key_path].line,
+                    ".".join(_key or '""' for _key in key_path),
+                    spans[key_path].value,
+                    full_version,
+                    status=_status(dry_run, spans[key_path].value, full_version),
+                    offset=spans[key_path].start,
+                )
+                for key_path in key_paths
+                if key_path in spans
+            ]
+            if not dry_run:
+                new_value = json.dumps(full_version).encode("utf-8")
+                splice_file(path, [(span.start, span.end, new_value) for span in spans.values()])
+                logging.info(f"update_node_lockfile({path}) File updated.")
+        return changes
+    except (IOError, json_scanner.JsonScanError) as ioe:
+        raise UpdateException(f"update_node_lockfile() Unable to perform {path} update: {ioe}")
+
+
+@io_bound
+def update_pyproject_file(
+    path: Path,
+    version: Tuple[str, str, str],
+    table: Optional[str] = None,
+    key: str = PYPROJECT_KEY,
+    dry_run: bool = False,
+) -> Change:
+    """
+    Updates the version of a pyproject.toml file, aka. `[project].version` or `[tool.poetry].version`
+
+    Only the `key` of the `table` table is located, without a full parsing of the file, and its value is replaced:
+    all other bytes are kept as is.
+
+    :param path: Path of the pyproject.toml file
+    :param version: Release number tuple (major, minor, release)
+    :param table: TOML table, as `xxx.yyy`. If not set, the :data:`PYPROJECT_TABLES` are searched in order
+    :param key: key of the version in the table
+    :param dry_run: If `True`, no operation performed
+    :return: Change of the version
+    """
+    full_version = ".".join(version)
+    tables = [table] if table else list(PYPROJECT_TABLES)
+    key_paths = [toml_scanner.split_key(_table) + toml_scanner.split_key(key) for _table in tables]
+    flush_buffered(path)
+    with locked(path, dry_run):
+        try:
+            spans = toml_scanner.find_spans(path, key_paths)
+        except IOError as ioe:
+            raise UpdateException(f"update_pyproject_file() Unable to perform {path} update: {ioe}")
+        key_path = next((_key_path for _key_path in key_paths if _key_path in spans), None)
+        if key_path is None:
+            raise UpdateException(f"update_pyproject_file() No `{key}` key found in {path} for tables {tables}")
+
+        span = spans[key_path]
+        old_value = toml_scanner.string_value(span)
+        change = Change(
+            path,
+            span.line,
+            ".".join(key_path),
+            old_value,
+            full_version,
+            status=_status(dry_run, old_value, full_version),
+            offset=span.start,
+        )
+        logging.info(f"update_pyproject_file({path}) {change}")
+        if dry_run:
+            return change
+        new_value = toml_scanner.encode_string(full_version, quote=span.raw[:1].decode("utf-8"))
+        splice_file(path, [(span.start, span.end, new_value)])
+    logging.info(f"update_pyproject_file({path}) File updated.")
+    return change
+
+
+@io_bound
+def update_xml_file(
+    path: Path,
+    version: Tuple[str, str, str],
+    element: str = XML_ELEMENT,
+    template: str = XML_TEMPLATE,
+    dry_run: bool = False,
+) -> Change:
+    """
+    Updates the text of an element, or the value of an attribute, of an XML file (pom.xml, .csproj...)
+
+    The file is parsed as a stream, only until the element is found, and the old value is replaced: all other bytes
+    are kept as is.
+
+    :param path: Path of the XML file
+    :param version: Release number tuple (major, minor, release)
+    :param element: Element path from the root element, *eg.* `project/version` or `manifest/@android:versionName`
+    :param template: Template of the new value
+    :param dry_run: If `True`, no operation performed
+    :return: Change of the version
+    """
+    major, minor, release = version
+    new_value = template.format(major=major, minor=minor, release=release)
+    flush_buffered(path)
+    with locked(path, dry_run):
+        scanner = xml_scanner.XmlScanner(path)
+        try:
+            span = scanner.find(xml_scanner.split_path(element))
+        except (IOError, ValueError) as e:
+            raise UpdateException(f"update_xml_file() Unable to perform {path} update: {e}")
+        if span is None:
+            raise UpdateException(f"update_xml_file() No `{element}` element found in {path}")
+
+        old_value = xml_scanner.text_value(span, scanner.encoding)
+        change = Change(
+            path,
+            span.line,
+            element,
+            old_value,
+            new_value,
+            status=_status(dry_run, old_value, new_value),
+            offset=span.start,
+        )
+        logging.info(f"update_xml_file({path}) {change}")
+        if dry_run:
+            return change
+        splice_file(path, [(span.start, span.end, xml_scanner.encode_text(span, new_value, scanner.encoding))])
+    logging.info(f"update_xml_file({path}) File updated.")
+    return change
 
 
 class MyYAML(YAML):
@@ -192,37 +918,54 @@ class MyYAML(YAML):
             return stream.getvalue()
 
 
+@io_bound
 def updates_yaml_file(
     path: Path,
     version: Tuple[str, str, str],
     key: str = ANSIBLE_KEY,
     dry_run: bool = False,
-) -> str:
+) -> Change:
     """
     Replaces the version number in a YAML file, aka. ansible vars files
 
+    In dry-run mode, the document is not dumped.
+
     :param path: Path to the yaml file
     :param version: New version to apply, as a tuple (major, minor, release)
     :param key: key in the files, as xxx.yyy
     :param dry_run: If True, no action is performed
-    :returns: new file content
+    :returns: Change of the version
     """
     splited_key = key.split(".")
     full_version = ".".join(version)
     yaml = MyYAML()
-    with path.open(mode="r") as vars_file:
-        document = yaml.load(vars_file)
-    node = document
-    for _key in splited_key:
-        if _key == splited_key[-1] and not dry_run:
-            node.update({_key: full_version})
-        node = node.get(_key)
-    logging.debug(f"updates_yml_file({vars_file}) node value = {node}")
-    new_content = yaml.dump(document)
-    if not dry_run:
-        with path.open(mode="w") as vars_file:
-            vars_file.write(new_content)
-    return new_content
+    last_key = splited_key[-1]
+    flush_buffered(path)
+
+    def find_change(document) -> Tuple[Any, Change]:
+        node = document
+        for _key in splited_key[:-1]:
+            node = node.get(_key)
+        old_value = node.get(last_key)
+        logging.debug(f"updates_yml_file({path}) node value = {old_value}")
+        line = node.lc.value(last_key)[0] + 1 if last_key in node else None
+        return node, Change(path, line, key, old_value, full_version, status=_status(dry_run, old_value, full_version))
+
+    if dry_run:
+        with path.open(mode="r") as vars_file:
+            return find_change(yaml.load(vars_file))[1]
+
+    changes: List[Change] = []
+
+    def update_document(lines: List[str]) -> List[str]:
+        document = yaml.load("".join(lines))
+        node, change = find_change(document)
+        node.update({last_key: full_version})
+        changes[:] = [change]
+        return [yaml.dump(document)]
+
+    update_checked(path, update_document)
+    return changes[0]
 
 
 class UpdateException(Exception):
@@ -239,3 +982,35 @@ class NothingToDoException(UpdateException):
     """
 
     pass
+
+
+class StaleFileException(UpdateException):
+    """
+    A file has been modified by another process since it has been read
+    """
+
+    pass
+
+
+class ConcurrentUpdateException(UpdateException):
+    """
+    A file is modified by another process during its update, even after some retries
+    """
+
+    pass
+
+
+class UnsafePatternException(UpdateException):
+    """
+    A pattern of the release.ini file is invalid or may backtrack catastrophically
+    """
+
+    pass
+
+
+class PatternTimeoutException(UpdateException):
+    """
+    A pattern has exceeded its time budget on a file
+    """
+
+    pass
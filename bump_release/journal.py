@@ -0,0 +1,182 @@
+"""
+Completion journal of the batch runs for :mod:`bump_release` application
+
+Batch and recursive runs can append a JSONL entry to a journal each time a project is successfully bumped: the
+release file, the target version and the hashes of the files of the project, as written. When an interrupted run is
+restarted with `--resume`, the projects whose journal entry matches the target version and whose files still have the
+journaled hashes are skipped, without loading their release file nor scanning their files.
+
+The journal is append-only: a truncated last line, left by an interrupted run, is ignored, and the last entry of a
+project wins.
+
+:creationdate: 19/10/2026 07:19
+:moduleauthor: François GUÉRIN <fguerin@ville-tourcoing.fr>
+:modulename: bump_release.journal
+
+"""
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, TextIO
+
+__author__ = "fguerin"
+
+# region Constants
+JOURNAL_FILE_NAME: str = ".bump_release-journal.jsonl"
+HASH_CHUNK_SIZE: int = 1 << 16
+STATUS_SKIPPED: str = "skipped"
+# endregion Constants
+
+
+def hash_file(path: Path) -> Optional[str]:
+    """
+    Hashes the content of a file
+
+    :param path: File path
+    :return: SHA-256 hex digest, `None` if the file does not exist
+    """
+    digest = hashlib.sha256()
+    try:
+        with Path(path).open(mode="rb") as input_file:
+            for chunk in iter(lambda: input_file.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+def hash_files(paths: Iterable[Path]) -> Dict[str, str]:
+    """
+    Hashes the content of files
+
+    :param paths: Files paths, the missing files are ignored
+    :return: Hex digests, by resolved path
+    """
+    hashes = {}
+    for path in paths:
+        digest = hash_file(path)
+        if digest is not None:
+            hashes[str(Path(path).resolve())] = digest
+    return hashes
+
+
+class Journal:
+    """
+    Append-only journal of the bumped projects
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        #: Last entry of each project, by resolved release file path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._file: Optional[TextIO] = None
+        self._opened = False
+
+    def load(self) -> "Journal":
+        """
+        Loads the entries of the journal file, if any
+
+        :return: The journal
+        """
+        self.entries = {}
+        if not self.path.exists():
+            return self
+        with self.path.open(mode="r") as input_file:
+            for number, line in enumerate(input_file, start=1):
+                try:
+                    entry = json.loads(line)
+                    self.entries[entry["release_file"]] = entry
+                except (ValueError, TypeError, KeyError):
+                    logging.warning(f"Journal.load({self.path}) Invalid entry at line {number} ignored")
+        return self
+
+    def open(self) -> "Journal":
+        """
+        Loads the journal and opens it for appending, the journal file being created by the first entry
+
+        :return: The journal
+        """
+        self.load()
+        self._opened = True
+        return self
+
+    def _append_file(self) -> TextIO:
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open(mode="a")
+            if self._file.tell() and not self._ends_with_newline():
+                # Terminates the truncated last line of an interrupted run
+                self._file.write("\n")
+        return self._file
+
+    def _ends_with_newline(self) -> bool:
+        with self.path.open(mode="rb") as input_file:
+            input_file.seek(-1, os.SEEK_END)
+            return input_file.read(1) == b"\n"
+
+    def close(self) -> None:
+        """
+        Closes the journal file
+        """
+        self._opened = False
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "Journal":
+        return self.open()
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def record(self, result: Dict[str, Any], version: str) -> None:
+        """
+        Appends the entry of a bumped project, and syncs it to the disk
+
+        :param result: Result of the project update, with the `hashes` of its files
+        :param version: Target version
+        """
+        assert self._opened, "The journal MUST be opened"
+        entry = {
+            "release_file": str(Path(result["release_file"]).resolve()),
+            "version": version,
+            "hashes": result.get("hashes", {}),
+            "finished": time.time(),
+        }
+        output_file = self._append_file()
+        output_file.write(json.dumps(entry) + "\n")
+        output_file.flush()
+        os.fsync(output_file.fileno())
+        self.entries[entry["release_file"]] = entry
+
+    def is_done(self, release_file: Path, version: str) -> bool:
+        """
+        Checks if a project is already at the target state
+
+        :param release_file: Release file of the project
+        :param version: Target version
+        :return: `True` if the project has been bumped to `version` and its files have not changed since
+        """
+        entry = self.entries.get(str(Path(release_file).resolve()))
+        if entry is None or entry["version"] != version:
+            return False
+        return all(hash_file(Path(path)) == digest for path, digest in entry["hashes"].items())
+
+    def skipped_result(self, release_file: Path) -> Dict[str, Any]:
+        """
+        Result of a project skipped because it is already at the target state
+
+        :param release_file: Release file of the project
+        :return: Result of the project
+        """
+        return {
+            "release_file": str(Path(release_file).resolve()),
+            "status": STATUS_SKIPPED,
+            "error": None,
+            "changed_files": [],
+            "changes": [],
+            "duration": 0.0,
+        }
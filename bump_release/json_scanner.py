@@ -0,0 +1,210 @@
+"""
+Lightweight JSON scanner for :mod:`bump_release` application
+
+Locates the raw bytes of some values in a JSON document, without building the object tree.
+The scanner works on any bytes-like buffer (:class:`bytes`, :class:`mmap.mmap`...), skips
+the values that are not on a searched path and stops as soon as every searched value has been found.
+
+:creationdate: 19/10/2026 06:55
+:moduleauthor: François GUÉRIN <fguerin@ville-tourcoing.fr>
+:modulename: bump_release.json_scanner
+
+"""
+import json
+import mmap
+import re
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, NamedTuple, Optional, Tuple, Union
+
+__author__ = "fguerin"
+
+JsonPath = Tuple[str, ...]
+Buffer = Union[bytes, bytearray, mmap.mmap]
+
+WHITESPACES_RE = re.compile(rb"[ \t\r\n]*")
+STRING_RE = re.compile(rb'"(?:[^"\\]|\\.)*"', re.DOTALL)
+SCALAR_RE = re.compile(rb"[^,\]}\s]+")
+STRUCTURE_RE = re.compile(rb'[\[\]{}"]')
+
+
+class Span(NamedTuple):
+    """
+    Location of a JSON value in a document
+    """
+
+    #: Offset of the first byte of the value
+    start: int
+    #: Offset of the byte following the value
+    end: int
+    #: Line number of the value (1-based)
+    line: int
+    #: Raw bytes of the value
+    raw: bytes
+
+    @property
+    def value(self):
+        """
+        Decoded value
+        """
+        return json.loads(self.raw)
+
+
+class JsonScanError(ValueError):
+    """
+    The JSON document cannot be scanned
+    """
+
+    pass
+
+
+class _AllFound(Exception):
+    pass
+
+
+@contextmanager
+def open_buffer(path: Path) -> Iterator[Buffer]:
+    """
+    Maps the `path` file in memory, read-only
+
+    :param path: Path of the JSON file
+    :return: Bytes-like buffer
+    """
+    with path.open(mode="rb") as ifile:
+        if path.stat().st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(ifile.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield buffer
+
+
+class JsonScanner:
+    """
+    Finds the spans of some values, identified by their key path, in a JSON buffer
+    """
+
+    def __init__(self, buffer: Buffer):
+        self.buffer = buffer
+        self.size = len(buffer)
+
+    def find(self, paths: Iterable[JsonPath]) -> Dict[JsonPath, Span]:
+        """
+        Scans the buffer for the `paths` values
+
+        :param paths: Key paths, as tuples of keys, *eg.* `("packages", "", "version")`
+        :return: Found spans, by path
+        """
+        self._targets = {tuple(path) for path in paths}
+        self._prefixes = {path[:index] for path in self._targets for index in range(1, len(path))}
+        self._found: Dict[JsonPath, Span] = {}
+        if not self._targets:
+            return self._found
+        try:
+            pos = self._skip_whitespaces(0)
+            if pos < self.size and self._char(pos) == b"{":
+                self._walk_object(pos, ())
+        except _AllFound:
+            pass
+        return self._found
+
+    def line_of(self, offset: int) -> int:
+        """
+        Computes the line number of the `offset` byte
+
+        :param offset: Offset in the buffer
+        :return: Line number (1-based)
+        """
+        return bytes(self.buffer[:offset]).count(b"\n") + 1
+
+    # region Internals
+    def _char(self, pos: int) -> bytes:
+        if pos >= self.size:
+            raise JsonScanError(f"Unexpected end of JSON document at offset {pos}")
+        return self.buffer[pos : pos + 1]
+
+    def _skip_whitespaces(self, pos: int) -> int:
+        return WHITESPACES_RE.match(self.buffer, pos).end()
+
+    def _scan_string(self, pos: int) -> int:
+        matched = STRING_RE.match(self.buffer, pos)
+        if matched is None:
+            raise JsonScanError(f"Invalid JSON string at offset {pos}")
+        return matched.end()
+
+    def _skip_value(self, pos: int) -> int:
+        char = self._char(pos)
+        if char == b'"':
+            return self._scan_string(pos)
+        if char not in (b"{", b"["):
+            matched = SCALAR_RE.match(self.buffer, pos)
+            if matched is None:
+                raise JsonScanError(f"Invalid JSON value at offset {pos}")
+            return matched.end()
+        depth = 0
+        while True:
+            matched = STRUCTURE_RE.search(self.buffer, pos)
+            if matched is None:
+                raise JsonScanError("Unexpected end of JSON document")
+            pos = matched.start()
+            char = matched.group()
+            if char == b'"':
+                pos = self._scan_string(pos)
+                continue
+            pos += 1
+            depth += 1 if char in (b"{", b"[") else -1
+            if depth == 0:
+                return pos
+
+    def _walk_object(self, pos: int, prefix: JsonPath) -> int:
+        pos = self._skip_whitespaces(pos + 1)
+        if self._char(pos) == b"}":
+            return pos + 1
+        while True:
+            key_end = self._scan_string(pos)
+            key = json.loads(bytes(self.buffer[pos:key_end]))
+            pos = self._skip_whitespaces(key_end)
+            if self._char(pos) != b":":
+                raise JsonScanError(f"Expected `:` at offset {pos}")
+            pos = self._skip_whitespaces(pos + 1)
+            path = prefix + (key,)
+            if path in self._targets:
+                end = self._skip_value(pos)
+                self._found[path] = Span(pos, end, self.line_of(pos), bytes(self.buffer[pos:end]))
+                if len(self._found) == len(self._targets):
+                    raise _AllFound()
+            elif path in self._prefixes and self._char(pos) == b"{":
+                end = self._walk_object(pos, path)
+            else:
+                end = self._skip_value(pos)
+            pos = self._skip_whitespaces(end)
+            char = self._char(pos)
+            if char == b"}":
+                return pos + 1
+            if char != b",":
+                raise JsonScanError(f"Expected `,` or `}}` at offset {pos}")
+            pos = self._skip_whitespaces(pos + 1)
+
+    # endregion Internals
+
+
+def find_spans(path: Path, paths: Iterable[JsonPath]) -> Dict[JsonPath, Span]:
+    """
+    Finds the spans of the `paths` values in the `path` JSON file
+
+    :param path: Path of the JSON file
+    :param paths: Key paths, as tuples of keys
+    :return: Found spans, by key path
+    """
+    with open_buffer(path) as buffer:
+        return JsonScanner(buffer).find(paths)
+
+
+def find_span(path: Path, key_path: JsonPath) -> Optional[Span]:
+    """
+    Finds the span of a single value in the `path` JSON file
+
+    :param path: Path of the JSON file
+    :param key_path: Key path, as a tuple of keys
+    :return: Found span, or `None`
+    """
+    return find_spans(path, [key_path]).get(tuple(key_path))
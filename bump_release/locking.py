@@ -0,0 +1,152 @@
+"""
+Cross-process advisory file locking for :mod:`bump_release` application
+
+Concurrent bumps (*eg.* parallel CI jobs) may update the same file of a shared tree, such as a root
+sonar-project.properties file. Each updated file is locked with :func:`file_lock` while it is checked and written.
+
+The locks are taken on lock files of a temporary directory, named from the resolved path of the locked file, so the
+tree is left untouched and the lock survives the replacement of the file by a temporary copy. A lock is re-entrant in
+a process. On platforms without :mod:`fcntl`, only the threads of a process are synchronized.
+
+The lock directory is in the local temporary directory: the locks only synchronize the processes of the same host,
+NOT the hosts which share a tree over NFS. A lock file is removed when its lock is released; a process which was
+waiting on the removed file checks that it locks the current lock file, and else tries again.
+
+:creationdate: 19/10/2026 07:11
+:moduleauthor: François GUÉRIN <fguerin@ville-tourcoing.fr>
+:modulename: bump_release.locking
+
+"""
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore
+
+__author__ = "fguerin"
+
+# region Constants
+#: Lock files directory, local to the host
+LOCK_DIRECTORY: Path = Path(tempfile.gettempdir()) / "bump_release-locks"
+#: Maximum wait for a lock, in seconds
+LOCK_TIMEOUT: float = 30.0
+#: First wait between two attempts to take a lock, doubled after each attempt
+LOCK_BACKOFF: float = 0.01
+LOCK_MAX_BACKOFF: float = 0.5
+# endregion Constants
+
+#: Depth of the locks held by the process, by lock file path
+_HELD: Dict[Path, int] = {}
+#: Threads locks, by lock file path
+_THREAD_LOCKS: Dict[Path, threading.RLock] = {}
+_THREAD_LOCKS_LOCK = threading.Lock()
+
+
+class LockTimeoutError(TimeoutError):
+    """
+    A file lock has not been acquired in time
+    """
+
+    pass
+
+
+def lock_path(path: Path) -> Path:
+    """
+    Path of the lock file of a file
+
+    :param path: Locked file
+    :return: Lock file path
+    """
+    digest = hashlib.sha1(str(Path(path).resolve()).encode("utf-8")).hexdigest()
+    return LOCK_DIRECTORY / f"{digest}.lock"
+
+
+def _thread_lock(key: Path) -> threading.RLock:
+    with _THREAD_LOCKS_LOCK:
+        return _THREAD_LOCKS.setdefault(key, threading.RLock())
+
+
+def _try_lock(fd: int) -> bool:
+    if fcntl is None:
+        return True
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return False
+    return True
+
+
+def _is_current(fd: int, key: Path) -> bool:
+    # The locked file is still the lock file of `key`, *ie.* it has not been removed by a release meanwhile
+    try:
+        return os.path.samestat(os.fstat(fd), os.stat(key))
+    except FileNotFoundError:
+        return False
+
+
+@contextmanager
+def file_lock(path: Path, timeout: float = LOCK_TIMEOUT) -> Iterator[None]:
+    """
+    Holds an exclusive advisory lock on a file
+
+    The lock is polled with an exponential backoff, so two processes locking the same files in a different order
+    never wait forever.
+
+    :param path: Locked file
+    :param timeout: Maximum wait, in seconds
+    :raises LockTimeoutError: If the lock has not been acquired in time
+    """
+    key = lock_path(path)
+    deadline = time.monotonic() + timeout
+    thread_lock = _thread_lock(key)
+    if not thread_lock.acquire(timeout=max(timeout, 0)):
+        raise LockTimeoutError(f"Unable to lock {path} in {timeout} s")
+    try:
+        if key in _HELD:
+            # Re-entrant acquisition by the thread which holds the lock
+            _HELD[key] += 1
+            try:
+                yield
+            finally:
+                _HELD[key] -= 1
+            return
+
+        key.parent.mkdir(parents=True, exist_ok=True)
+        backoff = LOCK_BACKOFF
+        while True:
+            fd = os.open(str(key), os.O_RDWR | os.O_CREAT, 0o666)
+            if _try_lock(fd) and _is_current(fd, key):
+                break
+            # Closing the descriptor releases the lock of a removed lock file
+            os.close(fd)
+            if time.monotonic() >= deadline:
+                raise LockTimeoutError(f"Unable to lock {path} in {timeout} s, lock file {key}")
+            logging.debug(f"file_lock({path}) Locked by another process, retry in {backoff} s")
+            time.sleep(backoff)
+            backoff = min(backoff * 2, LOCK_MAX_BACKOFF)
+        try:
+            _HELD[key] = 1
+            try:
+                yield
+            finally:
+                del _HELD[key]
+                # Removed while locked: the processes waiting on it try again with a new lock file
+                try:
+                    os.unlink(str(key))
+                except OSError:
+                    # *eg.* an open file cannot be removed on Windows: the lock file is kept
+                    pass
+        finally:
+            # Closing the descriptor releases the lock
+            os.close(fd)
+    finally:
+        thread_lock.release()
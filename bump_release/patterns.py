@@ -0,0 +1,120 @@
+"""
+Analysis of the user patterns for :mod:`bump_release` application
+
+The `pattern*` options of a release.ini file are run against every line of a file. A pattern with nested quantifiers,
+*eg.* `(\\d+)+` or `(\\w*\\.?)*`, backtracks exponentially on a line which almost matches. Such patterns are rejected
+when the release.ini file is loaded.
+
+Only the nested quantifiers are detected: the other slow patterns (*eg.* overlapping alternatives) are bounded by the
+time budget and the line length cap of :func:`bump_release.helpers.update_file`.
+
+:creationdate: 19/10/2026 07:08
+:moduleauthor: François GUÉRIN <fguerin@ville-tourcoing.fr>
+:modulename: bump_release.patterns
+
+"""
+import logging
+import sys
+from typing import Any, Iterable, Iterator, List, Tuple
+
+# The parser of the `re` module is private: it is only used on the python versions it is known for
+if sys.version_info < (3, 11):
+    import sre_constants
+    import sre_parse
+elif sys.version_info < (3, 15):
+    from re import _constants as sre_constants  # type: ignore
+    from re import _parser as sre_parse  # type: ignore
+else:  # pragma: no cover
+    sre_constants = sre_parse = None  # type: ignore
+
+__author__ = "fguerin"
+
+# region Constants
+#: `True` if the patterns can be analysed on this python version
+ANALYSIS_AVAILABLE: bool = sre_parse is not None
+if ANALYSIS_AVAILABLE:
+    REPEATS = (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT)
+    #: Items which consume at least one character
+    CONSUMERS = (
+        sre_constants.LITERAL,
+        sre_constants.NOT_LITERAL,
+        sre_constants.IN,
+        sre_constants.ANY,
+    )
+    #: Items whose content is never backtracked into
+    ATOMICS = tuple(
+        getattr(sre_constants, name) for name in ("ATOMIC_GROUP", "POSSESSIVE_REPEAT") if hasattr(sre_constants, name)
+    )
+# endregion Constants
+
+Item = Tuple[Any, Any]
+
+
+def _children(op, av) -> List[Iterable[Item]]:
+    # Sub-patterns of a parsed item
+    if op in REPEATS:
+        return [av[2]]
+    if op == sre_constants.SUBPATTERN:
+        return [av[-1]]
+    if op == sre_constants.BRANCH:
+        return list(av[1])
+    if op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+        return [av[1]]
+    if op == sre_constants.GROUPREF_EXISTS:
+        return [branch for branch in av[1:] if branch is not None]
+    return []
+
+
+def _is_variable_repeat(op, av) -> bool:
+    return op in REPEATS and av[1] > av[0]
+
+
+def _has_variable_repeat(items: Iterable[Item]) -> bool:
+    for op, av in items:
+        if op in ATOMICS:
+            continue
+        if _is_variable_repeat(op, av) or any(_has_variable_repeat(child) for child in _children(op, av)):
+            return True
+    return False
+
+
+def _has_fixed_part(items: Iterable[Item]) -> bool:
+    # At least one character is consumed outside of any repeat
+    for op, av in items:
+        if op in CONSUMERS or op in ATOMICS:
+            return True
+        if op == sre_constants.SUBPATTERN and _has_fixed_part(av[-1]):
+            return True
+        if op == sre_constants.BRANCH and all(_has_fixed_part(branch) for branch in av[1]):
+            return True
+    return False
+
+
+def _hazards(items: Iterable[Item]) -> Iterator[str]:
+    for op, av in items:
+        if op in ATOMICS:
+            continue
+        if _is_variable_repeat(op, av) and av[1] > 1:
+            body = av[2]
+            if _has_variable_repeat(body) and not _has_fixed_part(body):
+                yield "nested quantifiers in a repeated group"
+                continue
+        for child in _children(op, av):
+            yield from _hazards(child)
+
+
+def find_hazards(pattern: str) -> List[str]:
+    """
+    Analyses a pattern for catastrophic backtracking hazards
+
+    The analysis is skipped on the python versions whose `re` parser is unknown: the patterns are then only bounded
+    by the time budget and the line length cap.
+
+    :param pattern: Regular expression
+    :return: Found hazards, empty if the pattern is safe or cannot be analysed
+    :raises re.error: If the pattern is invalid
+    """
+    if not ANALYSIS_AVAILABLE:
+        logging.debug(f"find_hazards({pattern!r}) No analysis on python {sys.version_info[:2]}")
+        return []
+    return sorted(set(_hazards(sre_parse.parse(pattern))))
@@ -0,0 +1,198 @@
+"""
+Profiling of bump runs for :mod:`bump_release` application
+
+Runs the updates of a project under :mod:`cProfile` and :mod:`tracemalloc`, and writes for each project:
+
++ `<project>.pstats`: cProfile statistics, to be loaded with :mod:`pstats` or snakeviz
++ `<project>.allocations.txt`: top memory allocations
++ `<project>.summary.txt`: wall time, peak memory, time spent in the main helpers and top functions
+
+For batch runs, the statistics of all the projects are aggregated in `aggregate.pstats` and `aggregate.summary.txt`.
+
+:creationdate: 19/10/2026 06:59
+:moduleauthor: François GUÉRIN <fguerin@ville-tourcoing.fr>
+:modulename: bump_release.profiling
+
+"""
+import cProfile
+import io
+import pstats
+import re
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+__author__ = "fguerin"
+
+# region Constants
+TOP_FUNCTIONS: int = 25
+TOP_ALLOCATIONS: int = 25
+AGGREGATE_NAME: str = "aggregate"
+
+#: Functions reported in the summaries, as (label, file suffix, function name)
+HELPERS: Tuple[Tuple[str, str, str], ...] = (
+    ("helpers.update_file", "bump_release/helpers.py", "update_file"),
+    ("helpers.update_node_packages", "bump_release/helpers.py", "update_node_packages"),
+    ("helpers.update_node_lockfile", "bump_release/helpers.py", "update_node_lockfile"),
+    ("helpers.updates_yaml_file", "bump_release/helpers.py", "updates_yaml_file"),
+    ("helpers.update_pyproject_file", "bump_release/helpers.py", "update_pyproject_file"),
+    ("helpers.update_xml_file", "bump_release/helpers.py", "update_xml_file"),
+    ("YAML load", "ruamel/yaml/main.py", "load"),
+    ("YAML dump", "ruamel/yaml/main.py", "dump"),
+    ("JSON loads", "json/__init__.py", "loads"),
+    ("JSON dumps", "json/__init__.py", "dumps"),
+)
+# endregion Constants
+
+
+def profile_name(release_file: Path) -> str:
+    """
+    Name of the profile files of a project, built from the project directory
+
+    :param release_file: Path to the release file
+    :return: File name, without extension
+    """
+    return re.sub(r"[^\w.-]+", "_", str(Path(release_file).resolve().parent).strip("/\\")) or "project"
+
+
+def profile_path(name: str, directory: Path) -> Path:
+    """
+    Path of the statistics file written by :func:`profile_call`
+
+    :param name: Name of the profile files
+    :param directory: Profile files directory
+    :return: Path of the `.pstats` file
+    """
+    return Path(directory) / f"{name}.pstats"
+
+
+def profile_call(name: str, directory: Path, func: Callable, *args, **kwargs) -> Any:
+    """
+    Calls `func` under cProfile and tracemalloc, and writes the profile files of `name` in `directory`
+
+    The statistics are written in `<directory>/<name>.pstats`, see :func:`profile_path`, even if `func` fails.
+
+    :param name: Name of the profile files
+    :param directory: Profile files directory
+    :param func: Function to profile
+    :return: `func` result
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    profiler = cProfile.Profile()
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    elif hasattr(tracemalloc, "reset_peak"):
+        tracemalloc.reset_peak()
+    started = time.perf_counter()
+    try:
+        return profiler.runcall(func, *args, **kwargs)
+    finally:
+        duration = time.perf_counter() - started
+        _current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+        if not tracing:
+            tracemalloc.stop()
+
+        profiler.dump_stats(str(profile_path(name, directory)))
+        with (directory / f"{name}.allocations.txt").open(mode="w") as output_file:
+            output_file.write(format_allocations(snapshot))
+        with (directory / f"{name}.summary.txt").open(mode="w") as output_file:
+            output_file.write(
+                format_summary(name, pstats.Stats(profiler), duration=duration, peak_memory=peak),
+            )
+
+
+def format_allocations(snapshot: tracemalloc.Snapshot, top: int = TOP_ALLOCATIONS) -> str:
+    """
+    Formats the top allocations of a tracemalloc snapshot
+
+    :param snapshot: tracemalloc snapshot
+    :param top: Number of allocations to format
+    :return: Allocations, one per line
+    """
+    snapshot = snapshot.filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),))
+    statistics = snapshot.statistics("lineno")
+    return "".join(f"{statistic}\n" for statistic in statistics[:top])
+
+
+def helpers_statistics(stats: pstats.Stats) -> List[Tuple[str, int, float]]:
+    """
+    Extracts the statistics of the :data:`HELPERS` functions
+
+    :param stats: Profile statistics
+    :return: (label, calls, cumulative time) of each helper, most expensive first
+    """
+    totals: Dict[str, Tuple[int, float]] = {}
+    for (filename, _line, funcname), (primitive_calls, _calls, _tottime, cumtime, _callers) in stats.stats.items():
+        filename = filename.replace("\\", "/")
+        for label, suffix, helper in HELPERS:
+            if funcname == helper and filename.endswith(suffix):
+                calls, duration = totals.get(label, (0, 0.0))
+                totals[label] = (calls + primitive_calls, duration + cumtime)
+    return sorted(
+        ((label, calls, duration) for label, (calls, duration) in totals.items()),
+        key=lambda item: item[2],
+        reverse=True,
+    )
+
+
+def format_summary(
+    name: str,
+    stats: pstats.Stats,
+    duration: Optional[float] = None,
+    peak_memory: Optional[int] = None,
+    top: int = TOP_FUNCTIONS,
+) -> str:
+    """
+    Formats a short text summary of a profile
+
+    :param name: Name of the profile
+    :param stats: Profile statistics
+    :param duration: Wall time, in seconds
+    :param peak_memory: Peak traced memory, in bytes
+    :param top: Number of functions to print
+    :return: Summary
+    """
+    lines = [f"Profile: {name}"]
+    if duration is not None:
+        lines.append(f"Wall time: {duration:.4f} s")
+    if peak_memory is not None:
+        lines.append(f"Peak traced memory: {peak_memory / 1024:.1f} KiB")
+    lines += ["", "Helpers (cumulative time, calls):"]
+    for label, calls, cumtime in helpers_statistics(stats):
+        lines.append(f"  {label:<32} {cumtime:>10.4f} s {calls:>8}")
+
+    stream = io.StringIO()
+    stats.stream = stream
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+    lines += ["", "Top functions (cumulative time):", stream.getvalue().strip("\n")]
+    return "\n".join(lines) + "\n"
+
+
+def aggregate_profiles(directory: Path, paths: Optional[Iterable[Path]] = None) -> Optional[Path]:
+    """
+    Aggregates the statistics of the projects profiled in `directory`
+
+    :param directory: Profile files directory
+    :param paths: Profile files of the aggregated projects, *eg.* the ones written by the current run, default to all
+        the profile files of `directory`
+    :return: Path of the aggregated summary, `None` if no profile has been found
+    """
+    directory = Path(directory)
+    if paths is None:
+        paths = directory.glob("*.pstats")
+    paths = sorted(Path(path) for path in paths if Path(path).stem != AGGREGATE_NAME)
+    if not paths:
+        return None
+    stats = pstats.Stats(str(paths[0]))
+    for path in paths[1:]:
+        stats.add(str(path))
+    stats.dump_stats(str(directory / f"{AGGREGATE_NAME}.pstats"))
+    summary_path = directory / f"{AGGREGATE_NAME}.summary.txt"
+    with summary_path.open(mode="w") as output_file:
+        output_file.write(format_summary(f"{AGGREGATE_NAME} ({len(paths)} project(s))", stats))
+    return summary_path
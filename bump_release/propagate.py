@@ -0,0 +1,348 @@
+"""
+Propagation of a bumped version to the dependents of a package, for :mod:`bump_release` application
+
+A reverse index of the package names to the files which pin them is built for a tree:
+
++ `requirements*.txt` files
++ `install_requires` option of setup.cfg files
++ dependency maps of package.json files
+
+The index is persisted, and refreshed incrementally: only the files whose mtime or size has changed are scanned again.
+After a bump, only the pins of the bumped package are rewritten, in the dependent files only.
+
+:creationdate: 19/10/2026 07:07
+:moduleauthor: François GUÉRIN <fguerin@ville-tourcoing.fr>
+:modulename: bump_release.propagate
+
+"""
+import json
+import logging
+import os
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from bump_release import batch, helpers, json_scanner, locking
+
+__author__ = "fguerin"
+
+# region Constants
+INDEX_FILE_NAME: str = ".bump_release_deps.json"
+INDEX_FORMAT: int = 1
+
+REQUIREMENTS_RE = re.compile(r"^requirements.*\.txt$")
+#: Python requirement with a single rewritable specifier, *eg.* `mylib[extra] == 1.2.3 ; python_version > "3.7"`
+PYTHON_PIN_RE = re.compile(
+    r"^(?P<prefix>\s*(?P<name>[A-Za-z0-9][A-Za-z0-9._-]*)\s*(?:\[[^\]]*\])?\s*(?:===|==|~=|>=)\s*)"
+    r"(?P<version>[\w.+!*-]+)(?P<suffix>\s*(?:[;#].*)?)$"
+)
+#: npm range with a single version, *eg.* `^1.2.3`
+NODE_PIN_RE = re.compile(r"^(?P<prefix>\^|~|>=|=|)(?P<version>\d+\.\d+\.\d+[\w.+-]*)$")
+NODE_DEPENDENCY_MAPS: Tuple[str, ...] = (
+    "dependencies",
+    "devDependencies",
+    "peerDependencies",
+    "optionalDependencies",
+)
+INSTALL_REQUIRES_RE = re.compile(r"^install_requires\s*=\s*(?P<value>.*)$")
+# endregion Constants
+
+
+def python_key(name: str) -> str:
+    """
+    Index key of a python package, with a normalized name (PEP 503)
+
+    :param name: Package name
+    :return: Index key
+    """
+    return "python:" + re.sub(r"[-_.]+", "-", name).lower()
+
+
+def node_key(name: str) -> str:
+    """
+    Index key of a node package
+
+    :param name: Package name
+    :return: Index key
+    """
+    return "npm:" + name
+
+
+def _is_candidate(name: str) -> bool:
+    return name in ("setup.cfg", helpers.NODE_PACKAGE_FILE) or REQUIREMENTS_RE.match(name) is not None
+
+
+def _setup_cfg_requires(lines: List[str]) -> Iterator[int]:
+    # Indexes of the lines of the `[options] install_requires` value
+    section, in_value = None, False
+    for index, line in enumerate(lines):
+        header = helpers.INI_SECTION_RE.match(line)
+        if header is not None:
+            section, in_value = header.group(1).strip(), False
+            continue
+        if section != "options":
+            continue
+        if in_value and line[:1] in (" ", "\t") and line.strip():
+            yield index
+            continue
+        in_value = False
+        matched = INSTALL_REQUIRES_RE.match(line)
+        if matched is not None:
+            in_value = True
+            if matched.group("value").strip():
+                yield index
+
+
+def _python_lines(path: Path, lines: List[str]) -> Iterator[int]:
+    if path.name == "setup.cfg":
+        return _setup_cfg_requires(lines)
+    return iter(range(len(lines)))
+
+
+def _python_pin(line: str, setup_cfg: bool) -> Optional[re.Match]:
+    if setup_cfg:
+        line = INSTALL_REQUIRES_RE.sub(r"\g<value>", line.lstrip()) if INSTALL_REQUIRES_RE.match(line) else line
+    return PYTHON_PIN_RE.match(line.rstrip("\r\n"))
+
+
+def scan_file(path: Path) -> List[str]:
+    """
+    Lists the packages pinned in a file
+
+    :param path: Path of a requirements, setup.cfg or package.json file
+    :return: Index keys of the pinned packages
+    """
+    if path.name == helpers.NODE_PACKAGE_FILE:
+        try:
+            with path.open(mode="r") as package_file:
+                package = json.load(package_file)
+        except ValueError:
+            return []
+        keys = set()
+        for dependency_map in NODE_DEPENDENCY_MAPS:
+            for name, spec in (package.get(dependency_map) or {}).items():
+                if isinstance(spec, str) and NODE_PIN_RE.match(spec.strip()):
+                    keys.add(node_key(name))
+        return sorted(keys)
+
+    with path.open(mode="r") as ifile:
+        lines = ifile.readlines()
+    keys = set()
+    for index in _python_lines(path, lines):
+        pin = _python_pin(lines[index], path.name == "setup.cfg")
+        if pin is not None:
+            keys.add(python_key(pin.group("name")))
+    return sorted(keys)
+
+
+class DependencyIndex:
+    """
+    Reverse index of the package names to the files which pin them
+    """
+
+    def __init__(self, root: Path, path: Optional[Path] = None):
+        self.root = Path(root).resolve()
+        self.path = Path(path) if path is not None else self.root / INDEX_FILE_NAME
+        #: Scanned files, by path relative to :attr:`root`: mtime, size and pinned packages
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.scanned = 0
+
+    def load(self) -> "DependencyIndex":
+        """
+        Loads the persisted index, if any
+
+        :return: self
+        """
+        try:
+            with self.path.open(mode="r") as index_file:
+                content = json.load(index_file)
+        except (OSError, ValueError):
+            return self
+        if content.get("format") == INDEX_FORMAT:
+            self.files = content.get("files", {})
+        return self
+
+    def save(self) -> None:
+        """
+        Persists the index
+
+        The index file is locked, and replaced atomically by a temporary copy, as it MAY be shared by the projects of
+        a parallel batch run.
+        """
+        target = self.path.resolve()
+        with locking.file_lock(target):
+            with tempfile.NamedTemporaryFile(
+                mode="w", dir=target.parent, prefix=f".{target.name}.", delete=False
+            ) as index_file:
+                json.dump({"format": INDEX_FORMAT, "files": self.files}, index_file, indent=1, sort_keys=True)
+            os.replace(index_file.name, target)
+
+    def refresh(self) -> "DependencyIndex":
+        """
+        Scans again the new and changed files, according to their mtime and size, and forgets the removed files
+
+        :return: self
+        """
+        files: Dict[str, Dict[str, Any]] = {}
+        self.scanned = 0
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            batch.prune_directories(dirnames)
+            for filename in filenames:
+                if not _is_candidate(filename):
+                    continue
+                path = Path(dirpath) / filename
+                relative = path.relative_to(self.root).as_posix()
+                stat = path.stat()
+                entry = self.files.get(relative)
+                if entry is None or entry["mtime"] != stat.st_mtime or entry["size"] != stat.st_size:
+                    try:
+                        packages = scan_file(path)
+                    except (OSError, UnicodeDecodeError) as e:
+                        logging.warning(f"DependencyIndex.refresh() Unable to scan {path}: {e}")
+                        packages = []
+                    entry = {"mtime": stat.st_mtime, "size": stat.st_size, "packages": packages}
+                    self.scanned += 1
+                files[relative] = entry
+        self.files = files
+        return self
+
+    def touch(self, paths: Iterable[Path]) -> "DependencyIndex":
+        """
+        Updates the mtime and size of some indexed files, *eg.* after their pins have been rewritten, without walking
+        the tree again
+
+        :param paths: Paths of the indexed files
+        :return: self
+        """
+        for path in paths:
+            entry = self.files.get(Path(path).resolve().relative_to(self.root).as_posix())
+            if entry is not None:
+                stat = Path(path).stat()
+                entry.update(mtime=stat.st_mtime, size=stat.st_size)
+        return self
+
+    def dependents(self, key: str) -> List[Path]:
+        """
+        Lists the files which pin a package
+
+        :param key: Index key of the package
+        :return: Paths of the dependent files
+        """
+        return [self.root / relative for relative, entry in sorted(self.files.items()) if key in entry["packages"]]
+
+
+@helpers.io_bound
+def rewrite_python_pins(path: Path, name: str, version: str, dry_run: bool = False) -> List[helpers.Change]:
+    """
+    Rewrites the pins of a python package in a requirements or setup.cfg file
+
+    :param path: Path of the dependent file
+    :param name: Package name
+    :param version: New version
+    :param dry_run: If `True`, no operation performed
+    :return: Changes of the pins
+    """
+    key = python_key(name)
+    status = helpers.STATUS_DRY_RUN if dry_run else helpers.STATUS_UPDATED
+    changes: List[helpers.Change] = []
+
+    def rewrite_pins(lines: List[str]) -> List[str]:
+        changes.clear()
+        lines = list(lines)
+        for index in list(_python_lines(path, lines)):
+            line = lines[index]
+            pin = _python_pin(line, path.name == "setup.cfg")
+            if pin is None or python_key(pin.group("name")) != key or pin.group("version") == version:
+                continue
+            changes.append(
+                helpers.Change(path, index + 1, pin.group("name"), pin.group("version"), version, status=status)
+            )
+            start, end = pin.span("version")
+            # The pin has been matched on the value of `install_requires = ...`
+            offset = len(line.rstrip("\r\n")) - len(pin.string)
+            lines[index] = line[: start + offset] + version + line[end + offset :]
+        return lines
+
+    helpers.flush_buffered(path)
+    lines, digest = helpers.read_checked(path)
+    new_lines = rewrite_pins(lines)
+    if changes and not dry_run:
+        helpers.update_checked(path, rewrite_pins, lines=new_lines, digest=digest)
+    return changes
+
+
+@helpers.io_bound
+def rewrite_node_pins(path: Path, name: str, version: str, dry_run: bool = False) -> List[helpers.Change]:
+    """
+    Rewrites the pins of a node package in the dependency maps of a package.json file, keeping the range prefix
+
+    :param path: Path of the dependent file
+    :param name: Package name
+    :param version: New version
+    :param dry_run: If `True`, no operation performed
+    :return: Changes of the pins
+    """
+    with helpers.locked(path, dry_run):
+        spans = json_scanner.find_spans(path, [(dependency_map, name) for dependency_map in NODE_DEPENDENCY_MAPS])
+        status = helpers.STATUS_DRY_RUN if dry_run else helpers.STATUS_UPDATED
+        changes: List[helpers.Change] = []
+        replacements = []
+        for key_path, span in sorted(spans.items(), key=lambda item: item[1].start):
+            spec = span.value
+            pin = NODE_PIN_RE.match(spec.strip()) if isinstance(spec, str) else None
+            if pin is None or pin.group("version") == version:
+                continue
+            new_spec = pin.group("prefix") + version
+            changes.append(
+                helpers.Change(path, span.line, ".".join(key_path), spec, new_spec, status=status, offset=span.start)
+            )
+            replacements.append((span.start, span.end, json.dumps(new_spec).encode("utf-8")))
+        if replacements and not dry_run:
+            helpers.splice_file(path, replacements)
+    return changes
+
+
+def propagate(
+    root: Path,
+    version: str,
+    python_name: Optional[str] = None,
+    node_name: Optional[str] = None,
+    index_path: Optional[Path] = None,
+    jobs: Optional[int] = None,
+    dry_run: bool = False,
+) -> List[helpers.Change]:
+    """
+    Rewrites the pins of the bumped package in all its dependents under `root`
+
+    :param root: Root directory of the dependents
+    :param version: New version of the package
+    :param python_name: Python package name, if any
+    :param node_name: Node package name, if any
+    :param index_path: Path of the persisted index, default to `<root>/.bump_release_deps.json`
+    :param jobs: Number of files rewritten in parallel, default to the executor default
+    :param dry_run: If `True`, no operation performed, and the index is not saved
+    :return: Changes of the pins
+    """
+    index = DependencyIndex(root, index_path).load().refresh()
+    logging.info(f"propagate({root}) {index.scanned}/{len(index.files)} file(s) scanned")
+
+    tasks = []
+    if python_name:
+        tasks += [(rewrite_python_pins, path, python_name) for path in index.dependents(python_key(python_name))]
+    if node_name:
+        tasks += [(rewrite_node_pins, path, node_name) for path in index.dependents(node_key(node_name))]
+
+    if tasks and helpers.FILE_BUFFER is not None:
+        # The dependents MAY have been updated by the bump itself (*eg.* a setup.cfg file of the project)
+        helpers.FILE_BUFFER.flush()
+    changes: List[helpers.Change] = []
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        for _changes in executor.map(lambda task: task[0](task[1], task[2], version, dry_run), tasks):
+            changes += _changes
+    if not dry_run:
+        # Rewritten files have a new mtime
+        index.touch({Path(change.path) for change in changes if change.status == helpers.STATUS_UPDATED})
+        index.save()
+    return changes
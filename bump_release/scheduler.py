@@ -0,0 +1,136 @@
+"""
+I/O scheduler of the batch runs for :mod:`bump_release` application
+
+The projects of a batch run are dispatched to the workers by an :class:`IoScheduler`, instead of being all submitted
+at once:
+
++ the smallest projects are dispatched first, so most of the projects are finished early,
++ the projects are grouped by the devices of their files, and the number of projects updated at once on a device
+  is limited, so a slow network mount is not overloaded while the local disks are idle,
++ the number of projects in progress is limited to the number of workers.
+
+The number of files opened at once by the updaters is limited by :func:`bump_release.helpers.limit_open_files`.
+
+:creationdate: 19/10/2026 07:28
+:moduleauthor: François GUÉRIN <fguerin@ville-tourcoing.fr>
+:modulename: bump_release.scheduler
+
+"""
+import logging
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, NamedTuple, Optional
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore
+
+__author__ = "fguerin"
+
+# region Constants
+#: Maximum number of open files if the limit of the process is unknown
+DEFAULT_MAX_OPEN_FILES: int = 256
+# endregion Constants
+
+
+class Task(NamedTuple):
+    """
+    A project to dispatch
+    """
+
+    #: Index of the project in the batch
+    index: int
+    #: Estimated cost, in bytes
+    weight: int
+    #: Devices (`st_dev`) of the files of the project
+    devices: FrozenSet[int]
+
+
+def default_max_open_files() -> int:
+    """
+    Default maximum number of files opened at once by the updaters: half the limit of the process, so the
+    interpreter, the workers pipes and the lock files keep some descriptors
+
+    :return: Maximum number of open files
+    """
+    if resource is None:  # pragma: no cover
+        return DEFAULT_MAX_OPEN_FILES
+    soft, _hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft == resource.RLIM_INFINITY:
+        return DEFAULT_MAX_OPEN_FILES * 4
+    return max(soft // 2, 1)
+
+
+def run_inline(function: Callable, *args, **kwargs) -> Future:
+    """
+    Runs a function in the current process, as a finished future
+
+    :param function: Function
+    :return: Future of the result
+    """
+    future: Future = Future()
+    try:
+        future.set_result(function(*args, **kwargs))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+class IoScheduler:
+    """
+    Dispatches the tasks of a batch run, smallest first, with a limit of tasks in progress per device
+    """
+
+    def __init__(self, jobs: int = 1, device_jobs: Optional[int] = None):
+        """
+        :param jobs: Maximum number of tasks in progress
+        :param device_jobs: Maximum number of tasks in progress on a device, `jobs` if not set
+        """
+        self.jobs = max(jobs, 1)
+        self.device_jobs = max(device_jobs or self.jobs, 1)
+
+    def run(
+        self,
+        tasks: Iterable[Task],
+        submit: Callable[[Task], Future],
+        done: Callable[[Task, Future, Dict[str, Any]], None],
+    ) -> None:
+        """
+        Runs the tasks
+
+        :param tasks: Tasks
+        :param submit: Function which starts a task, and returns its future
+        :param done: Function called with each finished task, its future and its scheduling statistics:
+            `queue_wait` (seconds in the queue) and `queue_depth` (tasks left in the queue when it has been dispatched)
+        """
+        queue: List[Task] = sorted(tasks, key=lambda _task: (_task.weight, _task.index))
+        running: Dict[Future, Task] = {}
+        stats: Dict[Future, Dict[str, Any]] = {}
+        device_running: Counter = Counter()
+        started = time.perf_counter()
+
+        while queue or running:
+            position = 0
+            while len(running) < self.jobs and position < len(queue):
+                task = queue[position]
+                if any(device_running[device] >= self.device_jobs for device in task.devices):
+                    # Busy device: the next smallest task of another device is dispatched meanwhile
+                    position += 1
+                    continue
+                del queue[position]
+                device_running.update(task.devices)
+                dispatched = {"queue_wait": time.perf_counter() - started, "queue_depth": len(queue)}
+                future = submit(task)
+                running[future] = task
+                stats[future] = dispatched
+            if not running:  # pragma: no cover
+                raise RuntimeError("No task can be dispatched")
+
+            finished, _not_finished = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in finished:
+                task = running.pop(future)
+                device_running.subtract(task.devices)
+                done(task, future, stats.pop(future))
+        logging.debug(f"IoScheduler.run() Tasks run in {time.perf_counter() - started:.3f} s")
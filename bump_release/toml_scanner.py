@@ -0,0 +1,182 @@
+"""
+Lightweight TOML scanner for :mod:`bump_release` application
+
+Locates the raw bytes of some string values in a TOML document (*eg.* `[project].version` in a pyproject.toml file),
+without parsing the whole document. The file is read line by line: only the table headers, the keys and the
+multi-line values are tracked, so a `version = ...` key of another table (*eg.* a dependency table) never matches.
+
+:creationdate: 19/10/2026 07:03
+:moduleauthor: François GUÉRIN <fguerin@ville-tourcoing.fr>
+:modulename: bump_release.toml_scanner
+
+"""
+import re
+from pathlib import Path
+from typing import Dict, Iterable, Match, Optional, Tuple
+
+from bump_release.json_scanner import Span
+
+__author__ = "fguerin"
+
+KeyPath = Tuple[str, ...]
+
+_KEY_PART = r"""(?:[A-Za-z0-9_-]+|"(?:[^"\\]|\\.)*"|'[^']*')"""
+KEY_PART_RE = re.compile(_KEY_PART)
+KEY_RE = re.compile(rf"^\s*({_KEY_PART}(?:\s*\.\s*{_KEY_PART})*)\s*=\s*")
+TABLE_RE = re.compile(rf"^\s*(\[\[?)\s*({_KEY_PART}(?:\s*\.\s*{_KEY_PART})*)\s*\]\]?\s*(?:#.*)?$")
+STRING_VALUE_RE = re.compile(r""""(?:[^"\\\r\n]|\\.)*"|'[^'\r\n]*'""")
+#: Strings and comments, skipped when counting the brackets of multi-line arrays and inline tables
+SKIPPED_RE = re.compile(r""""(?:[^"\\]|\\.)*"|'[^']*'|#.*""")
+ESCAPE_RE = re.compile(r"\\(?:u([0-9A-Fa-f]{4})|U([0-9A-Fa-f]{8})|(.))", re.DOTALL)
+#: Escape sequences of the basic strings, besides `\uXXXX` and `\UXXXXXXXX`
+ESCAPES: Dict[str, str] = {"b": "\b", "t": "\t", "n": "\n", "f": "\f", "r": "\r", '"': '"', "\\": "\\"}
+
+
+def _unescape_match(match: Match) -> str:
+    code = match.group(1) or match.group(2)
+    if code is not None:
+        return chr(int(code, 16))
+    char = match.group(3)
+    if char not in ESCAPES:
+        raise ValueError(f"Invalid TOML escape sequence \\{char}")
+    return ESCAPES[char]
+
+
+def unescape(value: str) -> str:
+    """
+    Decodes the escape sequences of the content of a TOML basic string
+
+    :param value: Content of the string, without its quotes
+    :return: Decoded string
+    :raises ValueError: If an escape sequence is invalid
+    """
+    return ESCAPE_RE.sub(_unescape_match, value)
+
+
+def split_key(key: str) -> KeyPath:
+    """
+    Splits a dotted TOML key, *eg.* `tool."poetry".version`
+
+    :param key: TOML key
+    :return: Key parts, unquoted
+    """
+    parts = []
+    for part in KEY_PART_RE.findall(key):
+        if part[0] == '"':
+            part = unescape(part[1:-1])
+        elif part[0] == "'":
+            part = part[1:-1]
+        parts.append(part)
+    return tuple(parts)
+
+
+def _brackets_depth(value: str) -> int:
+    value = SKIPPED_RE.sub("", value)
+    return value.count("[") + value.count("{") - value.count("]") - value.count("}")
+
+
+class TomlScanner:
+    """
+    Finds the spans of some string values, identified by their key path, in a TOML file
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def find(self, paths: Iterable[KeyPath]) -> Dict[KeyPath, Span]:
+        """
+        Scans the file for the `paths` string values
+
+        :param paths: Key paths, as tuples of keys, *eg.* `("tool", "poetry", "version")`
+        :return: Found spans, by key path
+        """
+        targets = {tuple(path) for path in paths}
+        found: Dict[KeyPath, Span] = {}
+        table: Optional[KeyPath] = ()
+        multiline: Optional[str] = None
+        depth = 0
+        offset = 0
+        with self.path.open(mode="rb") as ifile:
+            for number, raw_line in enumerate(ifile, start=1):
+                line_offset, offset = offset, offset + len(raw_line)
+                line = raw_line.decode("utf-8", errors="replace")
+
+                # region Multi-line values
+                if multiline is not None:
+                    if multiline in line:
+                        multiline = None
+                    continue
+                if depth > 0:
+                    depth += _brackets_depth(line)
+                    continue
+                # endregion Multi-line values
+
+                header = TABLE_RE.match(line)
+                if header is not None:
+                    # Keys of array of tables are never searched
+                    table = split_key(header.group(2)) if header.group(1) == "[" else None
+                    continue
+
+                matched = KEY_RE.match(line)
+                if matched is None:
+                    continue
+                value = line[matched.end() :]
+                if value[:3] in ('"""', "'''"):
+                    if value[:3] not in value[3:]:
+                        multiline = value[:3]
+                    continue
+                if value[:1] in ("[", "{"):
+                    depth = _brackets_depth(value)
+                    continue
+
+                if table is None:
+                    continue
+                key_path = table + split_key(matched.group(1))
+                if key_path not in targets:
+                    continue
+                string = STRING_VALUE_RE.match(value)
+                if string is None:
+                    continue
+                start = line_offset + len(line[: matched.end()].encode("utf-8"))
+                raw = string.group().encode("utf-8")
+                found[key_path] = Span(start, start + len(raw), number, raw)
+                if len(found) == len(targets):
+                    break
+        return found
+
+
+def find_spans(path: Path, paths: Iterable[KeyPath]) -> Dict[KeyPath, Span]:
+    """
+    Finds the spans of the `paths` string values in the `path` TOML file
+
+    :param path: Path of the TOML file
+    :param paths: Key paths, as tuples of keys
+    :return: Found spans, by key path
+    """
+    return TomlScanner(path).find(paths)
+
+
+def string_value(span: Span) -> str:
+    """
+    Decodes a TOML string span
+
+    :param span: Span of a basic or literal string
+    :return: String value
+    """
+    raw = span.raw.decode("utf-8")
+    if raw[0] == "'":
+        return raw[1:-1]
+    return unescape(raw[1:-1])
+
+
+def encode_string(value: str, quote: str = '"') -> bytes:
+    """
+    Encodes a string as a TOML basic (`"`) or literal (`'`) string
+
+    :param value: String value
+    :param quote: Quote of the string
+    :return: TOML string
+    """
+    if quote == '"':
+        value = value.replace("\\", "\\\\").replace('"', '\\"')
+    return f"{quote}{value}{quote}".encode("utf-8")
@@ -0,0 +1,325 @@
+"""
+Watch mode for :mod:`bump_release` application
+
+Watches the release.ini files of all the projects under a root directory, and when the `current_release` of a project
+is modified by hand, updates the files of this project only.
+
+The directories of the projects are watched with inotify (through :mod:`ctypes`, Linux only), or polled on the other
+platforms. The parsed release files are kept between the events: an incremental sync only reads the modified
+release.ini file and the files of its project.
+
+Only the default version stream is synchronized. The projects created after the start of the watch are not watched.
+
+:creationdate: 19/10/2026 07:22
+:moduleauthor: François GUÉRIN <fguerin@ville-tourcoing.fr>
+:modulename: bump_release.watch
+
+"""
+import configparser
+import ctypes
+import ctypes.util
+import hashlib
+import logging
+import os
+import select
+import struct
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import bump_release
+from bump_release import batch, helpers
+
+__author__ = "fguerin"
+
+# region Constants
+#: Polling interval, in seconds
+POLL_INTERVAL: float = 1.0
+#: Delay to gather the events of a single save (editors may write a file in several steps), in seconds
+SETTLE_DELAY: float = 0.05
+
+# inotify(7)
+IN_CLOSE_WRITE: int = 0x00000008
+IN_MOVED_TO: int = 0x00000080
+IN_IGNORED: int = 0x00008000
+IN_Q_OVERFLOW: int = 0x00004000
+IN_NONBLOCK: int = os.O_NONBLOCK
+IN_CLOEXEC: int = os.O_CLOEXEC
+INOTIFY_EVENT = struct.Struct("iIII")
+INOTIFY_BUFFER_SIZE: int = 64 * 1024
+# endregion Constants
+
+
+class PollingWatcher:
+    """
+    Watches files by polling their status
+    """
+
+    def __init__(self, paths: Iterable[Path], interval: float = POLL_INTERVAL):
+        self.interval = interval
+        self.signatures: Dict[Path, Optional[Tuple[int, int, int]]] = {path: self._signature(path) for path in paths}
+
+    @staticmethod
+    def _signature(path: Path) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def wait(self, timeout: Optional[float] = None) -> Set[Path]:
+        """
+        Waits for some files to be modified
+
+        :param timeout: Maximum wait, in seconds, `None` to wait forever
+        :return: Modified files, empty if none has been modified in time
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            changed = set()
+            for path, signature in self.signatures.items():
+                current = self._signature(path)
+                if current != signature:
+                    self.signatures[path] = current
+                    changed.add(path)
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return changed
+            delay = self.interval if deadline is None else min(self.interval, max(deadline - time.monotonic(), 0))
+            time.sleep(delay)
+
+    def close(self) -> None:
+        """
+        Stops watching the files
+        """
+        self.signatures = {}
+
+
+class InotifyWatcher:
+    """
+    Watches files with inotify, through the directories which contain them, so the files replaced by a rename
+    are still watched
+    """
+
+    def __init__(self, paths: Iterable[Path]):
+        library = ctypes.util.find_library("c")
+        if library is None:
+            raise OSError("Unable to find the C library")
+        self._libc = ctypes.CDLL(library, use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_init1: {os.strerror(errno)}")
+        #: Watched files names, by directory
+        self.files: Dict[Path, Set[str]] = {}
+        self._directories: Dict[int, Path] = {}
+        try:
+            for path in paths:
+                self.add(path)
+        except OSError:
+            self.close()
+            raise
+
+    def add(self, path: Path) -> None:
+        """
+        Watches a file
+
+        :param path: File path
+        """
+        directory = path.parent
+        if directory not in self.files:
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO)
+            if wd < 0:
+                errno = ctypes.get_errno()
+                raise OSError(errno, f"inotify_add_watch({directory}): {os.strerror(errno)}")
+            self._directories[wd] = directory
+            self.files[directory] = set()
+        self.files[directory].add(path.name)
+
+    def _read(self) -> Set[Path]:
+        changed: Set[Path] = set()
+        try:
+            data = os.read(self._fd, INOTIFY_BUFFER_SIZE)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = INOTIFY_EVENT.unpack_from(data, offset)
+            offset += INOTIFY_EVENT.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                logging.warning("InotifyWatcher._read() Events queue overflow, all the files are checked")
+                changed.update(directory / name for directory, names in self.files.items() for name in names)
+                continue
+            directory = self._directories.get(wd)
+            if mask & IN_IGNORED:
+                # The directory has been removed
+                self._directories.pop(wd, None)
+                continue
+            if directory is not None and name in self.files.get(directory, ()):
+                changed.add(directory / name)
+        return changed
+
+    def wait(self, timeout: Optional[float] = None) -> Set[Path]:
+        """
+        Waits for some files to be modified
+
+        :param timeout: Maximum wait, in seconds, `None` to wait forever
+        :return: Modified files, empty if none has been modified in time
+        """
+        readable, _writable, _errors = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+        changed = self._read()
+        # Gathers the events of the same save
+        while select.select([self._fd], [], [], SETTLE_DELAY)[0]:
+            changed |= self._read()
+        return changed
+
+    def close(self) -> None:
+        """
+        Stops watching the files
+        """
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def open_watcher(paths: Iterable[Path], polling: bool = False, interval: float = POLL_INTERVAL):
+    """
+    Opens the best available watcher
+
+    :param paths: Watched files
+    :param polling: If `True`, the files are polled even if inotify is available
+    :param interval: Polling interval, in seconds
+    :return: Watcher, with `wait(timeout)` and `close()` methods
+    """
+    paths = list(paths)
+    if not polling:
+        try:
+            return InotifyWatcher(paths)
+        except (OSError, AttributeError) as e:
+            # AttributeError: no inotify functions in the C library (not Linux)
+            logging.info(f"open_watcher() inotify is not available, the files are polled: {e}")
+    return PollingWatcher(paths, interval=interval)
+
+
+class WatchedProject:
+    """
+    Project of a watched release.ini file, with the state of its last sync
+    """
+
+    def __init__(self, release_file: Path):
+        self.release_file = release_file
+        self.digest: Optional[str] = None
+        self.config: Optional[configparser.ConfigParser] = None
+        #: Release of the last sync
+        self.release: Optional[str] = None
+
+    def _read(self) -> bool:
+        # Reloads the release file, if it has been modified since it has been loaded
+        digest = hashlib.sha1(self.release_file.read_bytes()).hexdigest()
+        if digest == self.digest:
+            return False
+        self.digest = digest
+        self.config = helpers.load_release_file(release_file=self.release_file)
+        return True
+
+    def load(self) -> None:
+        """
+        Loads the release file, its `current_release` being the state of the project
+        """
+        self._read()
+        assert self.config is not None
+        self.release = self.config.get("DEFAULT", "current_release", fallback=None)
+
+    def sync(self, dry_run: bool = False) -> Optional[List[helpers.Change]]:
+        """
+        Updates the files of the project if its `current_release` has been modified since the last sync
+
+        :param dry_run: If `True`, no operation performed
+        :return: Changes, `None` if the project has not been modified
+        """
+        if not self._read():
+            return None
+        assert self.config is not None
+        release = self.config.get("DEFAULT", "current_release", fallback=None)
+        if release is None or release == self.release:
+            return None
+        helpers.split_version(release)
+
+        cwd = os.getcwd()
+        try:
+            # The paths of the release file are relative to the project directory
+            os.chdir(self.release_file.parent)
+            bump_release.RELEASE_FILE = self.release_file
+            bump_release.RELEASE_CONFIG = self.config
+            with helpers.track_changes() as changes:
+                bump_release.process_streams(release_file=self.release_file, releases={None: release}, dry_run=dry_run)
+        finally:
+            os.chdir(cwd)
+        self.release = release
+        # The release file itself has been rewritten
+        self._read()
+        return changes
+
+
+class Watch:
+    """
+    Watches the projects under a root directory
+    """
+
+    def __init__(self, root: Path, dry_run: bool = False, polling: bool = False, interval: float = POLL_INTERVAL):
+        self.root = Path(root).resolve()
+        self.dry_run = dry_run
+        self.projects: Dict[Path, WatchedProject] = {}
+        for release_file in batch.discover_release_files(self.root):
+            project = WatchedProject(release_file)
+            try:
+                project.load()
+            except (helpers.UpdateException, configparser.Error, OSError) as e:
+                logging.error(f"Watch() Unable to load {release_file}: {e}")
+            self.projects[release_file] = project
+        self.watcher = open_watcher(self.projects, polling=polling, interval=interval)
+        logging.info(f"Watch({self.root}) {len(self.projects)} project(s) watched by {type(self.watcher).__name__}")
+
+    def poll(self, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Waits for some release files to be modified, and syncs their projects
+
+        :param timeout: Maximum wait, in seconds, `None` to wait forever
+        :return: Results of the synced projects, as the results of :func:`bump_release.batch.bump_project`
+        """
+        results = []
+        for release_file in sorted(self.watcher.wait(timeout)):
+            project = self.projects.get(release_file)
+            if project is None:
+                continue
+            result: Dict[str, Any] = {"release_file": str(release_file), "status": "ok", "error": None, "changes": []}
+            started = time.perf_counter()
+            try:
+                changes = project.sync(dry_run=self.dry_run)
+                if changes is None:
+                    continue
+                result["changes"] = changes
+            except (helpers.UpdateException, configparser.Error, ValueError, OSError) as e:
+                logging.error(f"Watch.poll() Unable to sync {release_file}: {e}")
+                result.update(status="error", error=str(e))
+            result["release"] = project.release
+            result["duration"] = time.perf_counter() - started
+            results.append(result)
+        return results
+
+    def close(self) -> None:
+        """
+        Stops watching the projects
+        """
+        self.watcher.close()
+
+    def __enter__(self) -> "Watch":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
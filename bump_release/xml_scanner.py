@@ -0,0 +1,226 @@
+"""
+Streaming XML scanner for :mod:`bump_release` application
+
+Locates the raw bytes of the text of an element, or of the value of an attribute, in an XML document (*eg.*
+`project/version` in a pom.xml file, `Project/PropertyGroup/Version` in a .csproj file or
+`manifest/@android:versionName` in an AndroidManifest.xml file), without building the element tree.
+
+The file is fed chunk by chunk to an expat parser, which is stopped as soon as the searched element is found: only
+the beginning of the document is read. A path step matches the qualified name of an element (`android:versionName`),
+or its local name if the step has no prefix, so the default namespace of a pom.xml file is ignored.
+
+:creationdate: 19/10/2026 07:24
+:moduleauthor: François GUÉRIN <fguerin@ville-tourcoing.fr>
+:modulename: bump_release.xml_scanner
+
+"""
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from xml.parsers import expat
+from xml.sax.saxutils import escape, unescape
+
+from bump_release.json_scanner import Span
+
+__author__ = "fguerin"
+
+# region Constants
+CHUNK_SIZE: int = 64 * 1024
+#: Entities of the attribute values, besides the ones of :func:`xml.sax.saxutils.escape`
+XML_ENTITIES: Dict[str, str] = {'"': "&quot;", "'": "&apos;"}
+TAG_NAME_RE = re.compile(rb"<\s*[^\s/>]+")
+ATTRIBUTE_RE = re.compile(rb"""\s*([^\s=/>]+)\s*=\s*("[^"]*"|'[^']*')""")
+# endregion Constants
+
+ElementPath = Tuple[str, ...]
+
+
+class XmlScanError(ValueError):
+    """
+    The XML document cannot be scanned
+    """
+
+    pass
+
+
+class _Found(Exception):
+    pass
+
+
+def split_path(element_path: str) -> ElementPath:
+    """
+    Splits an element path, *eg.* `project/version` or `manifest/@android:versionName`
+
+    :param element_path: Element path, from the root element, the last step being an attribute if it starts with `@`
+    :return: Steps of the path
+    :raises ValueError: If the path is empty, or if an attribute is not the last step
+    """
+    steps = tuple(step.strip() for step in element_path.strip().strip("/").split("/"))
+    if not steps or not all(steps):
+        raise ValueError(f"Invalid element path {element_path!r}")
+    if any(step.startswith("@") for step in steps[:-1]) or steps[-1] == "@":
+        raise ValueError(f"Invalid element path {element_path!r}: an attribute MUST be the last step")
+    return steps
+
+
+def _matches(step: str, name: str) -> bool:
+    if ":" in step:
+        return step == name
+    return step == name.rpartition(":")[2]
+
+
+class XmlScanner:
+    """
+    Finds the span of the text of an element, or of the value of an attribute, in an XML file
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.encoding = "utf-8"
+
+    def find(self, element_path: ElementPath) -> Optional[Span]:
+        """
+        Finds the first element of the `element_path` path, in the document order
+
+        :param element_path: Steps of the path, as returned by :func:`split_path`
+        :return: Span of the raw text of the element (an empty span before its end tag if it has no text) or of the
+            attribute value (without its quotes), `None` if not found
+        :raises XmlScanError: If the document is not well-formed before the element, or if the element has children
+        """
+        attribute = element_path[-1][1:] if element_path[-1].startswith("@") else None
+        elements = element_path[:-1] if attribute is not None else element_path
+        stack: List[str] = []
+        #: Depth of the stack which matches the path
+        matched = [0]
+        found: Dict[str, int] = {}
+        parser = expat.ParserCreate()
+
+        def start_element(name, attributes):
+            depth = len(stack)
+            stack.append(name)
+            if "line" in found:
+                raise XmlScanError(f"{self.path}: <{'/'.join(stack[:-1])}> has a child element <{name}>")
+            if matched[0] != depth or depth >= len(elements) or not _matches(elements[depth], name):
+                return
+            matched[0] = depth + 1
+            if matched[0] < len(elements):
+                return
+            if attribute is not None:
+                if any(_matches(attribute, _name) for _name in attributes):
+                    found.update(tag=parser.CurrentByteIndex, line=parser.CurrentLineNumber)
+                    raise _Found()
+                return
+            found.update(tag=parser.CurrentByteIndex, line=parser.CurrentLineNumber)
+
+        def end_element(name):
+            if "line" in found:
+                found["end"] = parser.CurrentByteIndex
+                raise _Found()
+            stack.pop()
+            matched[0] = min(matched[0], len(stack))
+
+        def character_data(data):
+            if "line" in found and "start" not in found:
+                found.update(start=parser.CurrentByteIndex, line=parser.CurrentLineNumber)
+
+        def comment(data):
+            if "line" in found:
+                raise XmlScanError(f"{self.path}: <{'/'.join(stack)}> has a comment")
+
+        def cdata():
+            if "line" in found:
+                raise XmlScanError(f"{self.path}: <{'/'.join(stack)}> has a CDATA section")
+
+        def xml_declaration(version, encoding, standalone):
+            if encoding:
+                self.encoding = encoding
+
+        parser.StartElementHandler = start_element
+        parser.EndElementHandler = end_element
+        parser.CharacterDataHandler = character_data
+        parser.CommentHandler = comment
+        parser.StartCdataSectionHandler = cdata
+        parser.XmlDeclHandler = xml_declaration
+
+        with self.path.open(mode="rb") as ifile:
+            try:
+                for chunk in iter(lambda: ifile.read(CHUNK_SIZE), b""):
+                    parser.Parse(chunk, False)
+                parser.Parse(b"", True)
+                return None
+            except _Found:
+                pass
+            except expat.ExpatError as e:
+                raise XmlScanError(f"{self.path}: {e}")
+
+            if attribute is not None:
+                return self._attribute_span(ifile, found["tag"], found["line"], attribute)
+            if "start" not in found:
+                ifile.seek(found["tag"])
+                if ifile.read(found["end"] - found["tag"]).rstrip().endswith(b"/>"):
+                    raise XmlScanError(f"{self.path}: <{'/'.join(stack)}> is an empty-element tag")
+            start = found.get("start", found["end"])
+            ifile.seek(start)
+            return Span(start, found["end"], found["line"], ifile.read(found["end"] - start))
+
+    def _attribute_span(self, ifile, tag: int, line: int, attribute: str) -> Span:
+        # Reads the start tag until the attribute, the values being quoted
+        ifile.seek(tag)
+        data = b""
+        while True:
+            chunk = ifile.read(CHUNK_SIZE)
+            if not chunk:
+                raise XmlScanError(f"{self.path}: unterminated start tag at line {line}")
+            data += chunk
+            name = TAG_NAME_RE.match(data)
+            if name is None:
+                continue
+            pos = name.end()
+            while True:
+                attribute_match = ATTRIBUTE_RE.match(data, pos)
+                if attribute_match is None:
+                    break
+                if _matches(attribute, attribute_match.group(1).decode(self.encoding)):
+                    start = tag + attribute_match.start(2) + 1
+                    raw = attribute_match.group(2)[1:-1]
+                    return Span(start, start + len(raw), line + data[: attribute_match.start(2)].count(b"\n"), raw)
+                pos = attribute_match.end()
+            if data[pos:].lstrip().startswith((b">", b"/>")):
+                raise XmlScanError(f"{self.path}: attribute {attribute} not found at line {line}")
+
+
+def find_span(path: Path, element_path: ElementPath) -> Optional[Span]:
+    """
+    Finds the span of the `element_path` element text or attribute value in the `path` XML file
+
+    :param path: Path of the XML file
+    :param element_path: Steps of the path, as returned by :func:`split_path`
+    :return: Found span, `None` if not found
+    """
+    return XmlScanner(path).find(element_path)
+
+
+def text_value(span: Span, encoding: str = "utf-8") -> str:
+    """
+    Decodes a text or attribute value span, without its surrounding whitespaces
+
+    :param span: Span of an element text or of an attribute value
+    :param encoding: Encoding of the document
+    :return: Value
+    """
+    return unescape(span.raw.decode(encoding).strip(), {value: key for key, value in XML_ENTITIES.items()})
+
+
+def encode_text(span: Span, value: str, encoding: str = "utf-8") -> bytes:
+    """
+    Encodes a value to replace a text or attribute value span, keeping the whitespaces around the old value
+
+    :param span: Span of the replaced text or attribute value
+    :param value: New value
+    :param encoding: Encoding of the document
+    :return: Raw bytes of the new value
+    """
+    raw = span.raw.decode(encoding)
+    head = raw[: len(raw) - len(raw.lstrip())]
+    tail = raw[len(raw.rstrip()) :] if raw.strip() else ""
+    return (head + escape(value, XML_ENTITIES) + tail).encode(encoding)
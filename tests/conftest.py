@@ -0,0 +1,40 @@
+"""
+Shared fixtures of the tests
+"""
+from pathlib import Path
+from typing import Callable, Dict
+
+import pytest
+
+RELEASE_INI = """[DEFAULT]
+current_release = 0.0.1
+
+[main_project]
+path = main.txt
+"""
+MAIN_ROW = '__version__ = VERSION = "0.0.1"\n'
+
+
+@pytest.fixture
+def make_monorepo(tmp_path) -> Callable[[Dict[str, int]], Path]:
+    """
+    Builds a monorepo of projects with a release.ini file, whose main.txt file has `size` comment lines before its
+    version row
+
+    :return: Function which takes the sizes of the projects, by project directory, and returns the monorepo root
+    """
+
+    def _make_monorepo(projects: Dict[str, int]) -> Path:
+        for name, size in projects.items():
+            project = tmp_path / name
+            project.mkdir(parents=True)
+            (project / "release.ini").write_text(RELEASE_INI)
+            (project / "main.txt").write_text("#\n" * size + MAIN_ROW)
+        return tmp_path
+
+    return _make_monorepo
+
+
+@pytest.fixture
+def monorepo(make_monorepo) -> Path:
+    return make_monorepo({"a": 0, "b": 0, "c": 0})
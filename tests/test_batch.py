@@ -0,0 +1,125 @@
+"""
+Tests for batch runs
+"""
+import io
+import json
+
+import pytest
+
+from bump_release import batch, helpers
+
+
+@pytest.fixture
+def monorepo(make_monorepo):
+    names = ("a", "b", "c/d", "e", "node_modules/f", ".git/g")
+    return make_monorepo({name: len(name) * 10 for name in names})
+
+
+def test_discover_release_files(monorepo):
+    release_files = batch.discover_release_files(monorepo)
+    assert [batch.relative_name(path, monorepo) for path in release_files] == [
+        "a/release.ini",
+        "b/release.ini",
+        "c/d/release.ini",
+        "e/release.ini",
+    ]
+
+
+@pytest.mark.parametrize("value,expected", [("1/1", (1, 1)), ("2/4", (2, 4))])
+def test_parse_shard(value, expected):
+    assert batch.parse_shard(value) == expected
+
+
+@pytest.mark.parametrize("value", ["0/2", "3/2", "1", "a/b", "1/0"])
+def test_parse_invalid_shard(value):
+    with pytest.raises(ValueError):
+        batch.parse_shard(value)
+
+
+def test_shards_partition(monorepo):
+    release_files = batch.discover_release_files(monorepo)
+    shards = [batch.shard_release_files(release_files, monorepo, index, 3) for index in (1, 2, 3)]
+    assert sorted(path for shard in shards for path in shard) == release_files
+    assert all(shards), "Each shard MUST get a project"
+    assert shards == [batch.shard_release_files(reversed(release_files), monorepo, index, 3) for index in (1, 2, 3)]
+
+
+def test_run_batch(monorepo):
+    release_files = batch.discover_release_files(monorepo)
+    results = batch.run_batch(release_files, release="0.0.2")
+    assert [result["status"] for result in results] == ["ok"] * len(release_files)
+    for release_file in release_files:
+        assert (release_file.parent / "main.txt").read_text().endswith('__version__ = VERSION = "0.0.2"\n')
+        assert "current_release = 0.0.2" in release_file.read_text()
+
+
+def test_run_batch_error(monorepo):
+    (monorepo / "a" / "main.txt").write_text("nothing to update\n")
+    results = batch.run_batch(batch.discover_release_files(monorepo), release="0.0.2")
+    assert results[0]["status"] == "error"
+    summary = batch.summarize(results)
+    assert (summary["total"], summary["ok"], summary["error"]) == (4, 3, 1)
+
+
+def test_merge_reports(monorepo, tmp_path):
+    release_files = batch.discover_release_files(monorepo)
+    paths = []
+    for index in (1, 2):
+        shard = batch.shard_release_files(release_files, monorepo, index, 2)
+        report = batch.build_report(batch.run_batch(shard, "0.0.2", dry_run=True), monorepo, "0.0.2", (index, 2))
+        paths.append(tmp_path / f"shard-{index}.json")
+        batch.write_report(report, paths[-1])
+
+    merged = batch.merge_reports(paths)
+    assert [result["release_file"] for result in merged["results"]] == [
+        batch.relative_name(path, monorepo) for path in release_files
+    ]
+    assert merged["summary"]["total"] == len(release_files)
+    assert merged["missing_shards"] == []
+    assert batch.merge_reports(paths[:1])["missing_shards"] == [2]
+
+
+def test_merge_reports_of_different_releases(monorepo, tmp_path):
+    paths = []
+    for release in ("0.0.2", "0.0.3"):
+        paths.append(tmp_path / f"{release}.json")
+        batch.write_report(batch.build_report([], monorepo, release), paths[-1])
+    with pytest.raises(helpers.UpdateException):
+        batch.merge_reports(paths)
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_run_jobs(monorepo, jobs):
+    lines = [
+        json.dumps({"id": "a", "release_file": str(monorepo / "a" / "release.ini"), "version": "0.0.2"}),
+        "",
+        json.dumps(
+            {"id": "b", "release_file": str(monorepo / "b" / "release.ini"), "version": "0.0.2", "dry_run": True}
+        ),
+        "not json",
+        json.dumps({"id": "c", "release_file": str(monorepo / "c" / "d" / "release.ini"), "version": "0.0"}),
+        json.dumps({"id": "e", "release_file": str(monorepo / "e" / "release.ini"), "version": "0.0.3"}),
+    ]
+    output = io.StringIO()
+    summary = batch.run_jobs(iter(lines), output, jobs=jobs)
+    assert (summary["total"], summary["ok"], summary["error"]) == (5, 3, 2)
+
+    results = [json.loads(line) for line in output.getvalue().splitlines()]
+    by_id = {result.get("id"): result for result in results}
+    assert by_id["a"]["status"] == "ok"
+    assert by_id["a"]["changed_files"] == [
+        str((monorepo / "a" / "main.txt").resolve()),
+        str((monorepo / "a" / "release.ini").resolve()),
+    ]
+    assert set(by_id["a"]["timings"]) == {"wait", "duration"}
+    assert [(change["section"], change["status"]) for change in by_id["a"]["changes"]] == [
+        ("main_project", "updated"),
+        ("DEFAULT", "updated"),
+    ]
+    assert by_id["b"]["changed_files"] == []
+    assert {change["status"] for change in by_id["b"]["changes"]} == {"dry-run"}
+    assert by_id["c"]["status"] == "error"
+    assert "line 5" in by_id["c"]["error"]
+    assert "line 4" in by_id[None]["error"]
+    assert (monorepo / "e" / "main.txt").read_text().endswith('__version__ = VERSION = "0.0.3"\n')
+    assert (monorepo / "b" / "main.txt").read_text().endswith('__version__ = VERSION = "0.0.1"\n')
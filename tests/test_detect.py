@@ -0,0 +1,90 @@
+"""
+Tests for the detection of version-bearing files
+"""
+import shutil
+import subprocess
+from pathlib import Path, PurePosixPath
+
+import pytest
+
+import bump_release
+from bump_release import detect, helpers
+
+FIXTURES_PATH = Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture
+def repository(tmp_path):
+    backend = tmp_path / "backend"
+    (backend / "backend").mkdir(parents=True)
+    (backend / "docs").mkdir()
+    shutil.copy(FIXTURES_PATH / "setup.py", backend / "setup.py")
+    shutil.copy(FIXTURES_PATH / "main.txt", backend / "backend" / "__init__.py")
+    shutil.copy(FIXTURES_PATH / "sphinx.conf", backend / "docs" / "conf.py")
+    shutil.copy(FIXTURES_PATH / "sonar-project.properties", backend / "sonar-project.properties")
+    shutil.copy(FIXTURES_PATH / "vars.yml", backend / "vars.yml")
+
+    frontend = tmp_path / "frontend"
+    frontend.mkdir()
+    (frontend / "package.json").write_text('{"name": "frontend", "version": "2.1.0"}')
+    (frontend / "package-lock.json").write_text('{"name": "frontend", "version": "2.1.0", "packages": {}}')
+    (frontend / "README.md").write_text("version = 1.0.0")
+
+    library = tmp_path / "library"
+    library.mkdir()
+    shutil.copy(FIXTURES_PATH / "pyproject.toml", library / "pyproject.toml")
+
+    # Ignored files are not tracked
+    (tmp_path / ".gitignore").write_text("build/\n")
+    (tmp_path / "build").mkdir()
+    (tmp_path / "build" / "setup.py").write_text('setup(\n    version="9.9.9",\n)\n')
+
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+    subprocess.run(["git", "-C", str(tmp_path), "add", "."], check=True)
+    return tmp_path
+
+
+def test_git_tracked_files(repository):
+    files = detect.git_tracked_files(repository)
+    assert PurePosixPath("backend/setup.py") in files
+    assert PurePosixPath("build/setup.py") not in files
+
+
+def test_detect(repository):
+    projects = detect.detect(repository, jobs=2)
+    assert sorted(projects) == [PurePosixPath("backend"), PurePosixPath("frontend"), PurePosixPath("library")]
+    assert sorted((detection.section, detection.version) for detection in projects[PurePosixPath("backend")]) == [
+        ("ansible", "0.0.1"),
+        ("docs", "0.0.1"),
+        ("main_project", "0.0.1"),
+        ("setup", "0.0.1"),
+        ("sonar", "0.1"),
+    ]
+    assert sorted(detection.section for detection in projects[PurePosixPath("frontend")]) == ["node", "node_lock"]
+    assert projects[PurePosixPath("library")] == [
+        detect.Detection("pyproject", PurePosixPath("library/pyproject.toml"), "0.0.1")
+    ]
+
+
+def test_build_release_config(repository):
+    projects = detect.detect(repository)
+    config = detect.build_release_config(PurePosixPath("backend"), projects[PurePosixPath("backend")])
+    assert config["DEFAULT"]["current_release"] == "0.0.1"
+    assert config.sections() == ["setup", "main_project", "docs", "ansible", "sonar"]
+    assert config["main_project"]["path"] == "backend/__init__.py"
+    assert config["docs"]["path"] == "docs/conf.py"
+
+    config = detect.build_release_config(PurePosixPath("frontend"), projects[PurePosixPath("frontend")])
+    assert config["DEFAULT"]["current_release"] == "2.1.0"
+    assert config["node_lock"]["path"] == "package-lock.json"
+
+
+def test_not_a_repository(tmp_path):
+    with pytest.raises(helpers.UpdateException):
+        detect.git_tracked_files(tmp_path)
+
+
+def test_init_invalid_release(tmp_path, capsys):
+    assert bump_release.init.callback(root=str(tmp_path), release="1.2") == 2
+    assert capsys.readouterr().err.startswith("ERROR: ")
+    assert not (tmp_path / "release.ini").exists()
@@ -0,0 +1,82 @@
+"""
+Tests for the completion journal of the batch runs
+"""
+import io
+import json
+
+import bump_release
+from bump_release import batch, journal
+
+
+def test_resume(monorepo):
+    release_files = batch.discover_release_files(monorepo)
+    (monorepo / "c" / "main.txt").write_text("nothing to update\n")
+    path = monorepo / journal.JOURNAL_FILE_NAME
+    with journal.Journal(path) as journal_file:
+        results = batch.run_batch(release_files, "0.0.2", journal_file=journal_file)
+    assert [result["status"] for result in results] == ["ok", "ok", "error"]
+
+    entries = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [entry["release_file"] for entry in entries] == [str(path) for path in release_files[:2]]
+    assert set(entries[0]["hashes"]) == {str(monorepo / "a" / "main.txt"), str(monorepo / "a" / "release.ini")}
+
+    # The project `b` has been reverted meanwhile, and the project `c` fixed
+    (monorepo / "b" / "main.txt").write_text('__version__ = VERSION = "0.0.1"\n')
+    (monorepo / "c" / "main.txt").write_text('__version__ = VERSION = "0.0.1"\n')
+    with journal.Journal(path) as journal_file:
+        results = batch.run_batch(release_files, "0.0.2", jobs=2, journal_file=journal_file, resume=True)
+    assert [result["status"] for result in results] == ["skipped", "ok", "ok"]
+    assert (monorepo / "b" / "main.txt").read_text() == '__version__ = VERSION = "0.0.2"\n'
+
+    with journal.Journal(path) as journal_file:
+        assert not journal_file.is_done(release_files[0], "0.0.3")
+        results = batch.run_batch(release_files, "0.0.2", journal_file=journal_file, resume=True)
+    assert [result["status"] for result in results] == ["skipped"] * 3
+    assert batch.summarize(results)["skipped"] == 3
+
+
+def test_truncated_journal(monorepo):
+    release_files = batch.discover_release_files(monorepo)
+    path = monorepo / journal.JOURNAL_FILE_NAME
+    with journal.Journal(path) as journal_file:
+        batch.run_batch(release_files[:1], "0.0.2", journal_file=journal_file)
+    # Interrupted while writing an entry
+    with path.open(mode="a") as output_file:
+        output_file.write('{"release_file": "')
+
+    with journal.Journal(path) as journal_file:
+        assert journal_file.is_done(release_files[0], "0.0.2")
+        batch.run_batch(release_files, "0.0.2", journal_file=journal_file, resume=True)
+    assert len(journal.Journal(path).load().entries) == 3
+
+
+def test_dry_run_not_journaled(monorepo):
+    path = monorepo / journal.JOURNAL_FILE_NAME
+    assert bump_release.bump_recursive(monorepo, "0.0.2", dry_run=True, resume=True) == 0
+    assert not path.exists()
+
+    with journal.Journal(path) as journal_file:
+        batch.run_batch(batch.discover_release_files(monorepo), "0.0.2", dry_run=True, journal_file=journal_file)
+    assert not path.exists()
+
+    jobs = [json.dumps({"release_file": str(monorepo / "a" / "release.ini"), "version": "0.0.2", "dry_run": True})]
+    with journal.Journal(path) as journal_file:
+        batch.run_jobs(jobs, io.StringIO(), journal_file=journal_file)
+    assert not path.exists()
+
+
+def test_run_jobs_resume(monorepo):
+    lines = [
+        json.dumps({"id": name, "release_file": str(monorepo / name / "release.ini"), "version": "0.0.2"})
+        for name in ("a", "b")
+    ]
+    path = monorepo / journal.JOURNAL_FILE_NAME
+    with journal.Journal(path) as journal_file:
+        batch.run_jobs(lines[:1], io.StringIO(), journal_file=journal_file)
+
+    output = io.StringIO()
+    with journal.Journal(path) as journal_file:
+        summary = batch.run_jobs(lines, output, journal_file=journal_file, resume=True)
+    assert (summary["total"], summary["ok"], summary["skipped"]) == (2, 1, 1)
+    results = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [(result["id"], result["status"]) for result in results] == [("a", "skipped"), ("b", "ok")]
@@ -0,0 +1,53 @@
+"""
+Tests for the JSON scanner
+"""
+import json
+
+import pytest
+
+from bump_release import json_scanner
+
+DOCUMENT = {
+    "name": "my-package",
+    "dependencies": {"version": "1.0.0", "left-pad": "^1.3.0"},
+    "scripts": ["echo \"}\"", {"nested": [1, 2, {"version": "2.0.0"}]}],
+    "packages": {"": {"name": "my-package", "version": "0.0.1"}},
+    "version": "0.0.1",
+}
+
+
+@pytest.fixture
+def json_file(tmp_path):
+    path = tmp_path / "package.json"
+    path.write_text(json.dumps(DOCUMENT, indent=2))
+    return path
+
+
+def test_find_top_level_key(json_file):
+    span = json_scanner.find_span(json_file, ("version",))
+    assert span is not None
+    assert span.value == "0.0.1"
+    assert span.line == len(json_file.read_text().splitlines()) - 1
+    assert json_file.read_bytes()[span.start : span.end] == b'"0.0.1"'
+
+
+def test_find_nested_keys(json_file):
+    spans = json_scanner.find_spans(json_file, [("version",), ("packages", "", "version")])
+    assert spans[("version",)].value == "0.0.1"
+    assert spans[("packages", "", "version")].value == "0.0.1"
+    assert spans[("packages", "", "version")].start < spans[("version",)].start
+
+
+def test_missing_key(json_file):
+    assert json_scanner.find_span(json_file, ("release",)) is None
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / "empty.json"
+    path.write_text("")
+    assert json_scanner.find_span(path, ("version",)) is None
+
+
+def test_invalid_document():
+    with pytest.raises(json_scanner.JsonScanError):
+        json_scanner.JsonScanner(b'{"name": "foo" "version": "1.0.0"}').find([("version",)])
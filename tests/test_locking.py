@@ -0,0 +1,129 @@
+"""
+Tests for the file locking and the compare-and-swap writes
+"""
+import fcntl
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from bump_release import helpers, locking
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(helpers, "WRITE_BACKOFF", 0)
+
+
+def test_file_lock(tmp_path):
+    path = tmp_path / "sonar-project.properties"
+    with locking.file_lock(path):
+        # Re-entrant
+        with locking.file_lock(path):
+            pass
+        # Held by another open file description, as in another process
+        fd = os.open(str(locking.lock_path(path)), os.O_RDWR)
+        try:
+            with pytest.raises(BlockingIOError):
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        finally:
+            os.close(fd)
+    # The lock file is removed when the lock is released
+    assert not locking.lock_path(path).exists()
+
+    fd = os.open(str(locking.lock_path(path)), os.O_RDWR | os.O_CREAT)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        with pytest.raises(locking.LockTimeoutError):
+            with locking.file_lock(path, timeout=0.05):
+                pass
+    finally:
+        os.close(fd)
+
+
+def test_file_lock_removed_meanwhile(tmp_path, monkeypatch):
+    path = tmp_path / "sonar-project.properties"
+    key = locking.lock_path(path)
+    try_lock = locking._try_lock
+    attempts = []
+
+    def _try_lock(fd):
+        if not attempts:
+            # Another process releases its lock, and removes the lock file, after it has been opened
+            os.unlink(str(key))
+            os.close(os.open(str(key), os.O_RDWR | os.O_CREAT))
+        attempts.append(fd)
+        return try_lock(fd)
+
+    monkeypatch.setattr(locking, "_try_lock", _try_lock)
+    with locking.file_lock(path):
+        assert len(attempts) == 2
+        # The current lock file is locked
+        fd = os.open(str(key), os.O_RDWR)
+        try:
+            with pytest.raises(BlockingIOError):
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        finally:
+            os.close(fd)
+
+
+def test_update_checked_retry(tmp_path, no_backoff):
+    path = tmp_path / "conf.py"
+    path.write_text("a = 1\nb = 1\n")
+    calls = []
+
+    def transform(lines):
+        if not calls:
+            # Another process updates the file meanwhile
+            path.write_text("a = 2\nb = 1\n")
+        calls.append(lines)
+        return [lines[0], "b = 2\n"]
+
+    helpers.update_checked(path, transform)
+    assert len(calls) == 2
+    assert path.read_text() == "a = 2\nb = 2\n"
+
+
+def test_update_checked_abandoned(tmp_path, no_backoff):
+    path = tmp_path / "conf.py"
+    path.write_text("a = 0\n")
+
+    def transform(lines):
+        path.write_text(f"a = {int(path.read_text()[4:]) + 1}\n")
+        return ["b = 1\n"]
+
+    with pytest.raises(helpers.ConcurrentUpdateException):
+        helpers.update_checked(path, transform)
+    assert path.read_text() == f"a = {helpers.WRITE_RETRIES + 1}\n"
+
+
+def test_buffered_edits_replayed(tmp_path, no_backoff):
+    path = tmp_path / "release.ini"
+    path.write_text("[DEFAULT]\ncurrent_release = 0.0.1\n\n[docs]\npath = docs/conf.py\n")
+    with helpers.buffered_writes():
+        helpers.update_file(
+            path=path,
+            pattern=helpers.RELEASE_INI_PATTERN,
+            template=helpers.RELEASE_INI_TEMPLATE,
+            version=helpers.split_version("0.0.2"),
+        )
+        path.write_text(path.read_text().replace("docs/conf.py", "doc/conf.py"))
+    assert path.read_text() == "[DEFAULT]\ncurrent_release = 0.0.2\n\n[docs]\npath = doc/conf.py\n"
+
+
+def test_concurrent_updates(tmp_path):
+    path = tmp_path / "sonar-project.properties"
+    keys = [f"project{index}.version" for index in range(8)]
+    path.write_text("".join(f"{key}=0.0.1\n" for key in keys))
+
+    def bump(key):
+        return helpers.update_file(
+            path=path,
+            pattern=rf"^{key}=[.\d]+$",
+            template=f"{key}={{major}}.{{minor}}.{{release}}",
+            version=helpers.split_version("1.0.0"),
+        )
+
+    with ThreadPoolExecutor(max_workers=len(keys)) as executor:
+        list(executor.map(bump, keys))
+    assert path.read_text() == "".join(f"{key}=1.0.0\n" for key in keys)
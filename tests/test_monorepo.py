@@ -0,0 +1,48 @@
+"""
+Tests for the synthetic monorepo generator of the benchmarks
+"""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from bump_release import batch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+
+import monorepo  # noqa: E402
+
+
+@pytest.mark.parametrize("position", [0, 0.5, 1])
+def test_generate(tmp_path, position):
+    release_files = monorepo.generate(tmp_path, 3, size=8192, position=position)
+    assert release_files == batch.discover_release_files(tmp_path)
+
+    project = release_files[0].parent
+    for section, (fixture, target) in monorepo.TARGETS.items():
+        text = (project / target).read_text()
+        assert 7000 < len(text) <= 8192 + 200, target
+        if target.endswith(".json"):
+            keys = list(json.loads(text))
+            offset = keys.index("version") / len(keys)
+        else:
+            offset = text.index((monorepo.FIXTURES_DIR / fixture).read_text().strip()) / len(text)
+        assert abs(offset - position) < 0.1, target
+
+
+def test_generate_reproducible(tmp_path):
+    first = monorepo.generate(tmp_path / "first", 2, seed=42, spread=0.5)
+    second = monorepo.generate(tmp_path / "second", 2, seed=42, spread=0.5)
+    for left, right in zip(first, second):
+        for _fixture, target in monorepo.TARGETS.values():
+            assert (left.parent / target).read_text() == (right.parent / target).read_text()
+
+
+def test_bump_generated(tmp_path):
+    release_files = monorepo.generate(tmp_path, 2, size=2048, position=1)
+    results = batch.run_batch(release_files, release="1.0.0")
+    assert [result["status"] for result in results] == ["ok", "ok"]
+    project = release_files[1].parent
+    assert 'version="1.0.0",' in (project / "setup.py").read_text()
+    assert json.loads((project / "package.json").read_text())["version"] == "1.0.0"
@@ -0,0 +1,80 @@
+"""
+Tests for the node lockfile updater
+"""
+import pytest
+
+import bump_release
+from bump_release import helpers
+
+LOCKFILE = """{
+  "name": "my-test-package",
+  "version": "0.0.1",
+  "lockfileVersion": 3,
+  "requires": true,
+  "packages": {
+    "": {
+      "name": "my-test-package",
+      "version": "0.0.1",
+      "dependencies": {
+        "left-pad": "^1.3.0"
+      }
+    },
+    "node_modules/left-pad": {
+      "version": "1.3.0",
+      "resolved": "https://registry.npmjs.org/left-pad/-/left-pad-1.3.0.tgz"
+    }
+  }
+}
+"""
+
+
+@pytest.fixture
+def lockfile(tmp_path):
+    path = tmp_path / "package-lock.json"
+    path.write_text(LOCKFILE)
+    return path
+
+
+@pytest.fixture
+def version():
+    return helpers.split_version("0.0.2")
+
+
+def test_dry_run_lockfile(lockfile, version):
+    records = helpers.update_node_lockfile(path=lockfile, version=version, dry_run=True)
+    assert [str(change) for change in records] == [
+        f"{lockfile}:3 version: '0.0.1' -> '0.0.2'",
+        f"{lockfile}:9 packages.\"\".version: '0.0.1' -> '0.0.2'",
+    ]
+    assert lockfile.read_text() == LOCKFILE
+
+
+def test_update_lockfile_in_place(lockfile, version):
+    helpers.update_node_lockfile(path=lockfile, version=version)
+    assert lockfile.read_text() == LOCKFILE.replace('"version": "0.0.1"', '"version": "0.0.2"')
+
+
+def test_update_lockfile_other_length(lockfile):
+    helpers.update_node_lockfile(path=lockfile, version=helpers.split_version("10.0.12"))
+    assert lockfile.read_text() == LOCKFILE.replace('"version": "0.0.1"', '"version": "10.0.12"')
+
+
+def test_update_lockfile_without_packages(tmp_path, version):
+    path = tmp_path / "npm-shrinkwrap.json"
+    path.write_text('{"name": "foo", "version": "0.0.1", "lockfileVersion": 1}')
+    helpers.update_node_lockfile(path=path, version=version)
+    assert path.read_text() == '{"name": "foo", "version": "0.0.2", "lockfileVersion": 1}'
+
+
+def test_update_lockfile_without_version(tmp_path, version):
+    path = tmp_path / "package-lock.json"
+    path.write_text('{"name": "foo"}')
+    with pytest.raises(helpers.UpdateException):
+        helpers.update_node_lockfile(path=path, version=version)
+
+
+def test_full_node_lockfile(lockfile, version):
+    bump_release.RELEASE_CONFIG = helpers.load_release_file(lockfile.parent / "release.ini")
+    bump_release.RELEASE_CONFIG.read_dict({"node_lock": {"path": str(lockfile)}})
+    result = bump_release.update_node_lockfile(version=version, dry_run=True)
+    assert result is not None
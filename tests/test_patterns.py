@@ -0,0 +1,98 @@
+"""
+Tests for the protection against the slow user patterns
+"""
+import time
+
+import pytest
+
+from bump_release import helpers, patterns
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [r"^version=(\d+)+$", r"(\w*\.?)*$", r"(.*)*x", r"(x+x+)+y", r"(a+|b)+c", r"((ab)*c?)+"],
+)
+def test_find_hazards(pattern):
+    assert patterns.find_hazards(pattern) == ["nested quantifiers in a repeated group"]
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        helpers.MAIN_PROJECT_PATTERN,
+        helpers.SETUP_PATTERN,
+        helpers.SETUP_CFG_PATTERN,
+        helpers.SONAR_PATTERN,
+        helpers.DOCS_VERSION_PATTERN,
+        helpers.DOCS_RELEASE_PATTERN,
+        helpers.RELEASE_INI_PATTERN,
+        r"^version = ((\d+)\.)+",
+        r"(a|b)+",
+        r"(a{2})+",
+        r"(?>a+)+",
+    ],
+)
+def test_safe_patterns(pattern):
+    assert patterns.find_hazards(pattern) == []
+
+
+def test_analysis_not_available(monkeypatch):
+    monkeypatch.setattr(patterns, "ANALYSIS_AVAILABLE", False)
+    assert patterns.find_hazards(r"^version=(\d+)+$") == []
+
+
+def test_load_release_file(tmp_path):
+    release_file = tmp_path / "release.ini"
+    release_file.write_text('[DEFAULT]\ncurrent_release = 0.0.1\n\n[setup]\npath = setup.py\npattern = "^v=(\\d+)+$"\n')
+    with pytest.raises(helpers.UnsafePatternException, match="Section `setup`: pattern"):
+        helpers.load_release_file(release_file)
+
+    release_file.write_text("[docs]\npath = conf.py\npattern_release = ^release=(\n")
+    with pytest.raises(helpers.UnsafePatternException, match="invalid pattern_release"):
+        helpers.load_release_file(release_file)
+
+
+def test_long_lines_skipped(tmp_path):
+    path = tmp_path / "main.js"
+    path.write_text('var version = "0.0.1";' + " " * 5000 + "\n" + 'var version = "0.0.1";\n')
+    new_row = helpers.update_file(
+        path=path,
+        pattern=r'^var version = "[.\d]+";$',
+        template='var version = "{major}.{minor}.{release}";',
+        version=helpers.split_version("0.0.2"),
+    )
+    assert new_row.new == 'var version = "0.0.2";'
+    assert new_row.line == 2
+    assert path.read_text().splitlines()[1] == 'var version = "0.0.2";'
+
+
+def test_time_budget(tmp_path):
+    path = tmp_path / "setup.py"
+    path.write_text("a = 1\n" * 10)
+    with pytest.raises(helpers.PatternTimeoutException, match=r"Section `setup`: .* -1 s budget on .*setup.py, line 1"):
+        helpers.update_file(
+            path=path,
+            pattern=helpers.SETUP_PATTERN,
+            template=helpers.SETUP_TEMPLATE,
+            version=helpers.split_version("0.0.2"),
+            dry_run=True,
+            config_section="setup",
+            time_budget=-1,
+        )
+
+
+def test_time_budget_per_scan(tmp_path):
+    path = tmp_path / "main.txt"
+    path.write_text('__version__ = VERSION = "0.0.1"\n')
+    with helpers.buffered_writes():
+        helpers.update_file(
+            path=path,
+            pattern=helpers.MAIN_PROJECT_PATTERN,
+            template=helpers.MAIN_PROJECT_TEMPLATE,
+            version=helpers.split_version("0.0.2"),
+            time_budget=0.2,
+        )
+        # Edited by another process after the budget of the first scan: the scan is replayed on the flush
+        time.sleep(0.3)
+        path.write_text('# edited\n__version__ = VERSION = "0.0.1"\n')
+    assert path.read_text() == '# edited\n__version__ = VERSION = "0.0.2"\n'
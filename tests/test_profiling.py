@@ -0,0 +1,87 @@
+"""
+Tests for the profiling of bump runs
+"""
+import pstats
+import shutil
+from pathlib import Path
+
+from bump_release import batch, helpers, profiling
+
+
+def _update(path):
+    return helpers.update_file(
+        path=path,
+        pattern=helpers.MAIN_PROJECT_PATTERN,
+        template=helpers.MAIN_PROJECT_TEMPLATE,
+        version=("0", "0", "2"),
+    )
+
+
+def test_profile_call(tmp_path):
+    path = tmp_path / "main.txt"
+    path.write_text('__version__ = VERSION = "0.0.1"\n')
+    profile_dir = tmp_path / "profiles"
+
+    result = profiling.profile_call("project", profile_dir, _update, path)
+    assert result.new == '__version__ = VERSION = "0.0.2"'
+    assert sorted(child.name for child in profile_dir.iterdir()) == [
+        "project.allocations.txt",
+        "project.pstats",
+        "project.summary.txt",
+    ]
+    summary = (profile_dir / "project.summary.txt").read_text()
+    assert "Wall time:" in summary
+    assert "helpers.update_file" in summary
+
+    stats = pstats.Stats(str(profile_dir / "project.pstats"))
+    assert [label for label, _calls, _cumtime in profiling.helpers_statistics(stats)] == ["helpers.update_file"]
+
+
+def test_profile_pyproject_and_xml(tmp_path):
+    fixtures = Path(__file__).parent / "fixtures"
+    shutil.copy(fixtures / "pyproject.toml", tmp_path / "pyproject.toml")
+    shutil.copy(fixtures / "pom.xml", tmp_path / "pom.xml")
+
+    def _update():
+        helpers.update_pyproject_file(path=tmp_path / "pyproject.toml", version=("0", "0", "2"), dry_run=True)
+        helpers.update_xml_file(path=tmp_path / "pom.xml", version=("0", "0", "2"), dry_run=True)
+
+    profiling.profile_call("project", tmp_path / "profiles", _update)
+    stats = pstats.Stats(str(tmp_path / "profiles" / "project.pstats"))
+    assert {label for label, _calls, _cumtime in profiling.helpers_statistics(stats)} == {
+        "helpers.update_pyproject_file",
+        "helpers.update_xml_file",
+    }
+
+
+def test_aggregate_profiles(tmp_path):
+    profile_dir = tmp_path / "profiles"
+    assert profiling.aggregate_profiles(tmp_path) is None
+    for name in ("a", "b"):
+        path = tmp_path / f"{name}.txt"
+        path.write_text('__version__ = VERSION = "0.0.1"\n')
+        profiling.profile_call(name, profile_dir, _update, path)
+
+    summary_path = profiling.aggregate_profiles(profile_dir)
+    assert summary_path == profile_dir / "aggregate.summary.txt"
+    assert "aggregate (2 project(s))" in summary_path.read_text()
+    assert (profile_dir / "aggregate.pstats").exists()
+    stats = pstats.Stats(str(profile_dir / "aggregate.pstats"))
+    assert profiling.helpers_statistics(stats)[0][:2] == ("helpers.update_file", 2)
+
+
+def test_aggregate_current_run(tmp_path):
+    profile_dir = tmp_path / "profiles"
+    stale = tmp_path / "stale.txt"
+    stale.write_text('__version__ = VERSION = "0.0.1"\n')
+    profiling.profile_call("stale", profile_dir, _update, stale)
+
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "release.ini").write_text("[DEFAULT]\ncurrent_release = 0.0.1\n\n[main_project]\npath = main.txt\n")
+    (project / "main.txt").write_text('__version__ = VERSION = "0.0.1"\n')
+    results = batch.run_batch([project / "release.ini"], "0.0.2", profile_dir=profile_dir)
+    name = profiling.profile_name(project / "release.ini")
+    assert results[0]["profile"] == str(profiling.profile_path(name, profile_dir))
+    # The profile of the previous run is not aggregated
+    assert "aggregate (1 project(s))" in (profile_dir / "aggregate.summary.txt").read_text()
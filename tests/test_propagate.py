@@ -0,0 +1,137 @@
+"""
+Tests for the propagation of a bumped version to the dependents
+"""
+import configparser
+import json
+import os
+
+import pytest
+
+import bump_release
+from bump_release import helpers, propagate
+
+REQUIREMENTS = """\
+click==7.1.2
+My_Lib[extra] == 1.0.0 ; python_version >= "3.7"  # internal
+my-lib-other==1.0.0
+"""
+
+SETUP_CFG = """\
+[metadata]
+name = backend
+version = 0.3.0
+
+[options]
+install_requires =
+    click>=7.0
+    my.lib~=1.0.0
+
+[options.extras_require]
+test = my-lib==1.0.0
+"""
+
+PACKAGE = {
+    "name": "frontend",
+    "version": "0.1.0",
+    "dependencies": {"@corp/ui": "^1.0.0", "left-pad": "1.3.0"},
+    "devDependencies": {"@corp/ui-tools": "~1.0.0"},
+    "peerDependencies": {"@corp/ui": ">=1.0.0 <2.0.0"},
+}
+
+
+@pytest.fixture
+def tree(tmp_path):
+    (tmp_path / "backend").mkdir()
+    (tmp_path / "backend" / "requirements.txt").write_text(REQUIREMENTS)
+    (tmp_path / "backend" / "setup.cfg").write_text(SETUP_CFG)
+    (tmp_path / "frontend").mkdir()
+    (tmp_path / "frontend" / "package.json").write_text(json.dumps(PACKAGE, indent=2) + "\n")
+    (tmp_path / "frontend" / "node_modules").mkdir()
+    (tmp_path / "frontend" / "node_modules" / "package.json").write_text(json.dumps(PACKAGE))
+    return tmp_path
+
+
+def test_index(tree):
+    index = propagate.DependencyIndex(tree).refresh()
+    assert index.scanned == 3
+    assert index.dependents(propagate.python_key("my_lib")) == [
+        tree / "backend" / "requirements.txt",
+        tree / "backend" / "setup.cfg",
+    ]
+    assert index.dependents(propagate.node_key("@corp/ui")) == [tree / "frontend" / "package.json"]
+    assert index.dependents(propagate.python_key("left-pad")) == []
+
+
+def test_index_refresh(tree):
+    propagate.DependencyIndex(tree).refresh().save()
+    index = propagate.DependencyIndex(tree).load().refresh()
+    assert index.scanned == 0
+
+    (tree / "backend" / "requirements.txt").write_text("other==1.0\n")
+    (tree / "frontend" / "package.json").unlink()
+    index = propagate.DependencyIndex(tree).load().refresh()
+    assert index.scanned == 1
+    assert index.dependents(propagate.python_key("my-lib")) == [tree / "backend" / "setup.cfg"]
+    assert sorted(index.files) == ["backend/requirements.txt", "backend/setup.cfg"]
+
+
+def test_propagate_python(tree):
+    records = propagate.propagate(tree, "1.1.0", python_name="my-lib")
+    assert len(records) == 2
+    assert (tree / "backend" / "requirements.txt").read_text() == REQUIREMENTS.replace("== 1.0.0", "== 1.1.0")
+    # Only the install_requires option is rewritten
+    assert (tree / "backend" / "setup.cfg").read_text() == SETUP_CFG.replace("~=1.0.0", "~=1.1.0")
+    assert (tree / propagate.INDEX_FILE_NAME).exists()
+    # The index is replaced by a temporary copy
+    assert not list(tree.glob(f".{propagate.INDEX_FILE_NAME}.*"))
+
+
+def test_propagate_single_walk(tree, monkeypatch):
+    walks = []
+    walk = os.walk
+
+    def _walk(top, *args, **kwargs):
+        walks.append(top)
+        return walk(top, *args, **kwargs)
+
+    monkeypatch.setattr(os, "walk", _walk)
+    propagate.propagate(tree, "1.1.0", python_name="my-lib")
+    assert len(walks) == 1
+    # The rewritten files are up to date in the saved index
+    index = propagate.DependencyIndex(tree).load().refresh()
+    assert index.scanned == 0
+
+
+def test_propagate_node(tree):
+    records = propagate.propagate(tree, "1.1.0", node_name="@corp/ui")
+    assert [str(change) for change in records] == [
+        f"{tree / 'frontend' / 'package.json'}:5 dependencies.@corp/ui: '^1.0.0' -> '^1.1.0'"
+    ]
+    package = json.loads((tree / "frontend" / "package.json").read_text())
+    assert package["dependencies"] == {"@corp/ui": "^1.1.0", "left-pad": "1.3.0"}
+    # Ranges are left untouched
+    assert package["peerDependencies"] == PACKAGE["peerDependencies"]
+    assert package["devDependencies"] == PACKAGE["devDependencies"]
+
+
+def test_propagate_dry_run(tree):
+    records = propagate.propagate(tree, "1.1.0", python_name="my-lib", node_name="@corp/ui", dry_run=True)
+    assert len(records) == 3
+    assert (tree / "backend" / "requirements.txt").read_text() == REQUIREMENTS
+    assert (tree / "backend" / "setup.cfg").read_text() == SETUP_CFG
+    assert not (tree / propagate.INDEX_FILE_NAME).exists()
+
+
+def test_update_dependents(tree, monkeypatch):
+    monkeypatch.chdir(tree)
+    config = configparser.ConfigParser()
+    config.read_dict({"propagate": {"name": "my_lib", "root": "backend"}})
+    monkeypatch.setattr(bump_release, "RELEASE_CONFIG", config)
+    changes = bump_release.update_dependents(version=helpers.split_version("2.0.0"))
+    assert [change.section for change in changes] == ["propagate", "propagate"]
+    assert "my-lib==2.0.0" not in (tree / "backend" / "requirements.txt").read_text()
+    assert "My_Lib[extra] == 2.0.0" in (tree / "backend" / "requirements.txt").read_text()
+
+    config.read_dict({"propagate": {"name": ""}})
+    with pytest.raises(helpers.NothingToDoException):
+        bump_release.update_dependents(version=helpers.split_version("2.0.0"))
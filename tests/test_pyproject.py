@@ -0,0 +1,90 @@
+"""
+Tests for the pyproject.toml updater
+"""
+import shutil
+from pathlib import Path
+
+import pytest
+
+import bump_release
+from bump_release import helpers, toml_scanner
+
+FIXTURE_PATH = Path(__file__).parent / "fixtures" / "pyproject.toml"
+
+
+@pytest.fixture
+def pyproject(tmp_path):
+    path = tmp_path / "pyproject.toml"
+    shutil.copy(FIXTURE_PATH, path)
+    return path
+
+
+@pytest.fixture
+def version():
+    return helpers.split_version("0.0.2")
+
+
+def test_split_key():
+    assert toml_scanner.split_key('tool."poetry" . version') == ("tool", "poetry", "version")
+    assert toml_scanner.split_key("'a.b'.c") == ("a.b", "c")
+    assert toml_scanner.split_key('"café".version') == ("café", "version")
+
+
+@pytest.mark.parametrize(
+    "raw, value",
+    [
+        ('"é"', "é"),
+        ('"v\\u00e9 \\"1\\"\\t\\\\"', 'vé "1"\t\\'),
+        ('"\\U0001F600"', "\U0001F600"),
+        ("'C:\\é'", "C:\\é"),
+    ],
+)
+def test_string_value(raw, value):
+    data = raw.encode("utf-8")
+    assert toml_scanner.string_value(toml_scanner.Span(0, len(data), 1, data)) == value
+
+
+def test_invalid_escape():
+    with pytest.raises(ValueError):
+        toml_scanner.unescape("\\x41")
+
+
+def test_find_spans(pyproject):
+    spans = toml_scanner.find_spans(
+        pyproject, [("project", "version"), ("tool", "poetry", "version"), ("tool", "some", "array", "version")]
+    )
+    assert sorted(spans) == [("project", "version"), ("tool", "poetry", "version")]
+    assert spans[("project", "version")].line == 15
+    assert spans[("project", "version")].raw == b'"0.0.1"'
+    assert pyproject.read_bytes()[spans[("project", "version")].start : spans[("project", "version")].end] == b'"0.0.1"'
+    assert toml_scanner.string_value(spans[("tool", "poetry", "version")]) == "0.0.1"
+
+
+def test_dry_run_pyproject(pyproject, version):
+    record = helpers.update_pyproject_file(path=pyproject, version=version, dry_run=True)
+    assert str(record) == f"{pyproject}:15 project.version: '0.0.1' -> '0.0.2'"
+    assert record.status == helpers.STATUS_DRY_RUN
+    assert pyproject.read_text() == FIXTURE_PATH.read_text()
+
+
+def test_update_pyproject(pyproject):
+    helpers.update_pyproject_file(path=pyproject, version=helpers.split_version("0.10.0"))
+    expected = FIXTURE_PATH.read_text().replace('version = "0.0.1"', 'version = "0.10.0"')
+    assert pyproject.read_text() == expected
+
+
+def test_update_poetry_table(pyproject, version):
+    helpers.update_pyproject_file(path=pyproject, version=version, table="tool.poetry")
+    assert pyproject.read_text() == FIXTURE_PATH.read_text().replace("version = '0.0.1'", "version = '0.0.2'")
+
+
+def test_update_missing_table(pyproject, version):
+    with pytest.raises(helpers.UpdateException):
+        helpers.update_pyproject_file(path=pyproject, version=version, table="tool.flit")
+
+
+def test_full_pyproject(pyproject, version):
+    bump_release.RELEASE_CONFIG = helpers.load_release_file(pyproject.parent / "release.ini")
+    bump_release.RELEASE_CONFIG.read_dict({"pyproject": {"path": str(pyproject)}})
+    result = bump_release.update_pyproject_file(version=version, dry_run=True)
+    assert result is not None
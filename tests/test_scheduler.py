@@ -0,0 +1,87 @@
+"""
+Tests for the I/O scheduler of the batch runs
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from bump_release import batch, helpers, scheduler
+
+
+@pytest.fixture
+def monorepo(make_monorepo):
+    return make_monorepo({"a": 300, "b": 1, "c": 100})
+
+
+def test_smallest_first():
+    tasks = [
+        scheduler.Task(0, 30, frozenset({1})),
+        scheduler.Task(1, 10, frozenset({1})),
+        scheduler.Task(2, 20, frozenset()),
+    ]
+    finished = []
+    scheduler.IoScheduler(jobs=1).run(
+        tasks,
+        submit=lambda task: scheduler.run_inline(lambda: task.index),
+        done=lambda task, future, stats: finished.append((future.result(), stats["queue_depth"])),
+    )
+    assert finished == [(1, 2), (2, 1), (0, 0)]
+
+
+def test_device_jobs():
+    tasks = [scheduler.Task(index, index, frozenset({index % 2})) for index in range(8)]
+    lock = threading.Lock()
+    running = {0: 0, 1: 0}
+    peaks = {0: 0, 1: 0}
+
+    def _run(task):
+        device = task.index % 2
+        with lock:
+            running[device] += 1
+            peaks[device] = max(peaks[device], running[device])
+        threading.Event().wait(0.01)
+        with lock:
+            running[device] -= 1
+
+    finished = []
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        scheduler.IoScheduler(jobs=4, device_jobs=1).run(
+            tasks,
+            submit=lambda task: executor.submit(_run, task),
+            done=lambda task, future, stats: finished.append(task.index),
+        )
+    assert sorted(finished) == list(range(8))
+    assert peaks == {0: 1, 1: 1}
+
+
+def test_io_slot():
+    slots = threading.BoundedSemaphore(1)
+    with helpers.limit_open_files(slots=slots), helpers.track_io() as waits:
+        with helpers.io_slot():
+            # Re-entrant: a nested updater does not wait for the slot held by its caller
+            with helpers.io_slot():
+                assert not slots.acquire(blocking=False)
+        assert slots.acquire(blocking=False)
+        slots.release()
+    assert waits["updates"] == 1
+    assert helpers.OPEN_FILES_SLOTS is None
+    assert helpers.open_files_slots(2) == 1
+    assert helpers.open_files_slots(64) == 64 // helpers.FILES_PER_UPDATE
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_run_batch(monorepo, jobs):
+    release_files = batch.discover_release_files(monorepo)
+    results = batch.run_batch(release_files, "0.0.2", jobs=jobs, max_open_files=4, device_jobs=1)
+    # The results keep the order of the release files
+    assert [result["release_file"] for result in results] == [str(path) for path in release_files]
+    assert [result["status"] for result in results] == ["ok"] * 3
+    assert all((monorepo / name / "main.txt").read_text().endswith('"0.0.2"\n') for name in "abc")
+    if jobs == 1:
+        # The smallest project is bumped first
+        assert [result["io"]["queue_depth"] for result in results] == [0, 2, 1]
+
+    summary = batch.summarize(results)
+    assert summary["io"]["queue_depth"]["max"] == 2
+    assert sum(device["projects"] for device in summary["io"]["devices"].values()) == 3
@@ -0,0 +1,120 @@
+"""
+Tests for the version streams
+"""
+import pytest
+
+import bump_release
+from bump_release import helpers
+
+RELEASE_INI = """[DEFAULT]
+current_release = 1.0.0
+
+[stream:frontend]
+current_release = 2.0.0
+
+[stream:backend]
+current_release = 4.0.0
+
+[main_project]
+path = main.txt
+
+[main_project:backend]
+path = backend.txt
+
+[main_project:frontend]
+path = shared.txt
+pattern = "^FRONTEND = .*$"
+template = "FRONTEND = {major}.{minor}.{release}"
+
+[setup_cfg:backend]
+path = shared.txt
+pattern = "^BACKEND = .*$"
+template = "BACKEND = {major}.{minor}.{release}"
+"""
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "release.ini").write_text(RELEASE_INI)
+    (tmp_path / "main.txt").write_text('__version__ = VERSION = "1.0.0"\n')
+    (tmp_path / "backend.txt").write_text('__version__ = VERSION = "4.0.0"\n')
+    (tmp_path / "shared.txt").write_text("FRONTEND = 2.0.0\nBACKEND = 4.0.0\n")
+    bump_release.RELEASE_CONFIG = helpers.load_release_file(tmp_path / "release.ini")
+    return tmp_path
+
+
+def test_parse_releases():
+    assert bump_release.parse_releases(("1.0.1",)) == {None: "1.0.1"}
+    assert bump_release.parse_releases(("frontend=2.1.0", "backend=4.0.3")) == {
+        "frontend": "2.1.0",
+        "backend": "4.0.3",
+    }
+    with pytest.raises(ValueError):
+        bump_release.parse_releases(("1.0.1", "1.0.2"))
+    with pytest.raises(ValueError):
+        bump_release.parse_releases(("frontend=2.1",))
+
+
+def test_process_streams(project):
+    releases = {"frontend": "2.1.0", "backend": "4.0.3"}
+    with helpers.track_writes() as written_files:
+        assert bump_release.process_streams(project / "release.ini", releases, dry_run=False) == 0
+    assert sorted(path.name for path in written_files) == ["backend.txt", "release.ini", "shared.txt"]
+
+    assert (project / "shared.txt").read_text() == "FRONTEND = 2.1.0\nBACKEND = 4.0.3\n"
+    assert (project / "backend.txt").read_text() == '__version__ = VERSION = "4.0.3"\n'
+    assert (project / "main.txt").read_text() == '__version__ = VERSION = "1.0.0"\n'
+    release_config = helpers.load_release_file(project / "release.ini")
+    assert release_config["DEFAULT"]["current_release"] == "1.0.0"
+    assert release_config["stream:frontend"]["current_release"] == "2.1.0"
+    assert release_config["stream:backend"]["current_release"] == "4.0.3"
+
+
+def test_process_default_stream(project):
+    assert bump_release.process_streams(project / "release.ini", {None: "1.0.1"}, dry_run=False) == 0
+    assert (project / "main.txt").read_text() == '__version__ = VERSION = "1.0.1"\n'
+    assert (project / "shared.txt").read_text() == "FRONTEND = 2.0.0\nBACKEND = 4.0.0\n"
+    release_config = helpers.load_release_file(project / "release.ini")
+    assert release_config["DEFAULT"]["current_release"] == "1.0.1"
+    assert release_config["stream:frontend"]["current_release"] == "2.0.0"
+
+
+def test_default_stream_after_streams(project):
+    # The [DEFAULT] section is after a stream section
+    default = "[DEFAULT]\ncurrent_release = 1.0.0\n"
+    release_ini = RELEASE_INI.replace(default + "\n", "") + "\n" + default
+    (project / "release.ini").write_text(release_ini)
+    bump_release.update_release_ini(project / "release.ini", helpers.split_version("1.0.1"))
+    release_config = helpers.load_release_file(project / "release.ini")
+    assert release_config["DEFAULT"]["current_release"] == "1.0.1"
+    assert release_config["stream:frontend"]["current_release"] == "2.0.0"
+
+
+def test_unknown_stream(project):
+    with pytest.raises(helpers.NothingToDoException):
+        bump_release.process_streams(project / "release.ini", {"docs": "1.0.1"}, dry_run=False)
+
+
+def test_buffered_writes(tmp_path):
+    path = tmp_path / "shared.txt"
+    path.write_text("FRONTEND = 2.0.0\nBACKEND = 4.0.0\n")
+    with helpers.buffered_writes():
+        helpers.update_file(path, "^FRONTEND = .*$", "FRONTEND = {major}.{minor}.{release}", ("2", "1", "0"))
+        helpers.update_file(path, "^BACKEND = .*$", "BACKEND = {major}.{minor}.{release}", ("4", "0", "3"))
+        assert path.read_text() == "FRONTEND = 2.0.0\nBACKEND = 4.0.0\n", "Files MUST be written on exit"
+    assert path.read_text() == "FRONTEND = 2.1.0\nBACKEND = 4.0.3\n"
+
+
+def test_update_file_in_ini_section(tmp_path):
+    path = tmp_path / "release.ini"
+    path.write_text(RELEASE_INI)
+    new_row = helpers.update_file(
+        path,
+        helpers.RELEASE_INI_PATTERN,
+        helpers.RELEASE_INI_TEMPLATE,
+        ("4", "0", "3"),
+        ini_section="stream:backend",
+    )
+    assert new_row.new == "current_release = 4.0.3"
+    assert path.read_text() == RELEASE_INI.replace("current_release = 4.0.0", "current_release = 4.0.3")
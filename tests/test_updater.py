@@ -80,7 +80,7 @@ def test_update_main_project(config, version):
         version=version,
         dry_run=True,
     )
-    assert new_row.strip() == '__version__ = VERSION = "0.0.2"', "MAIN: Versions does not match"
+    assert new_row.new == '__version__ = VERSION = "0.0.2"', "MAIN: Versions does not match"
 
 
 def test_update_sonar_properties(config, version):
@@ -94,7 +94,7 @@ def test_update_sonar_properties(config, version):
         version=version,
         dry_run=True,
     )
-    assert new_row.strip() == "sonar.projectVersion=0.0", "SONAR: Versions does not match"
+    assert new_row.new == "sonar.projectVersion=0.0", "SONAR: Versions does not match"
 
 
 def test_update_docs(config, version):
@@ -115,7 +115,7 @@ def test_update_docs(config, version):
         version=version,
         dry_run=True,
     )
-    assert new_row.strip() == 'release = "0.0.2"', "DOCS: Versions does not match"
+    assert new_row.new == 'release = "0.0.2"', "DOCS: Versions does not match"
 
     new_row = helpers.update_file(
         path=path,
@@ -124,7 +124,7 @@ def test_update_docs(config, version):
         version=version,
         dry_run=True,
     )
-    assert new_row.strip() == 'version = "0.0"', "DOCS: Versions does not match"
+    assert new_row.new == 'version = "0.0"', "DOCS: Versions does not match"
 
 
 def test_update_node_packages(config, version):
@@ -177,3 +177,39 @@ def test_full_sonar_properties(config, version):
     bump_release.RELEASE_CONFIG = config
     result = bump_release.update_node_package(version=version, dry_run=True)
     assert result is not None
+
+
+def test_dry_run_node_packages_record(config, version):
+    path = Path(config.get("node", "path"))
+    content = path.read_text()
+    record = helpers.update_node_packages(path=path, version=version, dry_run=True)
+    assert str(record).startswith(f"{path}:3 version: ")
+    assert (record.key, record.new, record.status) == ("version", "0.0.2", helpers.STATUS_DRY_RUN)
+    assert path.read_text() == content, "NODE: File MUST NOT be changed in dry-run mode"
+
+
+def test_node_packages_record(tmp_path, version):
+    path = tmp_path / "package.json"
+    path.write_text('{\n  "name": "frontend",\n  "version": "0.0.1"\n}\n')
+    record = helpers.update_node_packages(path=path, version=version)
+    assert (record.line, record.old, record.new) == (3, "0.0.1", "0.0.2")
+    assert path.read_bytes()[record.offset : record.offset + 7] == b'"0.0.2"'
+
+
+def test_docs_changes(config, version):
+    bump_release.RELEASE_CONFIG = config
+    changes = bump_release.update_docs_conf(version=version, dry_run=True)
+    assert [(change.section, change.new) for change in changes] == [
+        ("docs", 'release = "0.0.2"'),
+        ("docs", 'version = "0.0"'),
+    ]
+    assert changes[0].as_dict()["path"] == str(Path(config.get("docs", "path")))
+
+
+def test_dry_run_ansible_record(config, version):
+    path = Path(config.get("ansible", "path"))
+    content = path.read_text()
+    record = helpers.updates_yaml_file(path=path, version=version, key="git.version", dry_run=True)
+    assert str(record).startswith(f"{path}:4 git.version: ")
+    assert (record.key, record.new, record.status) == ("git.version", "0.0.2", helpers.STATUS_DRY_RUN)
+    assert path.read_text() == content, "ANSIBLE: File MUST NOT be changed in dry-run mode"
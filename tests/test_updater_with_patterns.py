@@ -68,7 +68,7 @@ def test_update_main_project(config, version):
         dry_run=True,
     )
     assert new_row is not None, "MAIN: No row returned"
-    assert new_row.strip() == "__version__ = VERSION = '0.1.0'", "MAIN: Versions does not match"
+    assert new_row.new == "__version__ = VERSION = '0.1.0'", "MAIN: Versions does not match"
 
 
 def test_update_sonar_properties(config, version):
@@ -90,7 +90,7 @@ def test_update_sonar_properties(config, version):
         dry_run=True,
     )
     assert new_row is not None, "SONAR: No row returned"
-    assert new_row.strip() == "sonar.projectVersion=0.1", "SONAR: Versions does not match"
+    assert new_row.new == "sonar.projectVersion=0.1", "SONAR: Versions does not match"
 
 
 def test_update_docs(config, version):
@@ -122,7 +122,7 @@ def test_update_docs(config, version):
         version=version,
         dry_run=True,
     )
-    assert new_row.strip() == "release = '0.1.0'", "DOCS: Versions does not match"
+    assert new_row.new == "release = '0.1.0'", "DOCS: Versions does not match"
 
     new_row = helpers.update_file(
         path=path,
@@ -131,7 +131,7 @@ def test_update_docs(config, version):
         version=version,
         dry_run=True,
     )
-    assert new_row.strip() == "version = '0.1'", "DOCS: Versions does not match"
+    assert new_row.new == "version = '0.1'", "DOCS: Versions does not match"
 
 
 def test_update_node_packages(config, version):
@@ -0,0 +1,68 @@
+"""
+Tests for the watch mode
+"""
+import pytest
+
+from bump_release import watch
+
+from .conftest import RELEASE_INI
+
+
+@pytest.fixture
+def monorepo(make_monorepo):
+    return make_monorepo({"a": 100, "b": 100})
+
+
+def _inotify_available():
+    try:
+        watch.InotifyWatcher([]).close()
+    except (OSError, AttributeError):
+        return False
+    return True
+
+
+@pytest.mark.parametrize(
+    "polling",
+    [True, pytest.param(False, marks=pytest.mark.skipif(not _inotify_available(), reason="inotify not available"))],
+)
+def test_watch(monorepo, polling):
+    release_file = monorepo / "b" / "release.ini"
+    with watch.Watch(monorepo, polling=polling, interval=0.01) as watcher:
+        assert isinstance(watcher.watcher, watch.PollingWatcher if polling else watch.InotifyWatcher)
+        assert watcher.poll(timeout=0.1) == []
+
+        release_file.write_text(RELEASE_INI.replace("0.0.1", "0.0.2"))
+        results = watcher.poll(timeout=2)
+        assert [(result["release_file"], result["status"], result["release"]) for result in results] == [
+            (str(release_file), "ok", "0.0.2")
+        ]
+        assert [(change.section, change.line, change.new) for change in results[0]["changes"]] == [
+            ("main_project", 101, '__version__ = VERSION = "0.0.2"'),
+            ("DEFAULT", 2, "current_release = 0.0.2"),
+        ]
+        assert (monorepo / "b" / "main.txt").read_text().endswith('"0.0.2"\n')
+        assert (monorepo / "a" / "main.txt").read_text().endswith('"0.0.1"\n')
+        # The own writes of the sync and the other modifications of the release file are ignored
+        release_file.write_text(release_file.read_text() + "\n")
+        assert watcher.poll(timeout=0.2) == []
+
+        release_file.write_text(RELEASE_INI.replace("0.0.1", "0.2"))
+        results = watcher.poll(timeout=2)
+        assert results[0]["status"] == "error"
+        assert results[0]["release"] == "0.0.2"
+
+
+def test_rows_shifted(monorepo):
+    # The first matching row is updated on each sync, even when the rows above the previous match are removed
+    release_file = monorepo / "b" / "release.ini"
+    main_file = monorepo / "b" / "main.txt"
+    main_file.write_text('#\n__version__ = VERSION = "0.0.1"\n__version__ = VERSION = "0.0.1"\n')
+    with watch.Watch(monorepo, polling=True, interval=0.01) as watcher:
+        release_file.write_text(RELEASE_INI.replace("0.0.1", "0.0.2"))
+        assert watcher.poll(timeout=2)[0]["changes"][0].line == 2
+
+        main_file.write_text(main_file.read_text().split("\n", 1)[1])
+        release_file.write_text(RELEASE_INI.replace("0.0.1", "0.0.3"))
+        results = watcher.poll(timeout=2)
+        assert results[0]["changes"][0].line == 1
+    assert main_file.read_text() == '__version__ = VERSION = "0.0.3"\n__version__ = VERSION = "0.0.1"\n'
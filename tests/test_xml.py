@@ -0,0 +1,108 @@
+"""
+Tests for the XML updater
+"""
+import shutil
+from pathlib import Path
+
+import pytest
+
+import bump_release
+from bump_release import helpers, xml_scanner
+
+FIXTURE_PATH = Path(__file__).parent / "fixtures" / "pom.xml"
+
+MANIFEST = """<?xml version="1.0" encoding="utf-8"?>
+<manifest xmlns:android="http://schemas.android.com/apk/res/android"
+    package="fr.tourcoing.agenda"
+    android:versionCode="12"
+    android:versionName = '0.0.1' >
+    <application android:label="Agenda" />
+</manifest>
+"""
+
+
+@pytest.fixture
+def pom(tmp_path):
+    path = tmp_path / "pom.xml"
+    shutil.copy(FIXTURE_PATH, path)
+    return path
+
+
+@pytest.fixture
+def version():
+    return helpers.split_version("0.0.2")
+
+
+def test_split_path():
+    assert xml_scanner.split_path("/project/version") == ("project", "version")
+    assert xml_scanner.split_path("manifest/@android:versionName") == ("manifest", "@android:versionName")
+    for element_path in ("", "project//version", "project/@version/x"):
+        with pytest.raises(ValueError):
+            xml_scanner.split_path(element_path)
+
+
+@pytest.mark.parametrize(
+    "element_path,line,raw",
+    [("project/version", 19, b"0.0.1"), ("project/parent/version", 9, b"1.4.0"), ("project/scm/tag", None, None)],
+)
+def test_find_span(pom, element_path, line, raw):
+    span = xml_scanner.find_span(pom, xml_scanner.split_path(element_path))
+    if raw is None:
+        assert span is None
+        return
+    assert (span.line, span.raw) == (line, raw)
+    assert pom.read_bytes()[span.start : span.end] == raw
+
+
+def test_dry_run_xml(pom, version):
+    record = helpers.update_xml_file(path=pom, version=version, dry_run=True)
+    assert str(record) == f"{pom}:19 project/version: '0.0.1' -> '0.0.2'"
+    assert record.status == helpers.STATUS_DRY_RUN
+    assert pom.read_bytes() == FIXTURE_PATH.read_bytes()
+
+
+def test_update_xml(pom):
+    helpers.update_xml_file(path=pom, version=helpers.split_version("0.10.0"), template="{major}.{minor}-SNAPSHOT")
+    expected = FIXTURE_PATH.read_text().replace("<version>0.0.1</version>", "<version>0.10-SNAPSHOT</version>")
+    assert pom.read_text() == expected
+
+
+def test_update_attribute(tmp_path, version):
+    path = tmp_path / "AndroidManifest.xml"
+    path.write_text(MANIFEST)
+    record = helpers.update_xml_file(path=path, version=version, element="manifest/@android:versionName")
+    assert (record.line, record.old) == (5, "0.0.1")
+    assert path.read_text() == MANIFEST.replace("'0.0.1'", "'0.0.2'")
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "<project><version><!-- x -->0.0.1</version></project>",
+        "<project><version><v>0.0.1</v></version></project>",
+        "<project><version/></project>",
+        "<project><name>x</project>",
+    ],
+)
+def test_update_invalid_xml(tmp_path, version, content):
+    path = tmp_path / "pom.xml"
+    path.write_text(content)
+    with pytest.raises(helpers.UpdateException):
+        helpers.update_xml_file(path=path, version=version)
+    assert path.read_text() == content
+
+
+def test_stops_when_found(tmp_path, version, monkeypatch):
+    monkeypatch.setattr(xml_scanner, "CHUNK_SIZE", 64)
+    path = tmp_path / "pom.xml"
+    # Not well-formed after the version: never parsed
+    path.write_text("<project>\n  <version>\n    0.0.1\n  </version>\n" + "</mismatched>" * 1000)
+    helpers.update_xml_file(path=path, version=version)
+    assert path.read_text().startswith("<project>\n  <version>\n    0.0.2\n  </version>\n</mismatched>")
+
+
+def test_full_xml(pom, version):
+    bump_release.RELEASE_CONFIG = helpers.load_release_file(pom.parent / "release.ini")
+    bump_release.RELEASE_CONFIG.read_dict({"xml": {"path": str(pom)}})
+    changes = bump_release.update_xml_file(version=version, dry_run=True)
+    assert [(change.section, change.key, change.new) for change in changes] == [("xml", "project/version", "0.0.2")]